@@ -2,32 +2,11 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from common.models import TimeStampedModel, NamedModel
-import random
+from common.managers import RandomSampleManager
 
 
-class ArtistManager(models.Manager):
+class ArtistManager(RandomSampleManager):
     """Artist 모델을 위한 커스텀 매니저"""
-    
-    def random(self, count=4):
-        """효율적인 랜덤 조회"""
-        # ID 범위 구하기
-        min_id = self.aggregate(models.Min('id'))['id__min']
-        max_id = self.aggregate(models.Max('id'))['id__max']
-        
-        if min_id is None or max_id is None:
-            return self.none()
-        
-        # 랜덤 ID 생성
-        random_ids = []
-        attempts = 0
-        while len(random_ids) < count and attempts < count * 3:  # 최대 시도 제한
-            random_id = random.randint(min_id, max_id)
-            if random_id not in random_ids:
-                random_ids.append(random_id)
-            attempts += 1
-        
-        # ID가 존재하는 객체들만 반환
-        return self.filter(id__in=random_ids)[:count]
 
 
 class Artist(NamedModel, TimeStampedModel):
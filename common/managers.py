@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class RandomSampleQuerySet(models.QuerySet):
+    """무작위 샘플 조회를 지원하는 QuerySet (filter/exclude 뒤에도 random() 사용 가능)"""
+
+    def random(self, count=4):
+        """무작위 count개 조회 (쿼리 1회)
+
+        id만 무작위 정렬해서 뽑는 서브쿼리로 조회하므로 삭제로 비어 있는 id 구간과 관계없이
+        행이 count개 이상이면 항상 서로 다른 count개를, 적으면 전부를 반환합니다.
+        다만 order_by('?')는 DB에서 테이블 전체 id를 정렬하므로 비용은 행 수에 비례(O(N))합니다.
+        요청마다 호출되는 경로에서는 메모리 id 풀(feeds.pools)에서 뽑는 쪽을 사용하세요.
+        """
+        if count <= 0:
+            return self.none()
+        sample_ids = self.order_by('?').values('id')[:count]
+        return self.filter(id__in=sample_ids)
+
+
+class RandomSampleManager(models.Manager.from_queryset(RandomSampleQuerySet)):
+    """무작위 샘플 조회를 지원하는 공용 매니저 (Artist/Artwork/Exhibition)"""
@@ -1,3 +1,25 @@
 from django.test import TestCase
 
-# Create your tests here.
+from artists.models import Artist
+
+
+class RandomSampleManagerTests(TestCase):
+    def setUp(self):
+        artists = [Artist.objects.create(title=f'작가 {index}') for index in range(10)]
+        # 중간 id를 지워서 id 구간에 빈 곳을 만듦
+        Artist.objects.filter(id__in=[artist.id for artist in artists[1:8:2]]).delete()
+        self.remaining_ids = set(Artist.objects.values_list('id', flat=True))
+
+    def test_returns_count_distinct_rows_with_sparse_ids(self):
+        for _ in range(5):
+            ids = [artist.id for artist in Artist.objects.random(4)]
+            self.assertEqual(len(ids), 4)
+            self.assertEqual(len(set(ids)), 4)
+            self.assertTrue(set(ids) <= self.remaining_ids)
+
+    def test_returns_all_rows_when_table_is_smaller(self):
+        self.assertEqual({artist.id for artist in Artist.objects.random(20)}, self.remaining_ids)
+
+    def test_non_positive_count_returns_no_rows(self):
+        self.assertEqual(list(Artist.objects.random(0)), [])
+        self.assertEqual(list(Artist.objects.random(-1)), [])
@@ -24,6 +24,7 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
+    'adrf',
     'django_filters',
     'drf_spectacular',
     'corsheaders',
@@ -38,6 +39,7 @@ LOCAL_APPS = [
     'highlights',
     'likes',
     'records',
+    'feeds',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -0,0 +1,343 @@
+import hashlib
+import json
+import mmap
+import re
+from typing import List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+# 미디어 저장소 내 도슨트 음성 파일 경로
+AUDIO_STORAGE_DIR = 'docents/audio'
+
+# 스크립트 내용 기준 음성 캐시 경로 (작업 파일 정리 대상과 분리)
+SPEECH_CACHE_DIR = f'{AUDIO_STORAGE_DIR}/cache'
+
+# 카탈로그 사전 생성 음성 경로 (만료 정리 대상 아님)
+PRECOMPUTED_AUDIO_DIR = f'{AUDIO_STORAGE_DIR}/precomputed'
+
+# 스트리밍 청크 크기
+AUDIO_CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# 문장 경계 (마침표/물음표/느낌표 뒤 공백, 또는 줄바꿈)
+_SENTENCE_END_RE = re.compile(r'[.!?…。]+(?=\s)|\n')
+
+# MPEG Layer III 프레임 헤더 테이블 (kbps / Hz)
+_MP3_BITRATES = {
+    'mpeg1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'mpeg2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+class RangeNotSatisfiable(Exception):
+    """요청한 바이트 범위가 파일 크기를 벗어남 (416)"""
+
+
+def save_audio(name: str, audio_bytes: bytes) -> str:
+    """음성 바이너리를 미디어 저장소(로컬 FS 또는 S3)에 저장하고 저장 경로 반환"""
+    return default_storage.save(f"{AUDIO_STORAGE_DIR}/{name}", ContentFile(audio_bytes))
+
+
+def save_precomputed_audio(name: str, audio_bytes: bytes) -> str:
+    """사전 생성 음성 저장 (같은 이름의 기존 파일은 교체)"""
+    path = f"{PRECOMPUTED_AUDIO_DIR}/{name}"
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    return default_storage.save(path, ContentFile(audio_bytes))
+
+
+def open_audio(path: str):
+    """저장된 음성 파일 열기 (바이너리 읽기)"""
+    return default_storage.open(path, 'rb')
+
+
+def audio_size(path: str) -> int:
+    """저장된 음성 파일 크기(바이트)"""
+    return default_storage.size(path)
+
+
+def parse_byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Range 헤더를 (start, end) 포함 범위로 변환
+
+    단일 범위(bytes=a-b, bytes=a-, bytes=-n)만 지원하며
+    해석할 수 없는 헤더(끝이 시작보다 앞인 범위 포함)는 None(전체 응답)으로 처리합니다.
+    파일 범위를 벗어나면 RangeNotSatisfiable을 발생시킵니다.
+    """
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+    if first == '':
+        # 접미사 범위: 마지막 n바이트
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        # 문법상 잘못된 범위는 무시 (RFC 7233 2.1)
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def iter_audio_range(path: str, start: int, end: int, chunk_size: int = AUDIO_CHUNK_SIZE):
+    """음성 파일의 [start, end] 구간을 청크 단위로 반환
+
+    로컬 파일 저장소는 mmap으로 필요한 페이지만 읽고,
+    S3 등 원격 저장소는 seek 후 순차적으로 읽습니다.
+    """
+    try:
+        local_path = default_storage.path(path)
+    except NotImplementedError:
+        local_path = None
+
+    if local_path:
+        with open(local_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(start, end + 1, chunk_size):
+                yield mm[offset:min(offset + chunk_size, end + 1)]
+        return
+
+    with open_audio(path) as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def audio_file_url(path: str) -> str:
+    """저장소 직접 접근 URL (S3/CDN 또는 MEDIA_URL)"""
+    return default_storage.url(path)
+
+
+def purge_expired_audio(ttl: int, directory: str = AUDIO_STORAGE_DIR) -> int:
+    """TTL이 지난 음성 파일 일괄 삭제 (하위 디렉터리 제외, 삭제한 파일 수 반환)"""
+    from datetime import timedelta
+    from django.utils import timezone
+
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+
+    cutoff = timezone.now() - timedelta(seconds=ttl)
+    deleted = 0
+    for name in files:
+        path = f"{directory}/{name}"
+        if default_storage.get_modified_time(path) <= cutoff:
+            default_storage.delete(path)
+            deleted += 1
+    return deleted
+
+
+def chunk_audio_name(job_id: str, index: int) -> str:
+    """청크 음성 파일명"""
+    return f"{job_id}_{index}.mp3"
+
+
+def split_script_chunks(text: str, max_chars: int, first_max_chars: int = None) -> List[dict]:
+    """스크립트를 문장 경계에 맞춰 Polly 요청 단위 청크로 분할
+
+    각 청크는 {'text', 'start'} 이며 start는 원문에서의 문자 위치입니다.
+    첫 청크는 first_max_chars로 짧게 잘라 첫 음성이 빨리 준비되도록 합니다.
+    한 문장이 max_chars보다 길면 공백 위치에서 강제로 나눕니다.
+    """
+    return _pack_spans(text, _sentence_spans(text, max_chars), max_chars, first_max_chars)
+
+
+def _sentence_spans(text: str, max_chars: int) -> List[Tuple[int, int]]:
+    """문장 단위 (start, end) 구간 - 앞뒤 공백 제외, 긴 문장은 max_chars 이하로 분할"""
+    spans = []
+    position = 0
+    boundaries = [m.end() for m in _SENTENCE_END_RE.finditer(text)] + [len(text)]
+    for end in boundaries:
+        segment = text[position:end]
+        stripped = segment.strip()
+        if stripped:
+            start = position + len(segment) - len(segment.lstrip())
+            spans.extend(_split_long_span(text, start, start + len(stripped), max_chars))
+        position = end
+    return spans
+
+
+def _pack_spans(text: str, spans: List[Tuple[int, int]], max_chars: int, first_max_chars: int = None) -> List[dict]:
+    """문장 구간을 max_chars 이하 청크로 묶기"""
+    chunks = []
+    chunk_start = chunk_end = None
+    for start, end in spans:
+        limit = first_max_chars if (first_max_chars and not chunks) else max_chars
+        if chunk_start is not None and end - chunk_start > limit:
+            chunks.append({'text': text[chunk_start:chunk_end], 'start': chunk_start})
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start = start
+        chunk_end = end
+
+    if chunk_start is not None:
+        chunks.append({'text': text[chunk_start:chunk_end], 'start': chunk_start})
+    return chunks
+
+
+class StreamingScriptChunker:
+    """스트리밍으로 들어오는 스크립트를 split_script_chunks와 같은 규칙으로 청크 분할
+
+    feed()는 더 이상 바뀌지 않는(다음 청크가 시작된) 청크만 반환하고,
+    finish()는 남은 텍스트를 마지막 청크로 반환합니다.
+    전체 텍스트를 한 번에 split_script_chunks로 나눈 결과와 같습니다.
+    """
+
+    def __init__(self, max_chars: int, first_max_chars: int = None):
+        self.max_chars = max_chars
+        self.first_max_chars = first_max_chars
+        self.tail = ''      # 아직 청크로 내보내지 않은 텍스트
+        self.offset = 0     # tail의 원문 내 시작 위치
+        self.emitted = 0
+
+    def feed(self, text: str) -> List[dict]:
+        """텍스트 조각 추가 - 확정된 청크 목록 반환"""
+        self.tail += text
+        # 문장 경계/분할 위치는 공백이 들어와야 확정됨
+        if not any(char.isspace() for char in text) and len(self.tail) <= self.max_chars:
+            return []
+
+        spans = _sentence_spans(self.tail, self.max_chars)
+        if len(spans) < 2:
+            return []
+
+        # 마지막 구간은 이어지는 텍스트에 따라 바뀔 수 있으므로,
+        # 다음 청크가 그 이전 구간에서 시작하는 청크만 확정
+        last_start = spans[-1][0]
+        chunks = _pack_spans(self.tail, spans, self.max_chars, self.first_max_chars if not self.emitted else None)
+        ready = []
+        for chunk, next_chunk in zip(chunks, chunks[1:]):
+            if next_chunk['start'] >= last_start:
+                break
+            ready.append(chunk)
+        if not ready:
+            return []
+
+        consumed = chunks[len(ready)]['start']
+        for chunk in ready:
+            chunk['start'] += self.offset
+        self.tail = self.tail[consumed:]
+        self.offset += consumed
+        self.emitted += len(ready)
+        return ready
+
+    def finish(self) -> List[dict]:
+        """남은 텍스트를 청크로 반환"""
+        remaining = split_script_chunks(self.tail, self.max_chars, self.first_max_chars if not self.emitted else None)
+        for chunk in remaining:
+            chunk['start'] += self.offset
+        self.emitted += len(remaining)
+        self.tail = ''
+        return remaining
+
+
+def _split_long_span(text: str, start: int, end: int, max_chars: int) -> List[Tuple[int, int]]:
+    """max_chars보다 긴 구간을 공백 기준으로 분할"""
+    spans = []
+    while end - start > max_chars:
+        cut = text.rfind(' ', start + 1, start + max_chars)
+        if cut == -1:
+            cut = start + max_chars
+        spans.append((start, cut))
+        start = cut
+        while start < end and text[start].isspace():
+            start += 1
+    if start < end:
+        spans.append((start, end))
+    return spans
+
+
+def mp3_duration_ms(data: bytes) -> float:
+    """MP3 프레임 헤더를 순회하여 재생 시간(ms) 계산
+
+    Polly가 생성하는 MPEG Layer III 스트림 기준이며,
+    청크를 이어붙일 때 타임스탬프 오프셋 계산에 사용합니다.
+    """
+    position = 0
+    if data[:3] == b'ID3' and len(data) >= 10:
+        # ID3v2 태그 건너뛰기 (synchsafe 정수)
+        tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        position = 10 + tag_size
+
+    duration = 0.0
+    while position + 4 <= len(data):
+        b1, b2 = data[position + 1], data[position + 2]
+        if data[position] != 0xFF or (b1 & 0xE0) != 0xE0:
+            position += 1
+            continue
+
+        version = (b1 >> 3) & 0x03
+        layer = (b1 >> 1) & 0x03
+        bitrate_index = (b2 >> 4) & 0x0F
+        sample_rate_index = (b2 >> 2) & 0x03
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+            position += 1
+            continue
+
+        is_mpeg1 = version == 3
+        bitrate = _MP3_BITRATES['mpeg1' if is_mpeg1 else 'mpeg2'][bitrate_index] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+        samples = 1152 if is_mpeg1 else 576
+        padding = (b2 >> 1) & 0x01
+
+        duration += samples * 1000 / sample_rate
+        position += (samples // 8) * bitrate // sample_rate + padding
+
+    return duration
+
+
+def speech_cache_key(script_text: str, voice_id: str, output_format: str) -> str:
+    """음성 캐시 키 (스크립트 sha256 + 음성 + 포맷)"""
+    script_hash = hashlib.sha256(script_text.encode('utf-8')).hexdigest()
+    return f"{script_hash}-{voice_id}-{output_format}"
+
+
+def load_cached_speech(key: str) -> Optional[dict]:
+    """캐시된 음성 조회 - {audio_path, audio_size, duration_ms, timestamps} 또는 None
+
+    메타데이터(JSON)는 음성 파일 저장 후에 기록되므로
+    메타데이터가 있으면 음성 파일도 준비된 상태입니다.
+    """
+    meta_path = f"{SPEECH_CACHE_DIR}/{key}.json"
+    if not default_storage.exists(meta_path):
+        return None
+    with default_storage.open(meta_path, 'rb') as f:
+        meta = json.loads(f.read().decode('utf-8'))
+    # 만료 정리로 음성 파일만 먼저 삭제된 경우 캐시 미스로 처리
+    if not default_storage.exists(meta['audio_path']):
+        return None
+    return meta
+
+
+def store_cached_speech(key: str, audio_bytes: bytes, timestamps: list) -> dict:
+    """음성과 스피치 마크를 캐시에 저장하고 메타데이터 반환"""
+    audio_path = default_storage.save(f"{SPEECH_CACHE_DIR}/{key}.mp3", ContentFile(audio_bytes))
+    meta = {
+        'audio_path': audio_path,
+        'audio_size': len(audio_bytes),
+        'duration_ms': round(mp3_duration_ms(audio_bytes)),
+        'timestamps': timestamps,
+    }
+    meta_path = f"{SPEECH_CACHE_DIR}/{key}.json"
+    if not default_storage.exists(meta_path):
+        default_storage.save(meta_path, ContentFile(json.dumps(meta, ensure_ascii=False).encode('utf-8')))
+    return meta
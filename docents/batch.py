@@ -0,0 +1,210 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from decouple import config
+from django.db import close_old_connections, connections
+
+from .job_stores import get_job_store
+from .services import close_async_openai_client, get_docent_service
+
+logger = logging.getLogger(__name__)
+
+
+class BatchQueueFullError(Exception):
+    """배치 대기열이 가득 차서 새 배치를 받을 수 없음"""
+
+
+class BatchDocentManager:
+    """여러 입력의 도슨트를 한 번에 생성하는 배치 작업 관리자
+
+    배치마다 전용 스레드의 이벤트 루프에서 항목들을 동시에 생성하며,
+    동시 LLM 호출 수는 BATCH_CONCURRENCY로 제한합니다.
+    음성은 배치 우선순위로 등록되어 실시간 요청보다 뒤에 처리됩니다.
+    진행 상황은 작업 저장소(job_stores)에 항목별로 기록되므로
+    조회/스트리밍 요청은 다른 워커 프로세스에서도 처리할 수 있습니다.
+    """
+
+    def __init__(self, store=None):
+        self.job_ttl = config('BATCH_JOB_TTL', default=3600, cast=int)
+        self.max_items = config('BATCH_MAX_ITEMS', default=50, cast=int)
+        self.concurrency = config('BATCH_CONCURRENCY', default=4, cast=int)
+        self.max_active = config('BATCH_MAX_ACTIVE', default=2, cast=int)
+        self.max_queued = config('BATCH_MAX_QUEUED', default=10, cast=int)
+        self.store = store or get_job_store('batch', ttl=self.job_ttl)
+        self.lock = threading.Lock()
+        self._executor = None
+        self._queued = 0  # 실행 대기 + 실행 중 배치 수
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """배치 실행 스레드 풀 지연 생성 (fork 이후 첫 배치 시점에 생성)"""
+        with self.lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_active, thread_name_prefix='docent-batch')
+            return self._executor
+
+    def create_batch(self, inputs: list) -> str:
+        """배치 작업 생성 후 백그라운드 실행 (대기열이 가득 차면 BatchQueueFullError)"""
+        with self.lock:
+            if self._queued >= self.max_queued:
+                raise BatchQueueFullError("배치 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+            self._queued += 1
+
+        batch_id = str(uuid.uuid4())
+        try:
+            self.store.create(batch_id, {
+                'status': 'pending',
+                'total': len(inputs),
+                'completed': 0,
+                'failed': 0,
+                'error': None,
+                'items': [
+                    {
+                        'index': index, 'input_text': input_text, 'status': 'pending',
+                        'item_type': None, 'item_name': None, 'text': None,
+                        'audio_job_id': None, 'error': None,
+                    }
+                    for index, input_text in enumerate(inputs)
+                ],
+            })
+            self._get_executor().submit(self._run_batch, batch_id)
+        except Exception:
+            with self.lock:
+                self._queued -= 1
+            raise
+
+        logger.info(f"📦 배치 도슨트 작업 등록: {batch_id} ({len(inputs)}개)")
+        return batch_id
+
+    def get_batch_status(self, batch_id: str) -> Optional[dict]:
+        """배치 진행 상황 조회 (만료된 배치는 None)"""
+        batch = self.store.get(batch_id)
+        if not batch:
+            return None
+
+        return {
+            'batch_id': batch_id,
+            'status': batch['status'],
+            'total': batch['total'],
+            'completed': batch['completed'],
+            'failed': batch['failed'],
+            'error': batch.get('error'),
+            'items': batch['items'],
+        }
+
+    async def watch_batch(self, batch_id: str, poll_interval: float = None, timeout: float = None):
+        """배치 진행 이벤트 생성 (SSE용)
+
+        - item: 상태가 바뀐 항목
+        - done: 배치 종료 {batch_id, status, total, completed, failed, error}
+        - error: 배치를 찾을 수 없거나 대기 시간 초과
+        """
+        poll_interval = poll_interval or config('BATCH_STREAM_POLL_INTERVAL', default=0.5, cast=float)
+        timeout = timeout or config('BATCH_STREAM_TIMEOUT', default=600, cast=int)
+        deadline = time.monotonic() + timeout
+        sent = {}
+
+        while True:
+            batch = await sync_to_async(self.get_batch_status)(batch_id)
+            if batch is None:
+                yield 'error', {'error': '배치를 찾을 수 없습니다.'}
+                return
+
+            for item in batch['items']:
+                if sent.get(item['index']) != item['status']:
+                    sent[item['index']] = item['status']
+                    yield 'item', item
+
+            if batch['status'] in ('completed', 'failed'):
+                yield 'done', {key: batch[key] for key in ('batch_id', 'status', 'total', 'completed', 'failed', 'error')}
+                return
+
+            if time.monotonic() > deadline:
+                yield 'error', {'error': '배치 진행 대기 시간이 초과되었습니다.'}
+                return
+            await asyncio.sleep(poll_interval)
+
+    def _run_batch(self, batch_id: str):
+        """배치 실행 (배치 스레드에서 실행)"""
+        try:
+            close_old_connections()
+            asyncio.run(self._process_batch(batch_id))
+        except Exception as e:
+            logger.error(f"❌ 배치 도슨트 작업 오류 ({batch_id}): {e}")
+            self.store.update(batch_id, status='failed', error=str(e))
+        finally:
+            close_old_connections()
+            with self.lock:
+                self._queued -= 1
+
+    async def _process_batch(self, batch_id: str):
+        """배치 항목들을 동시 처리 수 제한 하에 생성"""
+        loop = asyncio.get_running_loop()
+        # 저장소 갱신은 전용 스레드 하나에서 순서대로 실행 (이전 상태가 나중 상태를 덮어쓰지 않도록)
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='docent-batch-store')
+
+        async def save_progress(items: list, status: str = None):
+            fields = self._progress_fields(items, status)
+            await loop.run_in_executor(writer, functools.partial(self.store.update, batch_id, **fields))
+
+        try:
+            batch = await loop.run_in_executor(writer, self.store.get, batch_id)
+            if not batch:
+                return
+            items = batch['items']
+            await save_progress(items, status='processing')
+
+            docent_service = get_docent_service()
+            semaphore = asyncio.Semaphore(self.concurrency)
+            started = time.perf_counter()
+
+            async def run_item(item):
+                async with semaphore:
+                    item['status'] = 'processing'
+                    await save_progress(items)
+                    try:
+                        result = await docent_service.generate_realtime_docent(
+                            prompt_text=item['input_text'],
+                            background=True,
+                        )
+                        item.update(
+                            status='completed',
+                            item_type=result['item_type'],
+                            item_name=result['item_name'],
+                            text=result['text'],
+                            audio_job_id=result['audio_job_id'],
+                        )
+                    except Exception as e:
+                        item.update(status='failed', error=str(e))
+                    await save_progress(items)
+
+            await asyncio.gather(*(run_item(item) for item in items))
+            await save_progress(items, status='completed')
+            logger.info(f"📦 배치 도슨트 작업 완료: {batch_id} ({len(items)}개, {time.perf_counter() - started:.1f}초)")
+        finally:
+            # 배치마다 새 이벤트 루프를 쓰므로 이 루프에서 만든 OpenAI 클라이언트도 함께 정리
+            await close_async_openai_client()
+            await loop.run_in_executor(writer, connections.close_all)
+            writer.shutdown(wait=False)
+
+    @staticmethod
+    def _progress_fields(items: list, status: str = None) -> dict:
+        """저장할 진행 상황 (항목 사본과 완료/실패 수)"""
+        fields = {
+            'items': [dict(item) for item in items],
+            'completed': sum(1 for item in items if item['status'] == 'completed'),
+            'failed': sum(1 for item in items if item['status'] == 'failed'),
+        }
+        if status:
+            fields['status'] = status
+        return fields
+
+
+# 전역 배치 작업 관리자 인스턴스
+batch_docent_manager = BatchDocentManager()
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+from decouple import config
+
+
+def normalize_prompt(text: str) -> str:
+    """캐시 키용 입력 정규화 (유니코드 NFC, 공백 정리, 소문자)"""
+    text = unicodedata.normalize('NFC', text or '')
+    return ' '.join(text.split()).lower()
+
+
+class DocentResultCache:
+    """LLM 도슨트 생성 결과 캐시 (TTL + LRU)
+
+    정규화된 입력 텍스트와 모델명으로 키를 만들고,
+    파싱된 {text, item_type, item_name} 결과만 저장합니다.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: int = 86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(prompt_text: str, model: str) -> str:
+        """정규화된 입력 + 모델명 기반 콘텐츠 주소 키 생성"""
+        raw = f"{model}\x00{normalize_prompt(prompt_text)}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """캐시 조회 (만료된 항목은 즉시 제거)"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            # 최근 사용 항목으로 이동 (LRU)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def set(self, key: str, value: dict):
+        """캐시 저장 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        with self.lock:
+            self._entries[key] = (time.monotonic() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self.lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """캐시 효율 지표 조회"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# 전역 도슨트 결과 캐시 인스턴스
+docent_result_cache = DocentResultCache(
+    max_size=config('DOCENT_CACHE_MAX_SIZE', default=1000, cast=int),
+    ttl=config('DOCENT_CACHE_TTL', default=86400, cast=int),
+)
@@ -0,0 +1,107 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from decouple import config
+
+
+class ImageRecognitionIndex:
+    """이미지 지각 해시(dHash) -> 인식 결과 인덱스
+
+    이전에 비전 모델로 인식한 사진의 64비트 해시와 결과(item_type, item_name, text)를
+    저장하고, 해밍 거리가 threshold 이하인 사진은 LLM 호출 없이 같은 결과로 응답합니다.
+
+    해시를 8비트씩 8개 구간으로 나눠 구간별 버킷에 등록합니다.
+    거리가 8 미만이면 최소 한 구간은 정확히 일치하므로(비둘기집 원리)
+    전체를 비교하지 않고 버킷 후보만 검사합니다.
+    """
+
+    BANDS = 8
+    BAND_BITS = 8
+
+    def __init__(self, max_size: int = 5000, threshold: int = 5):
+        self.max_size = max_size
+        self.threshold = threshold
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()  # LRU 순서
+        self._buckets = [{} for _ in range(self.BANDS)]  # 구간별 {구간 값: 해시 집합}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _bands(self, image_hash: int):
+        mask = (1 << self.BAND_BITS) - 1
+        return [(image_hash >> (i * self.BAND_BITS)) & mask for i in range(self.BANDS)]
+
+    def _candidates(self, image_hash: int):
+        if self.threshold >= self.BANDS:
+            return self._entries.keys()
+        candidates = set()
+        for band_index, band in enumerate(self._bands(image_hash)):
+            candidates |= self._buckets[band_index].get(band, set())
+        return candidates
+
+    def find(self, image_hash: int) -> Optional[tuple[dict, int]]:
+        """가장 가까운 인식 결과와 해밍 거리 반환 (threshold 초과면 None)"""
+        with self.lock:
+            best_hash, best_distance = None, self.threshold + 1
+            for candidate in self._candidates(image_hash):
+                distance = (candidate ^ image_hash).bit_count()
+                if distance < best_distance:
+                    best_hash, best_distance = candidate, distance
+
+            if best_hash is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_hash)
+            self.hits += 1
+            return dict(self._entries[best_hash]), best_distance
+
+    def add(self, image_hash: int, value: dict):
+        """인식 결과 등록 (최대 크기 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        with self.lock:
+            if image_hash not in self._entries:
+                for band_index, band in enumerate(self._bands(image_hash)):
+                    self._buckets[band_index].setdefault(band, set()).add(image_hash)
+            self._entries[image_hash] = dict(value)
+            self._entries.move_to_end(image_hash)
+
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._remove_from_buckets(evicted)
+
+    def _remove_from_buckets(self, image_hash: int):
+        for band_index, band in enumerate(self._bands(image_hash)):
+            bucket = self._buckets[band_index].get(band)
+            if bucket:
+                bucket.discard(image_hash)
+                if not bucket:
+                    del self._buckets[band_index][band]
+
+    def clear(self):
+        """인덱스 전체 삭제"""
+        with self.lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(self.BANDS)]
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """인덱스 효율 지표 조회"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# 전역 이미지 인식 인덱스 인스턴스 (프로세스 단위)
+image_recognition_index = ImageRecognitionIndex(
+    max_size=config('IMAGE_INDEX_MAX_SIZE', default=5000, cast=int),
+    threshold=config('IMAGE_INDEX_THRESHOLD', default=5, cast=int),
+)
@@ -0,0 +1,82 @@
+import io
+
+from decouple import config
+from PIL import ExifTags, Image, ImageOps
+
+
+# 비전 모델에 보낼 수 있는 원본 포맷 (변환 없이 그대로 사용 가능)
+VISION_PASSTHROUGH_FORMATS = {'JPEG': 'image/jpeg', 'PNG': 'image/png', 'WEBP': 'image/webp'}
+
+# 재인코딩 포맷별 MIME 타입
+VISION_OUTPUT_FORMATS = {'jpeg': ('JPEG', 'image/jpeg'), 'webp': ('WEBP', 'image/webp')}
+
+
+def prepare_image_for_vision(image_data: bytes) -> tuple[bytes, str]:
+    """비전 모델 입력용 이미지 전처리 - (이미지 바이너리, MIME 타입) 반환
+
+    EXIF 방향대로 회전하고, 긴 변을 VISION_IMAGE_MAX_SIDE 이하로 줄인 뒤
+    VISION_IMAGE_FORMAT(jpeg/webp), VISION_IMAGE_QUALITY로 다시 인코딩합니다.
+    변환이 필요 없고 원본이 더 작으면 원본을 그대로 사용합니다.
+    """
+    max_side = config('VISION_IMAGE_MAX_SIDE', default=1024, cast=int)
+    output_format, content_type = VISION_OUTPUT_FORMATS[config('VISION_IMAGE_FORMAT', default='jpeg')]
+    quality = config('VISION_IMAGE_QUALITY', default=80, cast=int)
+
+    image = Image.open(io.BytesIO(image_data))
+    source_format = image.format
+    source_size = image.size
+
+    # JPEG는 디코딩 단계에서 축소 (DCT 스케일링으로 큰 카메라 사진 디코딩 비용 절감)
+    if source_format == 'JPEG':
+        image.draft('RGB', (max_side, max_side))
+
+    orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    needs_transform = orientation != 1 or max(source_size) > max_side
+
+    if not needs_transform and source_format in VISION_PASSTHROUGH_FORMATS and len(image_data) <= 512 * 1024:
+        return image_data, VISION_PASSTHROUGH_FORMATS[source_format]
+
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    # 투명 배경은 흰색으로 합성 (JPEG는 알파 채널 미지원)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=output_format, quality=quality, optimize=output_format == 'JPEG')
+    encoded = buffer.getvalue()
+
+    if not needs_transform and source_format in VISION_PASSTHROUGH_FORMATS and len(image_data) <= len(encoded):
+        return image_data, VISION_PASSTHROUGH_FORMATS[source_format]
+
+    print(f"🗜️ 이미지 전처리: {source_size} {len(image_data)}B -> {image.size} {len(encoded)}B")
+    return encoded, content_type
+
+
+def image_dhash(image_data: bytes, hash_size: int = 8) -> int:
+    """이미지 차이 해시(dHash) 계산 - hash_size² 비트 정수
+
+    흑백으로 (hash_size+1) x hash_size 크기로 줄인 뒤 가로로 인접한 픽셀의
+    밝기 증감을 비트로 기록합니다. 크기/압축/밝기 변화에 강해
+    같은 작품을 다시 촬영한 사진은 해밍 거리가 작게 나옵니다.
+    """
+    image = Image.open(io.BytesIO(image_data))
+    if image.format == 'JPEG':
+        image.draft('L', (hash_size * 8, hash_size * 8))
+    image = ImageOps.exif_transpose(image).convert('L')
+    image = image.resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+
+    pixels = image.tobytes()
+    width = hash_size + 1
+    value = 0
+    for row in range(hash_size):
+        offset = row * width
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
@@ -0,0 +1,264 @@
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional
+
+from decouple import config
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+
+class BaseJobStore:
+    """백그라운드 작업 상태 저장소 인터페이스
+
+    작업 레코드는 dict이며 created_at(datetime), status를 포함하고
+    나머지 값은 JSON으로 직렬화 가능해야 합니다.
+    만료는 TTL로 처리하며 만료된 작업은 조회되지 않습니다.
+    """
+
+    def __init__(self, namespace: str, ttl: int = 3600):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def create(self, job_id: str, data: dict) -> dict:
+        """작업 생성 (created_at 자동 기록)"""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """작업 조회 (없거나 만료되면 None)"""
+        raise NotImplementedError
+
+    def update(self, job_id: str, **fields) -> bool:
+        """작업 필드 갱신 (작업이 없으면 False)"""
+        raise NotImplementedError
+
+    def delete(self, job_id: str):
+        """작업 삭제"""
+        raise NotImplementedError
+
+    def list_jobs(self, limit: int = 100) -> list:
+        """유효한 작업 목록 (최신순, 디버깅용)"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """유효한 작업 수 (디버깅용)"""
+        return len(self.list_jobs(limit=None))
+
+
+class InMemoryJobStore(BaseJobStore):
+    """프로세스 메모리 작업 저장소 (단일 워커 개발 환경용)"""
+
+    def __init__(self, namespace: str, ttl: int = 3600):
+        super().__init__(namespace, ttl)
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()  # 생성 순서 = 만료 순서
+        self.lock = threading.Lock()
+
+    def _purge_expired(self, now):
+        """앞쪽(가장 오래된)부터 만료된 작업 제거 - 분할 상환 O(1)"""
+        while self._jobs:
+            job_id, job = next(iter(self._jobs.items()))
+            if job['expires_at'] > now:
+                break
+            del self._jobs[job_id]
+
+    def create(self, job_id: str, data: dict) -> dict:
+        now = timezone.now()
+        job = dict(data, job_id=job_id, created_at=now, expires_at=now + timedelta(seconds=self.ttl))
+        with self.lock:
+            self._purge_expired(now)
+            self._jobs[job_id] = job
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            if job['expires_at'] <= timezone.now():
+                del self._jobs[job_id]
+                return None
+            return dict(job)
+
+    def update(self, job_id: str, **fields) -> bool:
+        with self.lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return False
+            job.update(fields)
+            return True
+
+    def delete(self, job_id: str):
+        with self.lock:
+            self._jobs.pop(job_id, None)
+
+    def list_jobs(self, limit: int = 100) -> list:
+        with self.lock:
+            self._purge_expired(timezone.now())
+            jobs = [dict(job) for job in reversed(self._jobs.values())]
+        return jobs[:limit] if limit else jobs
+
+    def count(self) -> int:
+        with self.lock:
+            self._purge_expired(timezone.now())
+            return len(self._jobs)
+
+
+class DatabaseJobStore(BaseJobStore):
+    """DB 테이블 작업 저장소 (여러 워커 프로세스 간 공유, 재시작 후에도 유지)
+
+    조회는 기본 키 인덱스로 처리하고, 만료된 행은 조회에서 제외한 뒤
+    작업 생성 시 주기적으로 일괄 삭제합니다.
+    """
+
+    # N번의 작업 생성마다 만료된 행 일괄 삭제
+    PURGE_EVERY = 100
+
+    def __init__(self, namespace: str, ttl: int = 3600):
+        super().__init__(namespace, ttl)
+        self._create_count = 0
+
+    @staticmethod
+    def _parse_job_id(job_id: str):
+        try:
+            return uuid.UUID(str(job_id))
+        except ValueError:
+            return None
+
+    def _to_record(self, row) -> dict:
+        return dict(
+            row.data,
+            job_id=str(row.job_id),
+            status=row.status,
+            created_at=row.created_at,
+            expires_at=row.expires_at,
+        )
+
+    def _queryset(self):
+        from .models import DocentJob
+        return DocentJob.objects.filter(namespace=self.namespace, expires_at__gt=timezone.now())
+
+    def create(self, job_id: str, data: dict) -> dict:
+        from .models import DocentJob
+
+        pk = self._parse_job_id(job_id)
+        if pk is None:
+            raise ValueError(f"DB 작업 저장소의 작업 ID는 UUID여야 합니다: {job_id}")
+
+        data = dict(data)
+        status = data.pop('status', 'pending')
+        row = DocentJob.objects.create(
+            job_id=pk,
+            namespace=self.namespace,
+            status=status,
+            data=data,
+            expires_at=timezone.now() + timedelta(seconds=self.ttl),
+        )
+
+        self._create_count += 1
+        if self._create_count % self.PURGE_EVERY == 0:
+            DocentJob.objects.filter(expires_at__lte=timezone.now()).delete()
+
+        return self._to_record(row)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        pk = self._parse_job_id(job_id)
+        if pk is None:
+            return None
+        row = self._queryset().filter(pk=pk).first()
+        return self._to_record(row) if row else None
+
+    def update(self, job_id: str, **fields) -> bool:
+        pk = self._parse_job_id(job_id)
+        if pk is None:
+            return False
+
+        with transaction.atomic():
+            row = self._queryset().select_for_update().filter(pk=pk).first()
+            if not row:
+                return False
+            if 'status' in fields:
+                row.status = fields.pop('status')
+            row.data = dict(row.data, **fields)
+            row.save(update_fields=['status', 'data', 'updated_at'])
+        return True
+
+    def delete(self, job_id: str):
+        pk = self._parse_job_id(job_id)
+        if pk is not None:
+            self._queryset().filter(pk=pk).delete()
+
+    def list_jobs(self, limit: int = 100) -> list:
+        rows = self._queryset().order_by('-created_at')
+        if limit:
+            rows = rows[:limit]
+        return [self._to_record(row) for row in rows]
+
+    def count(self) -> int:
+        return self._queryset().count()
+
+
+class CacheJobStore(BaseJobStore):
+    """Django 캐시 백엔드 작업 저장소 (Redis 등 공유 캐시 사용 시)
+
+    만료는 캐시 timeout으로 처리합니다. 캐시는 키 목록 조회를 지원하지 않으므로
+    list_jobs는 빈 목록을 반환합니다.
+    """
+
+    def __init__(self, namespace: str, ttl: int = 3600, cache_alias: str = 'default'):
+        super().__init__(namespace, ttl)
+        self.cache = caches[cache_alias]
+
+    def _key(self, job_id: str) -> str:
+        return f"docent-job:{self.namespace}:{job_id}"
+
+    def create(self, job_id: str, data: dict) -> dict:
+        now = timezone.now()
+        job = dict(data, job_id=job_id, created_at=now, expires_at=now + timedelta(seconds=self.ttl))
+        self.cache.set(self._key(job_id), job, timeout=self.ttl)
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.cache.get(self._key(job_id))
+
+    def update(self, job_id: str, **fields) -> bool:
+        job = self.get(job_id)
+        if not job:
+            return False
+        job.update(fields)
+        # 남은 TTL 유지
+        remaining = int((job['expires_at'] - timezone.now()).total_seconds())
+        if remaining <= 0:
+            return False
+        self.cache.set(self._key(job_id), job, timeout=remaining)
+        return True
+
+    def delete(self, job_id: str):
+        self.cache.delete(self._key(job_id))
+
+    def list_jobs(self, limit: int = 100) -> list:
+        return []
+
+
+JOB_STORE_BACKENDS = {
+    'memory': InMemoryJobStore,
+    'database': DatabaseJobStore,
+    'cache': CacheJobStore,
+}
+
+
+def get_job_store(namespace: str, ttl: int = 3600) -> BaseJobStore:
+    """설정(DOCENT_JOB_STORE)에 따른 작업 저장소 생성
+
+    - memory: 프로세스 메모리 (기본값, 단일 워커용)
+    - database: docent_job 테이블 (멀티 워커/재시작 안전)
+    - cache: Django 캐시 (DOCENT_JOB_STORE_CACHE 별칭, 기본 default)
+    """
+    backend = config('DOCENT_JOB_STORE', default='memory')
+    if backend not in JOB_STORE_BACKENDS:
+        raise ValueError(f"지원하지 않는 작업 저장소입니다: {backend}")
+
+    if backend == 'cache':
+        return CacheJobStore(namespace, ttl, cache_alias=config('DOCENT_JOB_STORE_CACHE', default='default'))
+    return JOB_STORE_BACKENDS[backend](namespace, ttl)
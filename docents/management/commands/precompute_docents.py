@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from docents.precompute import CATALOG_MODELS, run_precompute
+from docents.services import get_docent_service
+
+
+class Command(BaseCommand):
+    help = '카탈로그 작가/작품의 도슨트 스크립트와 음성을 미리 생성합니다. (중단 후 다시 실행하면 이어서 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            choices=['all', *CATALOG_MODELS.keys()],
+            default='all',
+            help='생성할 항목 유형 (기본값: all)'
+        )
+        parser.add_argument('--concurrency', type=int, default=4, help='동시 처리 항목 수 (기본값: 4)')
+        parser.add_argument('--limit', type=int, default=None, help='이번 실행에서 처리할 최대 항목 수')
+        parser.add_argument('--force', action='store_true', help='이미 완료된 항목도 다시 생성')
+
+    def handle(self, *args, **options):
+        item_types = list(CATALOG_MODELS) if options['type'] == 'all' else [options['type']]
+
+        results = run_precompute(
+            get_docent_service(),
+            item_types,
+            concurrency=max(1, options['concurrency']),
+            force=options['force'],
+            limit=options['limit'],
+            log=self.stdout.write,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"사전 생성 완료: 성공 {results['completed']}개, 실패 {results['failed']}개"
+        ))
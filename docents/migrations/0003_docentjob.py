@@ -0,0 +1,31 @@
+# Generated by Django 5.0.3 on 2026-10-17 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('docents', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocentJob',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('job_id', models.UUIDField(primary_key=True, serialize=False, verbose_name='작업 ID')),
+                ('namespace', models.CharField(max_length=20, verbose_name='작업 종류')),
+                ('status', models.CharField(default='pending', max_length=20, verbose_name='상태')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='작업 데이터')),
+                ('expires_at', models.DateTimeField(verbose_name='만료 시각')),
+            ],
+            options={
+                'verbose_name': '도슨트 작업',
+                'verbose_name_plural': '도슨트 작업 목록',
+                'db_table': 'docent_job',
+                'indexes': [models.Index(fields=['expires_at'], name='docent_job_expires_897503_idx'), models.Index(fields=['namespace', '-created_at'], name='docent_job_namespa_75fffa_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-18 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('docents', '0003_docentjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecomputedDocent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('item_type', models.CharField(choices=[('artist', '작가'), ('artwork', '작품')], max_length=10, verbose_name='항목 유형')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='항목 ID')),
+                ('item_name', models.CharField(max_length=200, verbose_name='항목 이름')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('completed', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='상태')),
+                ('script', models.TextField(blank=True, verbose_name='도슨트 스크립트')),
+                ('audio_path', models.CharField(blank=True, max_length=255, verbose_name='음성 파일 경로')),
+                ('audio_size', models.PositiveIntegerField(default=0, verbose_name='음성 파일 크기')),
+                ('audio_duration_ms', models.PositiveIntegerField(default=0, verbose_name='음성 재생 시간(ms)')),
+                ('timestamps', models.JSONField(blank=True, default=list, verbose_name='문장별 타임스탬프')),
+                ('error', models.TextField(blank=True, verbose_name='에러 메시지')),
+            ],
+            options={
+                'verbose_name': '사전 생성 도슨트',
+                'verbose_name_plural': '사전 생성 도슨트 목록',
+                'db_table': 'precomputed_docent',
+                'indexes': [models.Index(fields=['item_type', 'status'], name='precomputed_item_ty_8ff034_idx')],
+                'unique_together': {('item_type', 'object_id')},
+            },
+        ),
+    ]
@@ -87,3 +87,62 @@ class Docent(TimeStampedModel):
             return f"{self.folder.name} - {self.title} (작가)"
         else:
             return f"{self.folder.name} - {self.title} (작품)"
+
+
+class DocentJob(TimeStampedModel):
+    """백그라운드 작업 상태 모델 (DB 작업 저장소용)"""
+    job_id = models.UUIDField(_('작업 ID'), primary_key=True)
+    namespace = models.CharField(_('작업 종류'), max_length=20)
+    status = models.CharField(_('상태'), max_length=20, default='pending')
+    data = models.JSONField(_('작업 데이터'), default=dict, blank=True)
+    expires_at = models.DateTimeField(_('만료 시각'))
+
+    class Meta:
+        verbose_name = _('도슨트 작업')
+        verbose_name_plural = _('도슨트 작업 목록')
+        db_table = 'docent_job'
+        indexes = [
+            models.Index(fields=['expires_at']),  # 만료 작업 일괄 삭제 최적화
+            models.Index(fields=['namespace', '-created_at']),  # 작업 목록 조회 최적화
+        ]
+
+    def __str__(self):
+        return f"{self.namespace} {self.job_id} ({self.status})"
+
+
+class PrecomputedDocent(TimeStampedModel):
+    """카탈로그(작가/작품) 사전 생성 도슨트 모델
+
+    precompute_docents 명령으로 미리 생성한 스크립트와 음성을 저장하며,
+    실시간 도슨트 요청이 카탈로그 항목으로 해석되면 LLM/Polly 호출 없이 바로 응답합니다.
+    상태가 completed가 아닌 항목은 다음 실행 시 다시 처리됩니다.
+    """
+    STATUS_CHOICES = (
+        ('pending', _('대기')),
+        ('completed', _('완료')),
+        ('failed', _('실패')),
+    )
+
+    item_type = models.CharField(_('항목 유형'), max_length=10, choices=Docent.ITEM_TYPES)
+    object_id = models.PositiveBigIntegerField(_('항목 ID'))
+    item_name = models.CharField(_('항목 이름'), max_length=200)
+    status = models.CharField(_('상태'), max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    script = models.TextField(_('도슨트 스크립트'), blank=True)
+    audio_path = models.CharField(_('음성 파일 경로'), max_length=255, blank=True)
+    audio_size = models.PositiveIntegerField(_('음성 파일 크기'), default=0)
+    audio_duration_ms = models.PositiveIntegerField(_('음성 재생 시간(ms)'), default=0)
+    timestamps = models.JSONField(_('문장별 타임스탬프'), default=list, blank=True)
+    error = models.TextField(_('에러 메시지'), blank=True)
+
+    class Meta:
+        verbose_name = _('사전 생성 도슨트')
+        verbose_name_plural = _('사전 생성 도슨트 목록')
+        unique_together = ('item_type', 'object_id')
+        db_table = 'precomputed_docent'
+        indexes = [
+            models.Index(fields=['item_type', 'status']),  # 미완료 항목 재처리 조회 최적화
+        ]
+
+    def __str__(self):
+        return f"{self.item_name} ({self.item_type}, {self.status})"
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from decouple import config
+from django.db import close_old_connections
+from django.db.models import Subquery
+
+from artists.models import Artist
+from artworks.models import Artwork
+
+from .audio import save_precomputed_audio, mp3_duration_ms
+from .models import PrecomputedDocent
+
+
+# 사전 생성 대상 카탈로그 모델
+CATALOG_MODELS = {
+    'artist': Artist,
+    'artwork': Artwork,
+}
+
+
+def catalog_query(item_type: str, entity) -> str:
+    """카탈로그 항목을 LLM 입력 문구로 변환 (작품은 작가명 포함)"""
+    if item_type == 'artwork' and entity.artist_name:
+        return f"{entity.artist_name}의 {entity.title}"
+    return entity.title
+
+
+def get_precomputed_docent(resolved: dict) -> Optional[PrecomputedDocent]:
+    """해석된 카탈로그 항목의 사전 생성 도슨트 반환 (충분히 확실한 일치일 때만)"""
+    if not resolved or resolved['score'] < config('PRECOMPUTED_MIN_SCORE', default=0.8, cast=float):
+        return None
+
+    return PrecomputedDocent.objects.filter(
+        item_type=resolved['item_type'],
+        object_id=resolved['object_id'],
+        status='completed'
+    ).first()
+
+
+def pending_entities(item_types: list, force: bool = False, limit: int = None) -> list:
+    """사전 생성할 (item_type, 항목) 목록
+
+    완료된 항목은 건너뛰므로 중단된 실행을 다시 시작하면 남은 항목부터 이어서 처리합니다.
+    """
+    entities = []
+    for item_type in item_types:
+        queryset = CATALOG_MODELS[item_type].objects.order_by('id')
+        if not force:
+            completed_ids = PrecomputedDocent.objects.filter(
+                item_type=item_type,
+                status='completed'
+            ).values('object_id')
+            queryset = queryset.exclude(id__in=Subquery(completed_ids))
+        entities.extend((item_type, entity) for entity in queryset)
+
+    return entities[:limit] if limit else entities
+
+
+def precompute_entity(docent_service, item_type: str, entity) -> PrecomputedDocent:
+    """카탈로그 항목 하나의 스크립트와 음성 생성 후 저장 (워커 스레드에서 실행)
+
+    생성이 모두 끝난 뒤에 한 번만 저장하므로 --force 재생성 중에도 기존 완료 항목이 계속 응답에 쓰이고,
+    생성에 실패하면 기존 완료 항목은 그대로 두고 에러만 기록합니다.
+    """
+    try:
+        try:
+            script_text = docent_service.generate_catalog_script(
+                catalog_query(item_type, entity),
+                resolved={'item_type': item_type, 'item_name': entity.title}
+            )
+            audio_bytes, timestamps, _ = docent_service._generate_audio_and_timestamps(script_text)
+            audio_path = save_precomputed_audio(f"{item_type}_{entity.id}.mp3", audio_bytes)
+        except Exception as e:
+            return record_precompute_failure(item_type, entity, str(e))
+
+        row, _ = PrecomputedDocent.objects.update_or_create(
+            item_type=item_type,
+            object_id=entity.id,
+            defaults={
+                'item_name': entity.title,
+                'status': 'completed',
+                'script': script_text,
+                'audio_path': audio_path,
+                'audio_size': len(audio_bytes),
+                'audio_duration_ms': round(mp3_duration_ms(audio_bytes)),
+                'timestamps': timestamps,
+                'error': '',
+            }
+        )
+        return row
+    finally:
+        close_old_connections()
+
+
+def record_precompute_failure(item_type: str, entity, error: str) -> PrecomputedDocent:
+    """생성 실패 기록 (이미 완료된 항목은 스크립트/음성과 상태를 유지하고 에러만 기록)"""
+    row, created = PrecomputedDocent.objects.get_or_create(
+        item_type=item_type,
+        object_id=entity.id,
+        defaults={'item_name': entity.title, 'status': 'failed', 'error': error}
+    )
+    if not created:
+        if row.status != 'completed':
+            row.status = 'failed'
+        row.error = error
+        row.save(update_fields=['status', 'error', 'updated_at'])
+    return row
+
+
+def run_precompute(docent_service, item_types: list, concurrency: int = 4,
+                   force: bool = False, limit: int = None, log=print) -> dict:
+    """카탈로그 도슨트 일괄 사전 생성 (동시 처리 수 제한)"""
+    entities = pending_entities(item_types, force=force, limit=limit)
+    log(f"📚 사전 생성 대상 {len(entities)}개 (동시 처리 {concurrency}개)")
+
+    results = {'completed': 0, 'failed': 0}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='precompute') as executor:
+        futures = [
+            executor.submit(precompute_entity, docent_service, item_type, entity)
+            for item_type, entity in entities
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            # 에러는 마지막 시도가 실패했을 때만 남음 (완료 항목 재생성 실패 포함)
+            results['failed' if row.error else 'completed'] += 1
+            if row.error:
+                log(f"❌ [{done}/{len(entities)}] {row.item_name}: {row.error}")
+            else:
+                log(f"✅ [{done}/{len(entities)}] {row.item_name}")
+
+    return results
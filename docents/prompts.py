@@ -0,0 +1,191 @@
+import json
+import textwrap
+import threading
+
+from decouple import config
+
+try:
+    import tiktoken
+except ImportError:  # 토큰 수는 추정치로 대체
+    tiktoken = None
+
+
+def compact_prompt(text: str) -> str:
+    """프롬프트 정리 - 들여쓰기/줄끝 공백 제거, 연속 빈 줄은 하나로"""
+    lines = [line.strip() for line in textwrap.dedent(text).strip().splitlines()]
+    compacted = []
+    for line in lines:
+        if not line and compacted and not compacted[-1]:
+            continue
+        compacted.append(line)
+    return '\n'.join(compacted)
+
+
+# 도슨트 생성 지침 (고정 system 메시지 - 매 요청 동일한 접두어라 제공자 측 프롬프트 캐시 대상)
+DOCENT_SYSTEM_PROMPT = compact_prompt("""
+    당신은 전문 미술관 도슨트입니다.
+    입력이 작가명인지 작품명인지 판별하고, 그에 맞는 3-4분 분량의 상세한 도슨트를 작성해주세요.
+
+    **응답 형식을 반드시 지켜주세요:**
+    {"type": "artist" 또는 "artwork", "name": "정확한 이름"}
+    [도슨트 내용]
+
+    **작가인 경우 (type: artist):**
+    - name에는 작가의 정확한 풀네임을 기록 (예: "다빈치" 입력 시 "레오나르도 다 빈치")
+    - 작가의 생애와 배경
+    - 주요 작품과 특징
+    - 예술사적 의미
+    - 흥미로운 일화나 사실
+
+    **작품인 경우 (type: artwork):**
+    - name에는 작품명만 기록 (예: "다빈치의 모나리자" 입력 시 "모나리자")
+    - 작품의 기본 정보 (제작 시기, 기법 등)
+    - 작품의 주제와 의미
+    - 시각적 특징과 기법
+    - 역사적/문화적 배경
+    - 감상 포인트
+
+    친근하고 교육적인 톤으로, 마치 실제 미술관에서 개인에게 설명하는 것처럼 작성해주세요.
+    반드시 첫 줄에 위 형식의 JSON 객체 하나만 한 줄로 작성하고(코드 블록 없이), 다음 줄부터 도슨트 내용을 작성해주세요.
+""")
+
+IMAGE_INSTRUCTION = "제공된 이미지도 함께 분석해서 더 정확한 설명을 해주세요."
+
+# 타입별 응답 토큰 상한 (3-4분 분량 + JSON 헤더)
+DOCENT_MAX_TOKENS = {
+    'artist': config('DOCENT_MAX_TOKENS_ARTIST', default=2000, cast=int),
+    'artwork': config('DOCENT_MAX_TOKENS_ARTWORK', default=1600, cast=int),
+}
+
+
+def docent_max_tokens(item_type: str = None) -> int:
+    """응답 토큰 상한 (타입을 모르면 가장 큰 값)"""
+    return DOCENT_MAX_TOKENS.get(item_type, max(DOCENT_MAX_TOKENS.values()))
+
+
+def docent_header_json(item_type: str, item_name: str) -> str:
+    """응답 첫 줄의 구조화 헤더 (한 줄 JSON)"""
+    return json.dumps({'type': item_type, 'name': item_name}, ensure_ascii=False)
+
+
+def build_docent_messages(query: str, resolved: dict = None, image_url: str = None) -> list:
+    """도슨트 생성 메시지 목록 (고정 system 지침 + 요청별 user 입력)"""
+    user_lines = [f'입력: "{query}"']
+    if resolved:
+        # 카탈로그에서 해석된 경우 타입/이름을 알려줘서 판별을 생략하게 함
+        type_label = '작가' if resolved['item_type'] == 'artist' else '작품'
+        user_lines.append(
+            f'참고: 이 입력은 {type_label} "{resolved["item_name"]}"입니다. '
+            f'첫 줄은 {docent_header_json(resolved["item_type"], resolved["item_name"])}로 작성해주세요.'
+        )
+
+    user_text = '\n'.join(user_lines)
+    if image_url:
+        user_content = [
+            {"type": "text", "text": f"{user_text}\n{IMAGE_INSTRUCTION}"},
+            {"type": "image_url", "image_url": {"url": image_url}},
+        ]
+    else:
+        user_content = user_text
+
+    return [
+        {"role": "system", "content": DOCENT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_content},
+    ]
+
+
+_encodings = {}
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding(model: str):
+    """모델별 tiktoken 인코딩 (불러올 수 없으면 None, 실패도 기억해서 재시도하지 않음)"""
+    if tiktoken is None:
+        return None
+    with _encoding_lock:
+        if model not in _encodings:
+            try:
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encodings[model] = tiktoken.get_encoding('o200k_base')
+            except Exception as e:  # 인코딩 파일 다운로드 실패 등
+                print(f"⚠️ tiktoken 인코딩 로드 실패 ({model}), 토큰 수 추정치 사용: {e}")
+                _encodings[model] = None
+        return _encodings[model]
+
+
+def count_tokens(text: str, model: str) -> int:
+    """텍스트 토큰 수 (tiktoken이 없으면 UTF-8 바이트 기준 추정)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return max(1, len(text.encode('utf-8')) // 3)
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: list, model: str) -> int:
+    """Chat 메시지 목록의 입력 토큰 수 (텍스트만 계산, 메시지당 형식 토큰 포함)"""
+    total = 3  # 응답 시작 토큰
+    for message in messages:
+        total += 3
+        content = message['content']
+        if isinstance(content, str):
+            total += count_tokens(content, model)
+        else:
+            total += sum(count_tokens(part.get('text', ''), model) for part in content)
+    return total
+
+
+class PromptUsageStats:
+    """LLM 요청별 토큰 사용량/지연 시간 집계 (비용, 지연 추적용)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.truncated = 0
+        self.estimated = 0
+        self.seconds = 0.0
+
+    def record(
+        self,
+        prompt_tokens: int,
+        completion_tokens: int,
+        seconds: float,
+        cached_prompt_tokens: int = 0,
+        truncated: bool = False,
+        estimated: bool = False,
+    ):
+        """요청 한 건의 사용량 기록"""
+        with self.lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_prompt_tokens += cached_prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.truncated += int(truncated)
+            self.estimated += int(estimated)
+            self.seconds += seconds
+
+    def stats(self) -> dict:
+        """누적/평균 사용량 조회"""
+        with self.lock:
+            requests = self.requests or 1
+            return {
+                'requests': self.requests,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_prompt_tokens': self.cached_prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'prompt_tokens_avg': round(self.prompt_tokens / requests, 1),
+                'completion_tokens_avg': round(self.completion_tokens / requests, 1),
+                'seconds_avg': round(self.seconds / requests, 3),
+                'truncated': self.truncated,
+                'estimated': self.estimated,
+            }
+
+
+# 전역 토큰 사용량 집계 인스턴스
+prompt_usage_stats = PromptUsageStats()
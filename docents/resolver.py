@@ -0,0 +1,185 @@
+import bisect
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Optional
+
+from decouple import config
+
+
+# 호환용 자모(키보드 입력) -> 첫소리 자모 (입력 중인 글자도 부분 일치하도록)
+_COMPAT_CHOSEONG = dict(zip(
+    'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ',
+    'ᄀᄁᄂᄃᄄᄅᄆᄇᄈᄉᄊᄋᄌᄍᄎᄏᄐᄑᄒ',
+))
+
+# 비교에서 제외할 문자 (공백, 문장부호, 따옴표 등)
+_NON_WORD_RE = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def normalize_name(text: str) -> str:
+    """이름 비교용 정규화
+
+    전각/호환 문자 통일, 소문자화, 공백/문장부호 제거 후
+    한글 음절을 자모로 분해합니다. ("모나리자" -> "ᄆ ᅩ ᄂ ᅡ ...")
+    자모 단위로 비교하므로 받침만 다르거나 입력 중인 글자도 유사도가 높게 나옵니다.
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = _NON_WORD_RE.sub('', text)
+    text = ''.join(_COMPAT_CHOSEONG.get(char, char) for char in text)
+    return unicodedata.normalize('NFD', text)
+
+
+def trigrams(key: str) -> set:
+    """정규화된 키의 3-gram 집합 (짧은 키는 양끝 패딩)"""
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CatalogResolver:
+    """입력 문구를 카탈로그 작가/작품으로 해석하는 메모리 인덱스
+
+    작가명(과 줄임말), 작품명, "작가명+작품명" 조합을 정규화한 키로 등록하고
+    1) 정확히 일치 2) 접두어 일치(정렬된 키 + 이진 탐색) 3) 자모 3-gram 유사도(Dice)
+    순서로 찾습니다. 인덱스는 카탈로그가 변경되면(시그널) 또는 TTL이 지나면
+    다음 조회 시 다시 만듭니다.
+    """
+
+    # 접두어 일치로 인정하는 최소 입력 길이 (자모 기준, 약 두 글자)
+    MIN_PREFIX_LENGTH = 4
+
+    def __init__(self, ttl: int = 300, min_score: float = 0.6):
+        self.ttl = ttl
+        self.min_score = min_score
+        self.lock = threading.Lock()
+        self._dirty = True
+        self._built_at = 0.0
+        self._build_lock = threading.Lock()
+        self._entries = []      # [(item_type, object_id, item_name, key, 3-gram 수)]
+        self._exact = {}        # key -> entry index
+        self._sorted_keys = []  # [(key, entry index)] 접두어 탐색용
+        self._postings = {}     # trigram -> [entry index]
+
+    def invalidate(self):
+        """카탈로그 변경 시 다음 조회에서 인덱스 재생성"""
+        self._dirty = True
+
+    def _load_catalog(self):
+        """(item_type, object_id, item_name, [검색 키 원문]) 목록 조회"""
+        from artists.models import Artist
+        from artworks.models import Artwork
+
+        for object_id, title in Artist.objects.values_list('id', 'title'):
+            yield 'artist', object_id, title, [title, *self._name_aliases(title)]
+
+        for object_id, title, artist_name in Artwork.objects.values_list('id', 'title', 'artist_name'):
+            names = [title]
+            if artist_name:
+                names += [f"{artist_name} {title}", f"{artist_name}의 {title}"]
+            yield 'artwork', object_id, title, names
+
+    @staticmethod
+    def _name_aliases(name: str) -> list:
+        """작가명 줄임말 (마지막 한두 단어, 예: "빈센트 반 고흐" -> "반 고흐", "고흐")"""
+        words = name.split()
+        if len(words) < 2:
+            return []
+        aliases = [' '.join(words[-2:])] if len(words) > 2 else []
+        if len(words[-1]) >= 2:
+            aliases.append(words[-1])
+        return aliases
+
+    def build(self, catalog=None):
+        """인덱스 생성 (catalog 미지정 시 DB에서 조회)"""
+        entries, exact, sorted_keys, postings = [], {}, [], {}
+
+        for item_type, object_id, item_name, names in (catalog if catalog is not None else self._load_catalog()):
+            for name in names:
+                key = normalize_name(name)
+                if not key or key in exact:
+                    continue  # 같은 키는 먼저 등록된 항목 유지 (작가 > 작품, 전체 이름 > 줄임말)
+                index = len(entries)
+                grams = trigrams(key)
+                entries.append((item_type, object_id, item_name, key, len(grams)))
+                exact[key] = index
+                sorted_keys.append((key, index))
+                for gram in grams:
+                    postings.setdefault(gram, []).append(index)
+
+        sorted_keys.sort()
+        with self.lock:
+            self._entries, self._exact = entries, exact
+            self._sorted_keys, self._postings = sorted_keys, postings
+            self._built_at = time.monotonic()
+            self._dirty = False
+        print(f"🔎 카탈로그 인덱스 생성: 키 {len(entries)}개")
+
+    def _is_stale(self) -> bool:
+        return self._dirty or time.monotonic() - self._built_at > self.ttl
+
+    def _ensure_index(self):
+        if self._is_stale():
+            with self._build_lock:
+                if self._is_stale():
+                    self.build()
+
+    def resolve(self, text: str) -> Optional[dict]:
+        """입력을 카탈로그 항목으로 해석 - {item_type, object_id, item_name, score} 또는 None"""
+        key = normalize_name(text)
+        if not key:
+            return None
+
+        self._ensure_index()
+        with self.lock:
+            entries, exact = self._entries, self._exact
+            sorted_keys, postings = self._sorted_keys, self._postings
+
+        # 1) 정확히 일치
+        if key in exact:
+            return self._result(entries[exact[key]], 1.0)
+
+        # 2) 접두어 일치 - 가장 짧은(입력과 가장 가까운) 키 선택, 입력이 키의 상당 부분일 때만 인정
+        if len(key) >= self.MIN_PREFIX_LENGTH:
+            position = bisect.bisect_left(sorted_keys, (key,))
+            best = None
+            while position < len(sorted_keys) and sorted_keys[position][0].startswith(key):
+                candidate_key, index = sorted_keys[position]
+                if best is None or len(candidate_key) < len(entries[best][3]):
+                    best = index
+                position += 1
+            if best is not None and len(key) / len(entries[best][3]) >= self.min_score:
+                return self._result(entries[best], len(key) / len(entries[best][3]))
+
+        # 3) 자모 3-gram 유사도 (Dice 계수)
+        query_grams = trigrams(key)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(postings.get(gram, ()))
+        best, best_score = None, 0.0
+        for index, count in shared.items():
+            score = 2 * count / (len(query_grams) + entries[index][4])
+            if score > best_score:
+                best, best_score = index, score
+
+        if best is not None and best_score >= self.min_score:
+            return self._result(entries[best], best_score)
+        return None
+
+    @staticmethod
+    def _result(entry, score: float) -> dict:
+        item_type, object_id, item_name = entry[:3]
+        return {
+            'item_type': item_type,
+            'object_id': object_id,
+            'item_name': item_name,
+            'score': round(score, 3),
+        }
+
+
+# 전역 카탈로그 해석기 인스턴스
+catalog_resolver = CatalogResolver(
+    ttl=config('CATALOG_RESOLVER_TTL', default=300, cast=int),
+    min_score=config('CATALOG_RESOLVER_MIN_SCORE', default=0.6, cast=float),
+)
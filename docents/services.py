@@ -1,21 +1,120 @@
+import asyncio
 import json
-import base64
-from openai import OpenAI
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 import boto3
+from botocore.config import Config as BotoConfig
+from asgiref.sync import sync_to_async
 from decouple import config
 
+from .audio import split_script_chunks, mp3_duration_ms
+from .cache import docent_result_cache
+from .image_index import image_recognition_index
+from .prompts import (
+    build_docent_messages,
+    count_message_tokens,
+    count_tokens,
+    docent_max_tokens,
+    prompt_usage_stats,
+)
+from .resolver import catalog_resolver
+from .singleflight import docent_singleflight
+
+
+# 스트리밍 시 헤더 없이 이 길이를 넘으면 기본값으로 본문 전송 시작
+STREAM_HEADER_MAX_CHARS = 500
+
+# Polly 음성 설정 (음성 캐시 키에도 사용)
+POLLY_VOICE_ID = config('POLLY_VOICE_ID', default='Seoyeon')
+POLLY_OUTPUT_FORMAT = 'mp3'
+
+# 이벤트 루프별 공유 AsyncOpenAI 클라이언트 (ASGI 워커에서는 프로세스당 하나)
+_async_openai_clients = weakref.WeakKeyDictionary()
+_async_openai_lock = threading.Lock()
+
+
+# 프로세스 전역 DocentService 인스턴스 (get_docent_service로 접근)
+_docent_service = None
+_docent_service_lock = threading.Lock()
+
+
+def _openai_http_limits() -> httpx.Limits:
+    """OpenAI HTTP 연결 풀 크기 설정"""
+    return httpx.Limits(
+        max_connections=config('OPENAI_MAX_CONNECTIONS', default=100, cast=int),
+        max_keepalive_connections=config('OPENAI_MAX_KEEPALIVE_CONNECTIONS', default=20, cast=int),
+    )
+
+
+def get_docent_service() -> 'DocentService':
+    """프로세스 전역 DocentService 반환 (최초 호출 시 스레드 안전하게 생성)
+
+    OpenAI/Polly 클라이언트와 HTTP 연결 풀을 요청 간에 재사용합니다.
+    생성에 실패하면 캐시하지 않으므로 설정을 고친 뒤 다시 시도할 수 있습니다.
+    """
+    global _docent_service
+    if _docent_service is None:
+        with _docent_service_lock:
+            if _docent_service is None:
+                _docent_service = DocentService()
+                print("✅ DocentService 공유 인스턴스 생성")
+    return _docent_service
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    """현재 이벤트 루프에서 공유하는 AsyncOpenAI 클라이언트 반환
+
+    httpx 연결 풀은 이벤트 루프에 묶이므로 루프마다 하나의 클라이언트를 재사용합니다.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_openai_lock:
+        client = _async_openai_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                http_client=DefaultAsyncHttpxClient(limits=_openai_http_limits()),
+            )
+            _async_openai_clients[loop] = client
+        return client
+
+
+async def close_async_openai_client():
+    """현재 이벤트 루프의 공유 AsyncOpenAI 클라이언트 닫기
+
+    asyncio.run()이나 WSGI 요청의 async_to_sync처럼 잠깐 쓰고 끝나는 루프에서는 루프를 닫기 전에 호출해서
+    클라이언트와 httpx 연결 풀이 남지 않도록 합니다.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_openai_lock:
+        client = _async_openai_clients.pop(loop, None)
+    if client is not None:
+        await client.close()
+
 
 class DocentService:
-    """도슨트 생성 서비스"""
-    
+    """도슨트 생성 서비스
+
+    클라이언트 생성 비용(TLS 핸드셰이크, 자격 증명 확인)이 크므로
+    직접 생성하지 말고 get_docent_service()로 공유 인스턴스를 사용합니다.
+    """
+
     def __init__(self):
         # OpenAI 설정
         openai_api_key = config('OPENAI_API_KEY', default='')
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-            
-        self.openai_client = OpenAI(api_key=openai_api_key)
-        
+
+        self.openai_api_key = openai_api_key
+        self.openai_client = OpenAI(
+            api_key=openai_api_key,
+            http_client=DefaultHttpxClient(limits=_openai_http_limits()),
+        )
+
         # AWS Polly 설정
         aws_access_key = config('AWS_ACCESS_KEY_ID', default='')
         aws_secret_key = config('AWS_SECRET_ACCESS_KEY', default='')
@@ -28,188 +127,703 @@ class DocentService:
             "polly",
             aws_access_key_id=aws_access_key,
             aws_secret_access_key=aws_secret_key,
-            region_name=aws_region
+            region_name=aws_region,
+            config=BotoConfig(
+                max_pool_connections=config('POLLY_MAX_POOL_CONNECTIONS', default=10, cast=int),
+                retries={'max_attempts': 3, 'mode': 'adaptive'},
+            )
+        )
+        # Polly 요청 병렬 실행용 스레드 풀 (boto3 클라이언트는 스레드 안전)
+        self.polly_executor = ThreadPoolExecutor(
+            max_workers=config('POLLY_MAX_CONCURRENCY', default=8, cast=int),
+            thread_name_prefix='polly',
         )
 
+    @property
+    def async_openai_client(self) -> AsyncOpenAI:
+        """현재 이벤트 루프의 공유 AsyncOpenAI 클라이언트"""
+        return get_async_openai_client(self.openai_api_key)
+
     async def generate_realtime_docent(
-        self, 
+        self,
         prompt_text: str = None,
         prompt_image: str = None,
+        image_hash: int = None,
+        background: bool = False,
     ) -> dict:
-        """실시간 도슨트 스크립트 생성"""
+        """실시간 도슨트 스크립트 생성
+
+        image_hash(업로드 사진의 dHash)가 주어지면 이전에 인식한 비슷한 사진의 결과를 재사용합니다.
+        background(배치 생성)이면 음성을 배치 우선순위로 등록하고 스크립트 생성 중 합성은 하지 않습니다.
+        """
         try:
             print(f"🎯 API 호출됨!")
             print(f"📝 prompt_text: {prompt_text}")
             print(f"🖼️ prompt_image: {prompt_image}")
-            
-            # 입력값 결정
-            if prompt_text:
-                query = prompt_text
-                use_image = False
-            elif prompt_image:
-                query = "이미지를 분석해서 도슨트를 생성해주세요"
-                use_image = True
-                
+
+            query, use_image = self._resolve_query(prompt_text, prompt_image)
+
             print(f"🔍 최종 query: {query}")
             print(f"🖼️ 이미지 사용: {use_image}")
-            
-            print("🤖 LLM으로 도슨트 생성 시작...")
-            
-            # 통합 프롬프트 - 타입 판별과 도슨트 생성을 한 번에
-            unified_prompt = f"""
-            당신은 전문 미술관 도슨트입니다.
-
-            입력: "{query}"
-
-            먼저 이것이 작가명인지 작품명인지 판별하고, 그에 맞는 3-4분 분량의 상세한 도슨트를 작성해주세요.
-
-            **응답 형식을 반드시 지켜주세요:**
-            
-            TYPE: artist (또는 artwork)
-            NAME: [정확한 이름]
-            
-            [도슨트 내용]
-
-            **작가인 경우 (TYPE: artist):**
-            - NAME에는 작가의 정확한 풀네임을 기록 (예: "다빈치" 입력 시 "레오나르도 다 빈치")
-            - 작가의 생애와 배경
-            - 주요 작품과 특징  
-            - 예술사적 의미
-            - 흥미로운 일화나 사실
-
-            **작품인 경우 (TYPE: artwork):**
-            - NAME에는 작품명만 기록 (예: "다빈치의 모나리자" 입력 시 "모나리자")
-            - 작품의 기본 정보 (제작 시기, 기법 등)
-            - 작품의 주제와 의미
-            - 시각적 특징과 기법
-            - 역사적/문화적 배경
-            - 감상 포인트
-
-            친근하고 교육적인 톤으로, 마치 실제 미술관에서 개인에게 설명하는 것처럼 작성해주세요.
-            반드시 첫 줄에 "TYPE: artist" 또는 "TYPE: artwork"를, 둘째 줄에 "NAME: [정확한 이름]"을 명시하고, 그 다음 줄부터 도슨트 내용을 작성해주세요.
-            """
-            
-            print(f"📤 LLM에 전송할 프롬프트: {unified_prompt}...")
-            
-            if use_image and prompt_image:
-                # 이미지가 있는 경우 GPT-4.1-nano 사용
-                messages = [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": unified_prompt + "\n\n제공된 이미지도 함께 분석해서 더 정확한 설명을 해주세요."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": prompt_image}
-                            }
-                        ]
-                    }
-                ]
-                
-                response = self.openai_client.chat.completions.create(
-                    model=config('OPENAI_VISION_MODEL', default='gpt-4.1-mini'),
-                    messages=messages,
-                    max_tokens=4096
+
+            # 카탈로그 작가/작품으로 해석되고 사전 생성된 도슨트가 있으면 LLM/Polly 없이 응답
+            resolved = None
+            if not use_image:
+                resolved, precomputed = await sync_to_async(self._lookup_catalog)(query)
+                if precomputed:
+                    print(f"📚 사전 생성 도슨트 사용: {precomputed['item_type']} '{precomputed['item_name']}'")
+                    return precomputed
+
+            # 같은 입력(텍스트 또는 같은 해시의 사진)의 동시 요청은 LLM 호출 하나로 합침
+            cache_key = self._cache_key(query, use_image)
+            flight_key = self._flight_key(cache_key, image_hash)
+            if flight_key:
+                generated = await docent_singleflight.do(
+                    flight_key,
+                    lambda: self._generate_script(
+                        query, use_image, prompt_image, cache_key, image_hash, resolved, early_tts=not background
+                    ),
                 )
             else:
-                # 텍스트만 있는 경우
-                messages = [
-                    {
-                        "role": "user", 
-                        "content": unified_prompt
-                    }
-                ]
-                
-                response = self.openai_client.chat.completions.create(
-                    model=config('OPENAI_MODEL', default='gpt-4.1-nano'),
-                    messages=messages
+                generated = await self._generate_script(
+                    query, use_image, prompt_image, cache_key, image_hash, resolved, early_tts=not background
                 )
-            
-            full_response = response.choices[0].message.content
-            
-            print(f"📥 LLM 응답 받음!")
-            print(f"📏 전체 응답 길이: {len(full_response)}")
-            print(f"📄 응답 미리보기: {full_response[:200]}...")
-            
-            # 타입 파싱
-            lines = full_response.split('\n')
-            final_item_type = "artist"  # 기본값
-            final_item_name = query  # 기본값 (원본 입력)
-            script_text = full_response  # 기본값
-            
-            # TYPE과 NAME 라인을 찾아서 파싱
-            type_line_index = -1
-            name_line_index = -1
-            
-            for i, line in enumerate(lines):
-                stripped_line = line.strip()
-                
-                if stripped_line.startswith('TYPE:'):
-                    type_part = stripped_line.replace('TYPE:', '').strip().lower()
-                    if 'artwork' in type_part:
-                        final_item_type = "artwork"
-                    elif 'artist' in type_part:
-                        final_item_type = "artist"
-                    type_line_index = i
-                
-                elif stripped_line.startswith('NAME:'):
-                    name_part = stripped_line.replace('NAME:', '').strip()
-                    if name_part:  # NAME이 비어있지 않은 경우만
-                        final_item_name = name_part
-                    name_line_index = i
-            
-            # 스크립트 텍스트 추출 (TYPE과 NAME 라인 이후부터)
-            script_start_index = max(type_line_index, name_line_index) + 1
-            if script_start_index < len(lines):
-                script_text = '\n'.join(lines[script_start_index:]).strip()
-            
-            print(f"🎨 파싱된 타입: {final_item_type}")
-            print(f"📛 파싱된 이름: {final_item_name}")
-            print(f"📄 최종 스크립트 미리보기: {script_text[:100]}...")
-            
-            # 음성 생성 작업 시작
-            from .tasks import audio_job_manager
-            audio_job_id = audio_job_manager.create_job(script_text)
+
+            # 음성 생성 작업 시작 (같은 스크립트의 진행 중 작업이 있으면 공유)
+            audio_job_id = await sync_to_async(self._start_audio_job)(generated['text'], background)
             print(f"🔊 음성 작업 ID: {audio_job_id}")
-            
-            result = {
-                'text': script_text,
-                'item_type': final_item_type,
-                'item_name': final_item_name,  # 파싱된 이름 사용
-                'audio_job_id': audio_job_id
-            }
-            
+
+            result = dict(generated, audio_job_id=audio_job_id)
+
             print(f"✅ 최종 결과 반환!")
             return result
-            
+
         except Exception as e:
             print(f"❌ 에러 발생: {e}")
             import traceback
             traceback.print_exc()
             raise e
 
-    def _generate_audio_and_timestamps(self, script_text: str) -> tuple[str, list]:
-        """Amazon Polly를 이용한 음성 및 타임스탬프 생성"""
-        # 음성 생성
+    async def _generate_script(
+        self,
+        query: str,
+        use_image: bool,
+        prompt_image: str,
+        cache_key: str,
+        image_hash: int = None,
+        resolved: dict = None,
+        early_tts: bool = True,
+    ) -> dict:
+        """도슨트 스크립트 생성 (캐시 조회 -> LLM 호출 -> 파싱 -> 캐시 저장)
+
+        resolved(카탈로그 해석 결과)가 있으면 LLM에 타입/이름을 알려주고 그 값을 그대로 사용합니다.
+        LLM 응답은 스트리밍으로 받아 완성된 문장부터 음성 합성을 시작하며,
+        이후 같은 스크립트로 요청한 음성 작업은 그 작업을 공유합니다.
+        """
+        cached = self._get_cached_result(cache_key, image_hash)
+        if cached:
+            print(f"⚡ 캐시 적중: {cached['item_type']} '{cached['item_name']}'")
+            return cached
+
+        print("🤖 LLM으로 도슨트 생성 시작...")
+
+        generated = None
+        async for event, data in self._stream_script(query, use_image, prompt_image, resolved, early_tts):
+            if event == 'script':
+                generated = data
+
+        print(f"🎨 파싱된 타입: {generated['item_type']}")
+        print(f"📛 파싱된 이름: {generated['item_name']}")
+        print(f"📄 최종 스크립트 미리보기: {generated['text'][:100]}...")
+
+        generated = {
+            'text': generated['text'],
+            'item_type': generated['item_type'],
+            'item_name': generated['item_name'],  # 파싱된 이름 사용
+        }
+        self._store_result(cache_key, image_hash, generated)
+        return generated
+
+    async def stream_realtime_docent(
+        self,
+        prompt_text: str = None,
+        prompt_image: str = None,
+        image_hash: int = None,
+    ):
+        """실시간 도슨트 스크립트 스트리밍 생성
+
+        (event, data) 튜플을 순서대로 생성합니다.
+        - header: 응답 첫 줄의 타입/이름 헤더 {item_type, item_name}
+        - delta: 스크립트 조각 {text}
+        - done: 완료 정보 {audio_job_id}
+        """
+        query, use_image = self._resolve_query(prompt_text, prompt_image)
+
+        resolved = None
+        if not use_image:
+            resolved, precomputed = await sync_to_async(self._lookup_catalog)(query)
+            if precomputed:
+                print(f"📚 사전 생성 도슨트 사용 (스트리밍): {precomputed['item_type']} '{precomputed['item_name']}'")
+                yield 'header', {'item_type': precomputed['item_type'], 'item_name': precomputed['item_name']}
+                yield 'delta', {'text': precomputed['text']}
+                yield 'done', {'audio_job_id': precomputed['audio_job_id']}
+                return
+
+        cache_key = self._cache_key(query, use_image)
+        cached = self._get_cached_result(cache_key, image_hash)
+        if cached:
+            print(f"⚡ 캐시 적중 (스트리밍): {cached['item_type']} '{cached['item_name']}'")
+            yield 'header', {'item_type': cached['item_type'], 'item_name': cached['item_name']}
+            yield 'delta', {'text': cached['text']}
+            audio_job_id = await sync_to_async(self._start_audio_job)(cached['text'])
+            yield 'done', {'audio_job_id': audio_job_id}
+            return
+
+        print("🤖 LLM 스트리밍 도슨트 생성 시작...")
+
+        async for event, data in self._stream_script(query, use_image, prompt_image, resolved):
+            if event != 'script':
+                yield event, data
+                continue
+
+            self._store_result(cache_key, image_hash, {
+                'text': data['text'],
+                'item_type': data['item_type'],
+                'item_name': data['item_name'],
+            })
+            audio_job_id = data['audio_job_id']
+            if audio_job_id is None:
+                audio_job_id = await sync_to_async(self._start_audio_job)(data['text'])
+            yield 'done', {'audio_job_id': audio_job_id}
+
+    async def _stream_script(
+        self,
+        query: str,
+        use_image: bool,
+        prompt_image: str = None,
+        resolved: dict = None,
+        early_tts: bool = True,
+    ):
+        """LLM 스트리밍 응답을 헤더/본문 이벤트로 변환
+
+        (event, data) 튜플을 순서대로 생성합니다.
+        - header: {item_type, item_name}
+        - delta: 스크립트 조각 {text}
+        - script: 완성된 결과 {text, item_type, item_name, audio_job_id}
+        헤더가 나오면 스트리밍 음성 작업을 열고 본문 조각을 그대로 넘겨서
+        완성된 문장부터 Polly 합성이 시작되도록 합니다. (early_tts가 아니거나 작업을 열지 못하면 audio_job_id는 None)
+        """
+        request_kwargs = self._build_completion_request(query, use_image, prompt_image, resolved)
+        started = time.perf_counter()
+        stream = await self.async_openai_client.chat.completions.create(
+            stream=True,
+            stream_options={'include_usage': True},
+            **request_kwargs
+        )
+
+        pending = ''
+        header = None
+        speech = None
+        script_parts = []
+        raw_parts = []  # 토큰 수 계산용 원본 응답
+        usage = None
+        finish_reason = None
+
+        async def emit_header(parsed):
+            nonlocal header, speech
+            item_type, item_name, body = parsed
+            item_type, item_name = self._apply_resolved(item_type, item_name, resolved)
+            header = item_type, item_name, body
+            if early_tts:
+                speech = await self._start_speech_stream()
+            return {'item_type': item_type, 'item_name': item_name}
+
+        def add_body(text):
+            script_parts.append(text)
+            if speech:
+                speech.feed(text)
+
+        try:
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                delta = chunk.choices[0].delta.content or ''
+                if not delta:
+                    continue
+                raw_parts.append(delta)
+
+                if header:
+                    if not script_parts:
+                        # 본문 시작 전 공백/개행은 전송하지 않음
+                        delta = delta.lstrip()
+                        if not delta:
+                            continue
+                    add_body(delta)
+                    yield 'delta', {'text': delta}
+                    continue
+
+                # 헤더가 완성될 때까지 버퍼링
+                pending += delta
+                parsed = self._parse_stream_header(pending, query)
+                if parsed:
+                    yield 'header', await emit_header(parsed)
+                    if parsed[2]:
+                        add_body(parsed[2])
+                        yield 'delta', {'text': parsed[2]}
+
+            if not header:
+                # 헤더가 완성되기 전에 응답이 끝난 경우 전체 응답으로 파싱
+                parsed = self._parse_response(pending, query)
+                yield 'header', await emit_header(parsed)
+                if parsed[2]:
+                    add_body(parsed[2])
+                    yield 'delta', {'text': parsed[2]}
+
+            item_type, item_name, _ = header
+            script_text = ''.join(script_parts).strip()
+            print(f"📥 LLM 스트리밍 완료 (길이: {len(script_text)}, {item_type} '{item_name}')")
+            self._record_usage(request_kwargs, usage, ''.join(raw_parts), time.perf_counter() - started, finish_reason)
+
+            audio_job_id = None
+            if speech and script_text:
+                speech.finish(script_text)
+                audio_job_id = speech.job_id
+                print(f"🔊 스크립트 생성 중 시작된 음성 작업: {audio_job_id}")
+
+            yield 'script', {
+                'text': script_text,
+                'item_type': item_type,
+                'item_name': item_name,
+                'audio_job_id': audio_job_id,
+            }
+        finally:
+            # 클라이언트 연결 종료/오류로 스크립트가 완성되지 않으면 음성 작업 중단
+            if speech:
+                speech.abort("스크립트 생성이 중단되었습니다.")
+
+    async def _start_speech_stream(self):
+        """스크립트 생성과 함께 진행할 음성 작업 시작 (비활성화/한도 초과 시 None)"""
+        if not config('DOCENT_EARLY_TTS', default=True, cast=bool):
+            return None
+        from .tasks import audio_job_manager
+        return await sync_to_async(audio_job_manager.create_streaming_job)()
+
+    def _resolve_query(self, prompt_text: str = None, prompt_image: str = None) -> tuple[str, bool]:
+        """입력값 결정 (텍스트 우선)"""
+        if prompt_text:
+            return prompt_text, False
+        if prompt_image:
+            return "이미지를 분석해서 도슨트를 생성해주세요", True
+        raise ValueError("prompt_text 또는 prompt_image 중 하나는 필수입니다.")
+
+    def _cache_key(self, query: str, use_image: bool):
+        """텍스트 입력용 결과 캐시 키 (이미지 입력은 캐시하지 않음)"""
+        if use_image:
+            return None
+        return docent_result_cache.make_key(query, config('OPENAI_MODEL', default='gpt-4.1-nano'))
+
+    @staticmethod
+    def _flight_key(cache_key: str, image_hash: int = None):
+        """동시 요청 합치기 키 (텍스트는 캐시 키, 사진은 해시)"""
+        if cache_key:
+            return cache_key
+        if image_hash is not None:
+            return f"image:{image_hash:016x}"
+        return None
+
+    def _get_cached_result(self, cache_key: str, image_hash: int = None):
+        """이전 결과 조회 (텍스트는 결과 캐시, 사진은 지각 해시 인덱스)"""
+        if cache_key:
+            return docent_result_cache.get(cache_key)
+        if image_hash is not None:
+            match = image_recognition_index.find(image_hash)
+            if match:
+                value, distance = match
+                print(f"🖼️ 비슷한 사진 인식 결과 재사용 (해밍 거리 {distance})")
+                return value
+        return None
+
+    def _store_result(self, cache_key: str, image_hash: int, generated: dict):
+        """생성 결과 저장 (텍스트는 결과 캐시, 사진은 지각 해시 인덱스)"""
+        if cache_key:
+            docent_result_cache.set(cache_key, generated)
+        elif image_hash is not None:
+            image_recognition_index.add(image_hash, generated)
+
+    def _build_completion_request(
+        self,
+        query: str,
+        use_image: bool,
+        prompt_image: str = None,
+        resolved: dict = None,
+    ) -> dict:
+        """Chat Completions 요청 인자 생성 (고정 system 지침 + 요청별 입력, 타입별 토큰 상한)"""
+        if use_image and prompt_image:
+            # 이미지가 있는 경우 비전 모델 사용
+            model = config('OPENAI_VISION_MODEL', default='gpt-4.1-mini')
+            messages = build_docent_messages(query, resolved, image_url=prompt_image)
+        else:
+            model = config('OPENAI_MODEL', default='gpt-4.1-nano')
+            messages = build_docent_messages(query, resolved)
+
+        max_tokens = docent_max_tokens(resolved['item_type'] if resolved else None)
+        print(f"📤 LLM 요청: {model} (max_tokens {max_tokens}) 입력: \"{query}\"")
+
+        return {
+            'model': model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+        }
+
+    @staticmethod
+    def _record_usage(request_kwargs: dict, usage, completion_text: str, seconds: float, finish_reason: str = None):
+        """LLM 요청 토큰 사용량 기록 (응답에 usage가 없으면 tiktoken으로 계산)"""
+        model = request_kwargs['model']
+        if usage is not None:
+            prompt_tokens = usage.prompt_tokens
+            completion_tokens = usage.completion_tokens
+            details = getattr(usage, 'prompt_tokens_details', None)
+            cached_prompt_tokens = getattr(details, 'cached_tokens', None) or 0
+        else:
+            prompt_tokens = count_message_tokens(request_kwargs['messages'], model)
+            completion_tokens = count_tokens(completion_text, model)
+            cached_prompt_tokens = 0
+
+        truncated = finish_reason == 'length'
+        prompt_usage_stats.record(
+            prompt_tokens,
+            completion_tokens,
+            seconds,
+            cached_prompt_tokens=cached_prompt_tokens,
+            truncated=truncated,
+            estimated=usage is None,
+        )
+        print(
+            f"🧮 토큰 사용량: 입력 {prompt_tokens} (캐시 {cached_prompt_tokens}), "
+            f"출력 {completion_tokens}/{request_kwargs['max_tokens']}, {seconds:.2f}초"
+        )
+        if truncated:
+            print(f"⚠️ 응답이 토큰 상한({request_kwargs['max_tokens']})에서 잘렸습니다.")
+
+    @staticmethod
+    def _parse_item_type(type_part: str, default: str) -> str:
+        """TYPE 값 해석"""
+        type_part = type_part.strip().lower()
+        if 'artwork' in type_part:
+            return "artwork"
+        elif 'artist' in type_part:
+            return "artist"
+        return default
+
+    def _parse_json_header(self, line: str, query: str):
+        """첫 줄의 JSON 헤더 {"type", "name"} 해석 - (item_type, item_name), 형식이 아니면 None"""
+        line = line.strip()
+        if not line.startswith('{'):
+            return None
+        try:
+            header = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(header, dict):
+            return None
+        item_type = self._parse_item_type(str(header.get('type') or ''), "artist")
+        item_name = str(header.get('name') or '').strip() or query
+        return item_type, item_name
+
+    def _parse_response(self, full_response: str, query: str) -> tuple[str, str, str]:
+        """LLM 전체 응답에서 (item_type, item_name, script_text) 파싱
+
+        첫 줄이 JSON 헤더면 바로 분리하고, 아니면 TYPE:/NAME: 줄 형식으로 해석합니다.
+        """
+        first_line, _, body = full_response.lstrip().partition('\n')
+        header = self._parse_json_header(first_line, query)
+        if header:
+            return header[0], header[1], body.strip()
+        return self._parse_legacy_response(full_response, query)
+
+    def _parse_legacy_response(self, full_response: str, query: str) -> tuple[str, str, str]:
+        """TYPE:/NAME: 줄 형식 응답 파싱 (JSON 헤더가 없는 응답용)"""
+        lines = full_response.split('\n')
+        final_item_type = "artist"  # 기본값
+        final_item_name = query  # 기본값 (원본 입력)
+        script_text = full_response  # 기본값
+
+        # TYPE과 NAME 라인을 찾아서 파싱
+        type_line_index = -1
+        name_line_index = -1
+
+        for i, line in enumerate(lines):
+            stripped_line = line.strip()
+
+            if stripped_line.startswith('TYPE:'):
+                final_item_type = self._parse_item_type(stripped_line[len('TYPE:'):], final_item_type)
+                type_line_index = i
+
+            elif stripped_line.startswith('NAME:'):
+                name_part = stripped_line[len('NAME:'):].strip()
+                if name_part:  # NAME이 비어있지 않은 경우만
+                    final_item_name = name_part
+                name_line_index = i
+
+        # 스크립트 텍스트 추출 (TYPE과 NAME 라인 이후부터)
+        script_start_index = max(type_line_index, name_line_index) + 1
+        if script_start_index < len(lines):
+            script_text = '\n'.join(lines[script_start_index:]).strip()
+
+        return final_item_type, final_item_name, script_text
+
+    def _parse_stream_header(self, pending: str, query: str):
+        """스트리밍 중 수신된 앞부분에서 헤더 파싱
+
+        헤더가 아직 완성되지 않았으면 None,
+        완성되면 (item_type, item_name, 헤더 이후 본문)을 반환합니다.
+        JSON 헤더는 첫 줄이 끝나는 즉시 완성되고, 아니면 TYPE:/NAME: 줄 형식으로 해석합니다.
+        """
+        stripped = pending.lstrip()
+        if stripped.startswith('{'):
+            first_line, newline, body = stripped.partition('\n')
+            if newline:
+                header = self._parse_json_header(first_line, query)
+                if header:
+                    return header[0], header[1], body.lstrip()
+            elif len(pending) <= STREAM_HEADER_MAX_CHARS:
+                return None
+        return self._parse_legacy_stream_header(pending, query)
+
+    def _parse_legacy_stream_header(self, pending: str, query: str):
+        """스트리밍 중 TYPE:/NAME: 줄 형식 헤더 파싱 (JSON 헤더가 없는 응답용)"""
+        lines = pending.split('\n')
+        complete_lines, rest = lines[:-1], lines[-1]
+        item_type = "artist"
+        item_name = query
+        seen_type = seen_name = False
+
+        for i, line in enumerate(complete_lines):
+            stripped_line = line.strip()
+
+            if stripped_line.startswith('TYPE:'):
+                item_type = self._parse_item_type(stripped_line[len('TYPE:'):], item_type)
+                seen_type = True
+            elif stripped_line.startswith('NAME:'):
+                name_part = stripped_line[len('NAME:'):].strip()
+                if name_part:
+                    item_name = name_part
+                seen_name = True
+            elif stripped_line:
+                # 헤더가 아닌 내용이 시작되면 헤더 종료로 판단
+                return item_type, item_name, '\n'.join(complete_lines[i:] + [rest])
+
+            if seen_type and seen_name:
+                return item_type, item_name, '\n'.join(complete_lines[i + 1:] + [rest]).lstrip()
+
+        # 헤더 없이 응답이 길어지면 기본값으로 본문 전송 시작
+        if len(pending) > STREAM_HEADER_MAX_CHARS:
+            return item_type, item_name, pending.lstrip()
+        return None
+
+    @staticmethod
+    def _apply_resolved(item_type: str, item_name: str, resolved: dict = None) -> tuple[str, str]:
+        """카탈로그 해석 결과가 있으면 LLM 파싱 결과 대신 사용"""
+        if resolved:
+            return resolved['item_type'], resolved['item_name']
+        return item_type, item_name
+
+    def _lookup_catalog(self, query: str) -> tuple:
+        """입력을 카탈로그 항목으로 해석 - (해석 결과, 사전 생성 도슨트 응답) 반환
+
+        사전 생성 도슨트가 있으면 완료된 음성 작업을 만들어 응답 형태로 반환합니다.
+        """
+        from .precompute import get_precomputed_docent
+        from .tasks import audio_job_manager
+
+        resolved = catalog_resolver.resolve(query)
+        if resolved:
+            print(f"🔎 카탈로그 해석: {resolved['item_type']} '{resolved['item_name']}' (점수 {resolved['score']})")
+
+        precomputed = get_precomputed_docent(resolved)
+        if not precomputed:
+            return resolved, None
+
+        audio_job_id = audio_job_manager.create_completed_job(
+            precomputed.script,
+            {
+                'audio_path': precomputed.audio_path,
+                'audio_size': precomputed.audio_size,
+                'duration_ms': precomputed.audio_duration_ms,
+                'timestamps': precomputed.timestamps,
+            },
+            timings={'precomputed': True}
+        )
+        return resolved, {
+            'text': precomputed.script,
+            'item_type': precomputed.item_type,
+            'item_name': precomputed.item_name,
+            'audio_job_id': audio_job_id,
+        }
+
+    def generate_catalog_script(self, query: str, resolved: dict = None) -> str:
+        """카탈로그 항목 도슨트 스크립트 생성 (사전 생성 배치용, 동기)"""
+        request_kwargs = self._build_completion_request(query, False, resolved=resolved)
+        started = time.perf_counter()
+        response = self.openai_client.chat.completions.create(**request_kwargs)
+        full_response = response.choices[0].message.content
+        self._record_usage(
+            request_kwargs, response.usage, full_response,
+            time.perf_counter() - started, response.choices[0].finish_reason
+        )
+        _, _, script_text = self._parse_response(full_response, query)
+        return script_text
+
+    def _start_audio_job(self, script_text: str, background: bool = False):
+        """음성 생성 작업 시작 (대기열이 가득 차면 None 반환, background면 배치 우선순위)"""
+        from .tasks import audio_job_manager, AudioQueueFullError, PRIORITY_BATCH, PRIORITY_REALTIME
+        try:
+            return audio_job_manager.create_job(script_text, priority=PRIORITY_BATCH if background else PRIORITY_REALTIME)
+        except AudioQueueFullError as e:
+            print(f"⚠️ 음성 작업 등록 실패: {e}")
+            return None
+
+    def _synthesize_audio(self, script_text: str) -> tuple[bytes, float]:
+        """Polly 음성(MP3) 생성 - (음성 바이너리, 소요 시간) 반환"""
+        started = time.perf_counter()
         polly_response = self.polly.synthesize_speech(
             Text=script_text,
-            OutputFormat='mp3',
-            VoiceId='Seoyeon'
+            OutputFormat=POLLY_OUTPUT_FORMAT,
+            VoiceId=POLLY_VOICE_ID
         )
-        audio_base64 = base64.b64encode(polly_response["AudioStream"].read()).decode('utf-8')
-        
-        # 타임스탬프 생성
+        audio_bytes = polly_response["AudioStream"].read()
+        return audio_bytes, time.perf_counter() - started
+
+    def _synthesize_speech_marks(self, script_text: str) -> tuple[list, float]:
+        """Polly 문장 단위 스피치 마크 생성 - (타임스탬프 목록, 소요 시간) 반환"""
+        started = time.perf_counter()
         marks_response = self.polly.synthesize_speech(
             Text=script_text,
             OutputFormat='json',
-            VoiceId='Seoyeon',
+            VoiceId=POLLY_VOICE_ID,
             SpeechMarkTypes=['sentence']
         )
-        
         marks_raw = marks_response["AudioStream"].read().decode("utf-8").splitlines()
         timestamps = [json.loads(line) for line in marks_raw]
-        
-        return audio_base64, timestamps
\ No newline at end of file
+        return timestamps, time.perf_counter() - started
+
+    def _generate_audio_and_timestamps(self, script_text: str, on_chunk=None) -> tuple[bytes, list, dict]:
+        """Amazon Polly를 이용한 음성 및 타임스탬프 생성
+
+        스크립트를 문장 단위 청크로 나눈 뒤 청크별 음성/스피치 마크 요청을
+        Polly 스레드 풀에서 동시에 실행하고, 완료되면 하나의 MP3로 이어붙입니다.
+        청크 음성이 준비될 때마다 on_chunk(index, total, audio_bytes)를 호출하므로
+        전체 완료 전에 첫 청크부터 재생할 수 있습니다.
+        (음성 바이너리, 타임스탬프, 요청별 소요 시간) 을 반환합니다.
+        """
+        chunks = split_script_chunks(
+            script_text,
+            max_chars=config('POLLY_CHUNK_MAX_CHARS', default=1500, cast=int),
+            first_max_chars=config('POLLY_FIRST_CHUNK_MAX_CHARS', default=300, cast=int),
+        ) or [{'text': script_text, 'start': 0}]
+
+        events = queue.Queue()
+        events.put(('end', script_text, chunks))
+        audio_bytes, timestamps, timings, _ = self._synthesize_chunk_events(events, on_chunk)
+        return audio_bytes, timestamps, timings
+
+    def _synthesize_chunk_events(self, events: queue.Queue, on_chunk=None, timeout: float = None, on_script=None):
+        """청크 이벤트 대기열을 소비하며 Polly 음성 생성
+
+        events에는 ('chunk', {text, start}), ('end', 전체 스크립트, 남은 청크 목록), ('abort', 사유)가 들어오며
+        청크가 들어오는 즉시 Polly 요청을 시작하므로 스크립트가 다 만들어지기 전에도
+        합성이 진행됩니다. Polly 결과도 같은 대기열로 받아 완료 순서대로 처리합니다.
+        전체 스크립트가 확정되면 남은 청크를 합성하기 전에 on_script(스크립트)를 호출하고,
+        참을 반환하면(음성 캐시 적중 등) 남은 Polly 요청을 취소하고 None을 반환합니다.
+        청크 하나라도 실패하면 아직 시작하지 않은 Polly 요청을 취소하고 예외를 그대로 전달합니다.
+        (음성 바이너리, 타임스탬프, 소요 시간, 전체 스크립트) 를 반환합니다.
+        """
+        started = time.perf_counter()
+        chunks = []
+        futures = []
+        audio_parts = []
+        marks_parts = []
+        audio_seconds = []
+        marks_seconds = []
+        first_chunk_seconds = None
+        script_text = None
+        remaining = 0
+
+        def submit_chunk(chunk):
+            nonlocal remaining
+            index = len(chunks)
+            chunks.append(chunk)
+            audio_parts.append(None)
+            marks_parts.append(None)
+            audio_seconds.append(0.0)
+            marks_seconds.append(0.0)
+            for result_kind, synthesize in (('audio', self._synthesize_audio), ('marks', self._synthesize_speech_marks)):
+                future = self.polly_executor.submit(synthesize, chunk['text'])
+                future.add_done_callback(lambda f, k=result_kind, i=index: events.put((k, i, f)))
+                futures.append(future)
+            remaining += 2
+
+        try:
+            while script_text is None or remaining:
+                try:
+                    event = events.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError("스크립트 청크 대기 시간이 초과되었습니다.")
+
+                kind = event[0]
+                if kind == 'chunk':
+                    submit_chunk(event[1])
+                elif kind == 'end':
+                    script_text = event[1]
+                    if on_script and on_script(script_text):
+                        return None
+                    for chunk in event[2]:
+                        submit_chunk(chunk)
+                    if not chunks:
+                        raise ValueError("음성으로 변환할 스크립트가 없습니다.")
+                elif kind == 'abort':
+                    raise RuntimeError(event[1])
+                else:
+                    # Polly 결과 (콜백은 이 스레드에서 순차 실행)
+                    _, index, future = event
+                    remaining -= 1
+                    if kind == 'audio':
+                        audio_parts[index], audio_seconds[index] = future.result()
+                        if index == 0:
+                            first_chunk_seconds = time.perf_counter() - started
+                        if on_chunk:
+                            on_chunk(index, len(chunks), audio_parts[index])
+                    else:
+                        marks_parts[index], marks_seconds[index] = future.result()
+        finally:
+            # 오류/캐시 적중으로 일찍 끝나면 아직 시작하지 않은 Polly 요청 취소 (완료된 요청에는 영향 없음)
+            for future in futures:
+                future.cancel()
+
+        # 청크 음성 길이/원문 위치만큼 타임스탬프 보정 (start/end는 UTF-8 바이트 위치)
+        timestamps = []
+        offset_ms = 0.0
+        for chunk, audio_part, marks in zip(chunks, audio_parts, marks_parts):
+            byte_offset = len(script_text[:chunk['start']].encode('utf-8'))
+            for mark in marks:
+                timestamps.append(dict(
+                    mark,
+                    time=mark['time'] + round(offset_ms),
+                    start=mark['start'] + byte_offset,
+                    end=mark['end'] + byte_offset,
+                ))
+            offset_ms += mp3_duration_ms(audio_part)
+
+        timings = {
+            'chunk_count': len(chunks),
+            'first_chunk_seconds': round(first_chunk_seconds or 0.0, 3),
+            'audio_seconds': round(max(audio_seconds), 3),  # 가장 느린 청크 기준
+            'speech_marks_seconds': round(max(marks_seconds), 3),
+            'total_seconds': round(time.perf_counter() - started, 3),
+        }
+        print(f"⏱️ Polly 소요 시간: 청크 {timings['chunk_count']}개, 첫 청크 {timings['first_chunk_seconds']}초, 전체 {timings['total_seconds']}초")
+
+        return b''.join(audio_parts), timestamps, timings, script_text
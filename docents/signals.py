@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from artists.models import Artist
+from artworks.models import Artwork
+
+from .resolver import catalog_resolver
+
+
+@receiver(post_save, sender=Artist)
+@receiver(post_delete, sender=Artist)
+@receiver(post_save, sender=Artwork)
+@receiver(post_delete, sender=Artwork)
+def invalidate_catalog_resolver(sender, **kwargs):
+    """작가/작품 변경 시 카탈로그 해석 인덱스 재생성 예약"""
+    catalog_resolver.invalidate()
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import weakref
+
+
+class AsyncSingleFlight:
+    """동일 키의 동시 비동기 작업을 하나로 합치는 single-flight
+
+    같은 키로 진행 중인 작업이 있으면 새로 실행하지 않고 그 결과를 함께 기다립니다.
+    작업은 별도 태스크로 실행되므로 먼저 요청한 클라이언트가 연결을 끊어도
+    기다리는 다른 요청에는 영향이 없습니다. (프로세스 내에서만 합쳐짐)
+    """
+
+    def __init__(self):
+        # 이벤트 루프별 진행 중 작업 {key: Task}
+        self._inflight = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    async def do(self, key: str, coro_factory):
+        """key로 진행 중인 작업이 있으면 그 결과를, 없으면 coro_factory()를 실행한 결과를 반환"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._inflight.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None:
+                task = loop.create_task(coro_factory())
+                tasks[key] = task
+                task.add_done_callback(lambda _: tasks.pop(key, None))
+            else:
+                self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """진행 중 작업 수와 합쳐진 요청 수"""
+        with self._lock:
+            inflight = sum(len(tasks) for tasks in self._inflight.values())
+        return {'inflight': inflight, 'coalesced': self.coalesced}
+
+
+# 실시간 도슨트 스크립트 생성용 전역 인스턴스
+docent_singleflight = AsyncSingleFlight()
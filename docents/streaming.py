@@ -0,0 +1,24 @@
+import json
+
+
+def format_sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열 생성"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def sse_stream(events, on_close=None):
+    """(event, data) 비동기 이터러블을 SSE 문자열 스트림으로 변환
+
+    생성 중 예외가 발생하면 error 이벤트를 보내고 종료합니다.
+    on_close(비동기 함수)는 스트림이 끝날 때 스트림을 소비한 이벤트 루프에서 호출됩니다.
+    """
+    try:
+        async for event, data in events:
+            yield format_sse_event(event, data)
+    except Exception as e:
+        print(f"❌ 스트리밍 중 에러 발생: {e}")
+        yield format_sse_event('error', {'error': str(e)})
+    finally:
+        if on_close is not None:
+            await on_close()
@@ -1,128 +1,486 @@
 import asyncio
+import itertools
+import queue
 import uuid
-from typing import Dict, Optional
-from datetime import datetime, timedelta
+from typing import Optional
 import threading
 import time
-from .services import DocentService
+from decouple import config
+from django.db import close_old_connections
+from .audio import (
+    save_audio, purge_expired_audio, chunk_audio_name, mp3_duration_ms,
+    speech_cache_key, load_cached_speech, store_cached_speech, SPEECH_CACHE_DIR,
+    StreamingScriptChunker
+)
+from .job_stores import get_job_store
+from .services import get_docent_service, POLLY_VOICE_ID, POLLY_OUTPUT_FORMAT
+
+
+# 작업 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_REALTIME = 0
+PRIORITY_BATCH = 10
+
+
+class AudioQueueFullError(Exception):
+    """음성 작업 대기열이 가득 차서 새 작업을 받을 수 없음"""
+
+
+class SpeechStream:
+    """LLM 스트리밍 중인 스크립트를 음성 작업에 전달하는 입력 핸들
+
+    feed()로 받은 텍스트에서 문장 청크가 확정될 때마다 작업 대기열에 넘기므로
+    스크립트 생성과 Polly 합성이 겹쳐서 진행됩니다.
+    이벤트 루프에서 호출해도 블로킹되지 않습니다.
+    """
+
+    def __init__(self, manager: 'AudioJobManager', job_id: str, events: queue.Queue):
+        self.manager = manager
+        self.job_id = job_id
+        self.events = events
+        self.closed = False
+        self.chunker = StreamingScriptChunker(
+            max_chars=config('POLLY_CHUNK_MAX_CHARS', default=1500, cast=int),
+            first_max_chars=config('POLLY_FIRST_CHUNK_MAX_CHARS', default=300, cast=int),
+        )
+
+    def feed(self, text: str):
+        """스크립트 조각 추가"""
+        for chunk in self.chunker.feed(text):
+            self.events.put(('chunk', chunk))
+
+    def finish(self, script_text: str):
+        """스크립트 완료 - 남은 청크를 넘기고 같은 스크립트의 요청이 이 작업을 공유하도록 등록
+
+        남은 청크는 작업 쪽에서 음성 캐시를 확인한 뒤에 합성합니다.
+        """
+        self.manager._register_inflight_job(self.manager._speech_cache_key(script_text), self.job_id)
+        self.events.put(('end', script_text, self.chunker.finish()))
+        self.closed = True
+
+    def abort(self, reason: str):
+        """스크립트 생성 중단 (작업은 실패 처리)"""
+        if not self.closed:
+            self.events.put(('abort', reason))
+            self.closed = True
 
 
 class AudioJobManager:
-    """인메모리 음성 생성 작업 관리자"""
+    """음성 생성 작업 관리자
+
+    작업마다 스레드를 만들지 않고 고정 크기 워커 풀이
+    크기 제한이 있는 우선순위 대기열에서 작업을 꺼내 처리합니다.
+    작업 상태는 설정된 작업 저장소(job_stores)에 기록되므로
+    database/cache 저장소를 쓰면 다른 워커 프로세스에서도 조회할 수 있습니다.
+    """
+    
+    # N번의 작업 완료마다 만료된 음성 파일 일괄 삭제
+    AUDIO_PURGE_EVERY = 50
     
-    def __init__(self):
-        self.jobs: Dict[str, dict] = {}
+    def __init__(self, worker_count: int = None, queue_max_size: int = None, store=None):
+        self.job_ttl = config('AUDIO_JOB_TTL', default=3600, cast=int)
+        self.speech_cache_ttl = config('SPEECH_CACHE_TTL', default=60 * 60 * 24 * 30, cast=int)
+        self.store = store or get_job_store('audio', ttl=self.job_ttl)
         self.lock = threading.Lock()
-        self._start_cleanup_scheduler()
-    
-    def _start_cleanup_scheduler(self):
-        """백그라운드 정리 스케줄러 시작"""
-        def cleanup_old_jobs():
-            """주기적으로 오래된 작업 정리"""
-            while True:
-                try:
-                    time.sleep(300)  # 5분마다 실행
-                    current_time = datetime.now()
-                    
-                    with self.lock:
-                        expired_jobs = [
-                            job_id for job_id, job in self.jobs.items()
-                            if current_time - job['created_at'] > timedelta(hours=1)
-                        ]
-                        
-                        for job_id in expired_jobs:
-                            del self.jobs[job_id]
-                            print(f"🗑️ 만료된 작업 자동 삭제: {job_id}")
-                        
-                        if expired_jobs:
-                            print(f"✅ 총 {len(expired_jobs)}개 작업 정리 완료")
-                            
-                except Exception as e:
-                    print(f"❌ 정리 스케줄러 오류: {e}")
-        
-        # 백그라운드 스레드로 정리 스케줄러 실행
-        cleanup_thread = threading.Thread(target=cleanup_old_jobs, daemon=True)
-        cleanup_thread.start()
-        print("🧹 백그라운드 정리 스케줄러 시작됨 (5분마다 실행)")
-    
-    def create_job(self, script_text: str) -> str:
-        """새 음성 생성 작업 생성"""
+        
+        # 워커 풀 및 대기열 설정
+        self.worker_count = worker_count or config('AUDIO_WORKER_COUNT', default=4, cast=int)
+        self.queue_max_size = queue_max_size or config('AUDIO_QUEUE_MAX_SIZE', default=100, cast=int)
+        self.queue = queue.PriorityQueue(maxsize=self.queue_max_size)
+        self._sequence = itertools.count()  # 같은 우선순위 내 FIFO 보장
+        self._workers = []
+        self._workers_lock = threading.Lock()
+        # 진행 중 작업 {음성 캐시 키: job_id} - 같은 스크립트의 동시 요청을 한 작업으로 합침
+        self._inflight_jobs = {}
+        # 스크립트 생성과 함께 진행 중인 작업 {job_id: 청크 이벤트 대기열}
+        self._speech_streams = {}
+        # 스트리밍 작업은 LLM 응답이 끝날 때까지 워커를 점유하므로 동시 개수 제한
+        self.stream_max_active = config('AUDIO_STREAM_MAX_ACTIVE', default=max(1, self.worker_count // 2), cast=int)
+        self.stream_timeout = config('AUDIO_STREAM_TIMEOUT', default=120, cast=int)
+        
+        # 대기열 지표
+        self.metrics = {
+            'enqueued': 0,
+            'rejected': 0,
+            'cache_hits': 0,
+            'coalesced': 0,
+            'streamed': 0,
+            'completed': 0,
+            'failed': 0,
+            'active': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+        }
+    
+    def _ensure_workers(self):
+        """워커 스레드 지연 시작 (fork 이후 첫 작업 시점에 생성)"""
+        if len(self._workers) >= self.worker_count:
+            return
+        
+        with self._workers_lock:
+            while len(self._workers) < self.worker_count:
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    name=f"audio-worker-{len(self._workers)}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+            print(f"🔊 음성 워커 {self.worker_count}개 시작 (대기열 최대 {self.queue_max_size}개)")
+    
+    def _worker_loop(self):
+        """대기열에서 작업을 꺼내 음성 생성"""
+        while True:
+            _, _, job_id, enqueued_at = self.queue.get()
+            wait_seconds = time.monotonic() - enqueued_at
+            
+            with self.lock:
+                self.metrics['active'] += 1
+                self.metrics['wait_seconds_total'] += wait_seconds
+                self.metrics['wait_seconds_max'] = max(self.metrics['wait_seconds_max'], wait_seconds)
+            
+            try:
+                close_old_connections()  # DB 작업 저장소 사용 시 끊긴 연결 정리
+                self._generate_audio_sync(job_id)
+            except Exception as e:
+                print(f"❌ 음성 워커 오류: {e}")
+            finally:
+                close_old_connections()
+                with self.lock:
+                    self.metrics['active'] -= 1
+                self.queue.task_done()
+    
+    def is_accepting_jobs(self) -> bool:
+        """새 작업을 받을 수 있는지 확인 (대기열 여유 여부)"""
+        return not self.queue.full()
+    
+    def create_job(self, script_text: str, priority: int = PRIORITY_REALTIME) -> str:
+        """새 음성 생성 작업 생성
+
+        같은 스크립트로 진행 중인 작업이 있으면 그 작업 ID를 반환하고,
+        음성이 캐시에 있으면 Polly 호출 없이 바로 완료 처리합니다.
+        대기열이 가득 찬 경우 AudioQueueFullError를 발생시킵니다.
+        """
+        cache_key = self._speech_cache_key(script_text)
+        inflight_job_id = self._get_inflight_job(cache_key)
+        if inflight_job_id:
+            return inflight_job_id
+        
         job_id = str(uuid.uuid4())
         
+        cached = self._get_cached_speech(cache_key)
+        if cached:
+            job_id = self.create_completed_job(script_text, cached, timings={'cached': True})
+            with self.lock:
+                self.metrics['cache_hits'] += 1
+            print(f"⚡ 음성 캐시 적중: {job_id}")
+            return job_id
+        
+        self.store.create(job_id, {
+            'status': 'pending',
+            'script_text': script_text,
+            'audio_path': None,
+            'audio_size': None,
+            'timestamps': None,
+            'timings': None,
+            'chunks': [],
+            'error': None
+        })
+        
+        # 캐시 조회 중 다른 요청이 먼저 등록했으면 그 작업을 공유
         with self.lock:
-            self.jobs[job_id] = {
+            inflight_job_id = self._inflight_jobs.get(cache_key)
+            if inflight_job_id:
+                self.metrics['coalesced'] += 1
+            else:
+                self._inflight_jobs[cache_key] = job_id
+        if inflight_job_id:
+            self.store.delete(job_id)
+            return inflight_job_id
+        
+        self._ensure_workers()
+        
+        # 워커 풀 대기열에 등록
+        try:
+            self.queue.put_nowait((priority, next(self._sequence), job_id, time.monotonic()))
+        except queue.Full:
+            self.store.delete(job_id)
+            with self.lock:
+                self._inflight_jobs.pop(cache_key, None)
+                self.metrics['rejected'] += 1
+            raise AudioQueueFullError("음성 생성 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+        
+        with self.lock:
+            self.metrics['enqueued'] += 1
+        
+        return job_id
+    
+    def create_streaming_job(self, priority: int = PRIORITY_REALTIME) -> Optional[SpeechStream]:
+        """스크립트가 생성되는 동안 음성 합성을 시작하는 작업 생성
+
+        반환된 SpeechStream에 스크립트 조각을 넣으면 완성된 문장 청크부터 합성합니다.
+        동시 스트리밍 작업 수가 한도에 달했거나 대기열이 가득 차면 None을 반환하며,
+        이 경우 호출자는 스크립트 완성 후 create_job으로 처리합니다.
+        """
+        with self.lock:
+            if len(self._speech_streams) >= self.stream_max_active or self.queue.full():
+                return None
+            job_id = str(uuid.uuid4())
+            events = queue.Queue()
+            self._speech_streams[job_id] = events
+        
+        try:
+            self.store.create(job_id, {
                 'status': 'pending',
-                'script_text': script_text,
-                'created_at': datetime.now(),
-                'audio_base64': None,
+                'script_text': '',
+                'audio_path': None,
+                'audio_size': None,
                 'timestamps': None,
+                'timings': None,
+                'chunks': [],
                 'error': None
-            }
-        
-        # 백그라운드에서 음성 생성 시작
-        thread = threading.Thread(target=self._generate_audio_sync, args=(job_id,))
-        thread.daemon = True
-        thread.start()
+            })
+            self._ensure_workers()
+            self.queue.put_nowait((priority, next(self._sequence), job_id, time.monotonic()))
+        except Exception as e:
+            with self.lock:
+                self._speech_streams.pop(job_id, None)
+            self.store.delete(job_id)
+            print(f"⚠️ 스트리밍 음성 작업 등록 실패: {e}")
+            return None
         
+        with self.lock:
+            self.metrics['enqueued'] += 1
+            self.metrics['streamed'] += 1
+        return SpeechStream(self, job_id, events)
+    
+    def create_completed_job(self, script_text: str, audio: dict, timings: dict = None) -> str:
+        """이미 준비된 음성으로 완료 상태의 작업 생성 (대기열/Polly 미사용)
+
+        audio는 {audio_path, audio_size, duration_ms, timestamps} 형태입니다.
+        """
+        job_id = str(uuid.uuid4())
+        self.store.create(job_id, self._completed_fields(script_text, audio, timings))
         return job_id
     
-    def get_job_status(self, job_id: str) -> Optional[dict]:
-        """작업 상태 조회"""
+    @staticmethod
+    def _completed_fields(script_text: str, audio: dict, timings: dict = None) -> dict:
+        """준비된 음성으로 완료된 작업 레코드"""
+        return {
+            'status': 'completed',
+            'script_text': script_text,
+            'audio_path': audio['audio_path'],
+            'audio_size': audio['audio_size'],
+            'timestamps': audio['timestamps'],
+            'timings': timings,
+            'chunks': [{
+                'index': 0, 'status': 'completed',
+                'audio_path': audio['audio_path'], 'audio_size': audio['audio_size'],
+                'duration_ms': audio['duration_ms'], 'offset_ms': 0,
+            }],
+            'error': None
+        }
+    
+    def _complete_from_cache(self, job_id: str, script_text: str, audio: dict):
+        """진행 중인 작업을 음성 캐시로 완료 처리"""
+        self.store.update(job_id, **self._completed_fields(script_text, audio, timings={'cached': True, 'streamed': True}))
         with self.lock:
-            job = self.jobs.get(job_id)
-            if not job:
-                return None
-                
-            # 1시간 이상 된 작업은 삭제 (기존 로직 유지)
-            if datetime.now() - job['created_at'] > timedelta(hours=1):
-                del self.jobs[job_id]
-                print(f"🗑️ 만료된 작업 즉시 삭제: {job_id}")
-                return None
-                
-            return {
-                'job_id': job_id,
-                'status': job['status'],
-                'audio_base64': job['audio_base64'],
-                'timestamps': job['timestamps'],
-                'error': job['error']
-            }
+            self.metrics['cache_hits'] += 1
+        print(f"⚡ 음성 캐시 적중 (스트리밍): {job_id}")
+    
+    def get_job_status(self, job_id: str) -> Optional[dict]:
+        """작업 상태 조회 (만료된 작업은 저장소 TTL에 의해 None)"""
+        job = self.store.get(job_id)
+        if not job:
+            return None
+            
+        return {
+            'job_id': job_id,
+            'status': job['status'],
+            'audio_path': job['audio_path'],
+            'audio_size': job['audio_size'],
+            'timestamps': job['timestamps'],
+            'timings': job.get('timings'),
+            'chunks': job.get('chunks') or [],
+            'error': job['error']
+        }
     
     def get_active_jobs_count(self) -> int:
         """현재 활성 작업 수 조회 (디버깅용)"""
+        return self.store.count()
+    
+    def get_queue_metrics(self) -> dict:
+        """워커 풀/대기열 지표 조회"""
+        with self.lock:
+            metrics = dict(self.metrics)
+        
+        started = metrics['enqueued'] - self.queue.qsize()
+        metrics['wait_seconds_avg'] = round(metrics['wait_seconds_total'] / started, 3) if started > 0 else 0.0
+        metrics['wait_seconds_total'] = round(metrics['wait_seconds_total'], 3)
+        metrics['wait_seconds_max'] = round(metrics['wait_seconds_max'], 3)
+        metrics.update({
+            'queue_depth': self.queue.qsize(),
+            'queue_max_size': self.queue_max_size,
+            'worker_count': self.worker_count,
+        })
+        return metrics
+    
+    @staticmethod
+    def _speech_cache_key(script_text: str) -> str:
+        return speech_cache_key(script_text, POLLY_VOICE_ID, POLLY_OUTPUT_FORMAT)
+    
+    def _get_inflight_job(self, cache_key: str) -> Optional[str]:
+        """같은 스크립트로 진행 중인 작업 ID 조회 (만료/삭제/종료된 작업은 정리)"""
         with self.lock:
-            return len(self.jobs)
+            job_id = self._inflight_jobs.get(cache_key)
+        if not job_id:
+            return None
+        
+        job = self.store.get(job_id)
+        if job is None or job['status'] in ('completed', 'failed'):
+            with self.lock:
+                if self._inflight_jobs.get(cache_key) == job_id:
+                    del self._inflight_jobs[cache_key]
+            return None
+        
+        with self.lock:
+            self.metrics['coalesced'] += 1
+        print(f"🔗 진행 중인 음성 작업 공유: {job_id}")
+        return job_id
+    
+    def _register_inflight_job(self, cache_key: str, job_id: str):
+        """진행 중 목록에 작업 등록 (같은 스크립트의 작업이 이미 있으면 유지)"""
+        with self.lock:
+            self._inflight_jobs.setdefault(cache_key, job_id)
+    
+    def _release_inflight_job(self, cache_key: str, job_id: str):
+        """작업 종료 시 진행 중 목록에서 제거"""
+        with self.lock:
+            if self._inflight_jobs.get(cache_key) == job_id:
+                del self._inflight_jobs[cache_key]
+    
+    def _get_cached_speech(self, cache_key: str) -> Optional[dict]:
+        """스크립트 음성 캐시 조회 (저장소 오류 시 캐시 미스로 처리)"""
+        try:
+            return load_cached_speech(cache_key)
+        except Exception as e:
+            print(f"⚠️ 음성 캐시 조회 실패: {e}")
+            return None
+    
+    @staticmethod
+    def _fill_chunk_offsets(chunks: list):
+        """앞선 청크가 모두 준비된 구간까지 재생 시작 위치(ms) 계산"""
+        offset_ms = 0
+        for chunk in chunks:
+            if chunk['status'] != 'completed':
+                break
+            chunk['offset_ms'] = offset_ms
+            offset_ms += chunk['duration_ms']
+    
+    def _chunk_recorder(self, job_id: str):
+        """청크 음성이 준비되는 즉시 저장하는 on_chunk 콜백 생성 (전체 완료 전에 재생 가능)"""
+        chunks = []
+        
+        def on_chunk(index, total, chunk_bytes):
+            # 스트리밍 작업은 청크 수가 늘어날 수 있으므로 대기 청크를 뒤에 추가
+            while len(chunks) < total:
+                chunks.append({
+                    'index': len(chunks), 'status': 'pending', 'audio_path': None, 'audio_size': None,
+                    'duration_ms': None, 'offset_ms': None
+                })
+            chunks[index].update(
+                status='completed',
+                audio_path=save_audio(chunk_audio_name(job_id, index), chunk_bytes),
+                audio_size=len(chunk_bytes),
+                duration_ms=round(mp3_duration_ms(chunk_bytes)),
+            )
+            self._fill_chunk_offsets(chunks)
+            self.store.update(job_id, chunks=[dict(chunk) for chunk in chunks])
+        
+        return on_chunk
     
     def _generate_audio_sync(self, job_id: str):
         """음성 생성 (별도 스레드에서 실행)"""
+        cache_key = None
+        with self.lock:
+            events = self._speech_streams.get(job_id)
         try:
-            with self.lock:
-                job = self.jobs.get(job_id)
-                if not job:
+            job = self.store.get(job_id)
+            if not job:
+                return
+            if events is None:
+                # 합성이 실패해도 finally에서 진행 중 목록을 정리할 수 있도록 먼저 계산
+                cache_key = self._speech_cache_key(job['script_text'])
+            
+            self.store.update(job_id, status='processing')
+            
+            # 공유 도슨트 서비스로 음성 생성 (Polly 연결 풀 재사용)
+            docent_service = get_docent_service()
+            if events is not None:
+                # 스크립트 생성과 동시에 들어오는 청크부터 합성
+                # (스크립트가 확정되었을 때 음성 캐시에 있으면 남은 합성을 취소하고 캐시 사용)
+                cached_speech = {}
+
+                def use_cached_speech(script_text):
+                    cached_speech['script_text'] = script_text
+                    cached_speech['audio'] = self._get_cached_speech(self._speech_cache_key(script_text))
+                    return cached_speech['audio'] is not None
+
+                synthesized = docent_service._synthesize_chunk_events(
+                    events,
+                    on_chunk=self._chunk_recorder(job_id),
+                    timeout=self.stream_timeout,
+                    on_script=use_cached_speech
+                )
+                if synthesized is None:
+                    self._complete_from_cache(job_id, cached_speech['script_text'], cached_speech['audio'])
                     return
-                
-                self.jobs[job_id]['status'] = 'processing'
+                audio_bytes, timestamps, timings, script_text = synthesized
+                timings['streamed'] = True
+            else:
+                script_text = job['script_text']
+                audio_bytes, timestamps, timings = docent_service._generate_audio_and_timestamps(
+                    script_text,
+                    on_chunk=self._chunk_recorder(job_id)
+                )
+            cache_key = cache_key or self._speech_cache_key(script_text)
             
-            # 도슨트 서비스로 음성 생성
-            docent_service = DocentService()
-            audio_base64, timestamps = docent_service._generate_audio_and_timestamps(
-                job['script_text']
-            )
+            # 음성은 스크립트 기준 캐시 경로에 저장하고 작업에는 경로만 기록
+            # (같은 스크립트의 다음 작업은 Polly 호출 없이 재사용)
+            cached = store_cached_speech(cache_key, audio_bytes, timestamps)
             
+            self.store.update(
+                job_id,
+                status='completed',
+                script_text=script_text,
+                audio_path=cached['audio_path'],
+                audio_size=len(audio_bytes),
+                timestamps=timestamps,
+                timings=timings
+            )
             with self.lock:
-                if job_id in self.jobs:
-                    self.jobs[job_id].update({
-                        'status': 'completed',
-                        'audio_base64': audio_base64,
-                        'timestamps': timestamps
-                    })
+                self.metrics['completed'] += 1
+                completed = self.metrics['completed']
+            
+            # N개 작업마다 만료된 음성 파일 정리 (작업 레코드와 같은 TTL)
+            if completed % self.AUDIO_PURGE_EVERY == 0:
+                deleted = purge_expired_audio(self.job_ttl)
+                deleted += purge_expired_audio(self.speech_cache_ttl, directory=SPEECH_CACHE_DIR)
+                if deleted:
+                    print(f"🧹 만료된 음성 파일 {deleted}개 삭제")
                     
         except Exception as e:
+            self.store.update(job_id, status='failed', error=str(e))
             with self.lock:
-                if job_id in self.jobs:
-                    self.jobs[job_id].update({
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+                self.metrics['failed'] += 1
+        finally:
+            # 완료/실패 후에는 캐시 또는 새 작업으로 처리되도록 진행 중 목록에서 제거
+            if events is not None:
+                with self.lock:
+                    self._speech_streams.pop(job_id, None)
+                    for key in [key for key, value in self._inflight_jobs.items() if value == job_id]:
+                        del self._inflight_jobs[key]
+            elif cache_key:
+                self._release_inflight_job(cache_key, job_id)
 
 
 # 전역 작업 관리자 인스턴스
@@ -0,0 +1,129 @@
+import shutil
+import tempfile
+
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase
+
+from docents.audio import (
+    parse_byte_range, RangeNotSatisfiable, split_script_chunks, mp3_duration_ms, speech_cache_key,
+    StreamingScriptChunker, save_audio, open_audio, purge_expired_audio
+)
+
+
+class AudioStorageTests(SimpleTestCase):
+    """음성 파일 저장/만료 삭제 테스트"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def test_saved_audio_is_read_back_as_binary(self):
+        path = save_audio('job-1.mp3', b'mp3-bytes')
+        with open_audio(path) as f:
+            self.assertEqual(f.read(), b'mp3-bytes')
+
+    def test_purge_deletes_only_expired_files(self):
+        path = save_audio('job-1.mp3', b'mp3-bytes')
+        self.assertEqual(purge_expired_audio(ttl=3600), 0)
+        self.assertEqual(purge_expired_audio(ttl=0), 1)
+        self.assertFalse(default_storage.exists(path))
+
+
+class ParseByteRangeTests(SimpleTestCase):
+    """음성 스트리밍 Range 헤더 해석 테스트"""
+
+    def test_full_and_open_ranges(self):
+        self.assertEqual(parse_byte_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_byte_range('bytes=500-', 1000), (500, 999))
+        self.assertEqual(parse_byte_range('bytes=900-5000', 1000), (900, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_byte_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_byte_range('bytes=-5000', 1000), (0, 999))
+
+    def test_missing_or_unsupported_header_returns_none(self):
+        self.assertIsNone(parse_byte_range(None, 1000))
+        self.assertIsNone(parse_byte_range('bytes=0-1,5-6', 1000))
+        self.assertIsNone(parse_byte_range('items=0-1', 1000))
+        # 끝이 시작보다 앞인 범위는 무시하고 전체 응답
+        self.assertIsNone(parse_byte_range('bytes=10-5', 1000))
+
+    def test_unsatisfiable_range(self):
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_byte_range('bytes=1000-', 1000)
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_byte_range('bytes=1000-1005', 1000)
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_byte_range('bytes=-0', 1000)
+
+
+class SplitScriptChunksTests(SimpleTestCase):
+    """음성 청크 분할 테스트"""
+
+    def test_chunks_keep_sentence_boundaries_and_offsets(self):
+        text = "첫 문장입니다. 두 번째 문장입니다! 세 번째 문장인가요?\n마지막 문장."
+        chunks = split_script_chunks(text, max_chars=25, first_max_chars=10)
+
+        self.assertEqual(chunks[0]['text'], "첫 문장입니다.")
+        for chunk in chunks:
+            self.assertEqual(text[chunk['start']:chunk['start'] + len(chunk['text'])], chunk['text'])
+            self.assertLessEqual(len(chunk['text']), 25)
+
+    def test_long_sentence_is_split_on_whitespace(self):
+        text = "아주 긴 문장 " * 20
+        chunks = split_script_chunks(text, max_chars=30)
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk['text']) <= 30 for chunk in chunks))
+
+
+class Mp3DurationTests(SimpleTestCase):
+    """MP3 재생 시간 계산 테스트"""
+
+    def test_mpeg2_layer3_frames(self):
+        # MPEG-2 Layer III, 48kbps, 24kHz -> 144바이트/프레임, 576샘플(24ms)/프레임
+        frame = bytes([0xFF, 0xF3, 0x64, 0xC4]) + b'\0' * 140
+        self.assertAlmostEqual(mp3_duration_ms(frame * 50), 1200.0)
+
+
+class SpeechCacheKeyTests(SimpleTestCase):
+    """음성 캐시 키 테스트"""
+
+    def test_key_depends_on_script_voice_and_format(self):
+        key = speech_cache_key('모나리자 도슨트', 'Seoyeon', 'mp3')
+        self.assertEqual(key, speech_cache_key('모나리자 도슨트', 'Seoyeon', 'mp3'))
+        self.assertNotEqual(key, speech_cache_key('모나리자 도슨트.', 'Seoyeon', 'mp3'))
+        self.assertNotEqual(key, speech_cache_key('모나리자 도슨트', 'Jihye', 'mp3'))
+        self.assertNotEqual(key, speech_cache_key('모나리자 도슨트', 'Seoyeon', 'ogg_vorbis'))
+
+
+class StreamingScriptChunkerTests(SimpleTestCase):
+    TEXT = ' '.join(['모나리자는 레오나르도 다빈치가 그린 초상화입니다.', '미소가 유명하죠!', '정말 그럴까요?\n'] * 20)
+
+    def feed_in_pieces(self, chunker, text, size):
+        emitted = []
+        for position in range(0, len(text), size):
+            emitted.append(chunker.feed(text[position:position + size]))
+        return emitted
+
+    def test_matches_split_script_chunks(self):
+        for size in (1, 3, 7, 50):
+            chunker = StreamingScriptChunker(max_chars=120, first_max_chars=40)
+            emitted = self.feed_in_pieces(chunker, self.TEXT, size)
+            chunks = [chunk for batch in emitted for chunk in batch] + chunker.finish()
+            self.assertEqual(chunks, split_script_chunks(self.TEXT, 120, 40))
+
+    def test_first_chunk_is_emitted_before_text_ends(self):
+        chunker = StreamingScriptChunker(max_chars=120, first_max_chars=40)
+        emitted = self.feed_in_pieces(chunker, self.TEXT, 5)
+
+        first_ready = next(i for i, batch in enumerate(emitted) if batch)
+        self.assertLess(first_ready * 5, 80)
+        self.assertEqual(emitted[first_ready][0]['start'], 0)
+
+    def test_long_sentence_without_boundary_waits_until_finish(self):
+        chunker = StreamingScriptChunker(max_chars=20)
+        self.assertEqual(chunker.feed('아주 긴 문장이 아직'), [])
+        self.assertEqual(chunker.finish(), [{'text': '아주 긴 문장이 아직', 'start': 0}])
@@ -0,0 +1,53 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from docents import services
+from docents.batch import BatchDocentManager
+from docents.job_stores import InMemoryJobStore
+
+
+class BatchDocentManagerTests(SimpleTestCase):
+    def setUp(self):
+        self.manager = BatchDocentManager(store=InMemoryJobStore('batch-test', ttl=60))
+
+    def test_progress_fields_count_finished_items(self):
+        items = [{'status': 'completed'}, {'status': 'failed'}, {'status': 'processing'}]
+        fields = self.manager._progress_fields(items, status='processing')
+
+        self.assertEqual((fields['completed'], fields['failed'], fields['status']), (1, 1, 'processing'))
+        self.assertIsNot(fields['items'][0], items[0])
+
+    def test_watch_batch_emits_items_then_done(self):
+        self.manager.store.create('b1', {
+            'status': 'completed', 'total': 2, 'completed': 1, 'failed': 1, 'error': None,
+            'items': [{'index': 0, 'status': 'completed'}, {'index': 1, 'status': 'failed'}],
+        })
+
+        async def collect(batch_id):
+            return [event async for event in self.manager.watch_batch(batch_id, poll_interval=0.01)]
+
+        events = asyncio.run(collect('b1'))
+        self.assertEqual([name for name, _ in events], ['item', 'item', 'done'])
+        self.assertEqual(events[-1][1]['completed'], 1)
+        self.assertEqual(asyncio.run(collect('missing'))[0][0], 'error')
+
+    def test_batch_loop_closes_its_openai_client(self):
+        clients = []
+
+        class FakeService:
+            async def generate_realtime_docent(self, prompt_text, background):
+                clients.append(services.get_async_openai_client('test-key'))
+                return {'item_type': 'artist', 'item_name': prompt_text, 'text': '스크립트', 'audio_job_id': None}
+
+        self.manager.store.create('b1', {
+            'status': 'pending', 'total': 2, 'completed': 0, 'failed': 0, 'error': None,
+            'items': [{'index': index, 'input_text': text, 'status': 'pending'} for index, text in enumerate(['고흐', '모네'])],
+        })
+        with mock.patch('docents.batch.get_docent_service', return_value=FakeService()):
+            asyncio.run(self.manager._process_batch('b1'))
+
+        self.assertEqual(self.manager.get_batch_status('b1')['completed'], 2)
+        self.assertIs(clients[0], clients[1])
+        self.assertTrue(clients[0].is_closed())
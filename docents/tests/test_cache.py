@@ -0,0 +1,61 @@
+from django.test import SimpleTestCase
+
+from docents.cache import DocentResultCache
+from docents.singleflight import AsyncSingleFlight
+
+
+class DocentResultCacheTests(SimpleTestCase):
+    """도슨트 결과 캐시 테스트"""
+
+    def setUp(self):
+        self.cache = DocentResultCache(max_size=2, ttl=60)
+        self.value = {'text': '스크립트', 'item_type': 'artwork', 'item_name': '모나리자'}
+
+    def test_key_is_normalized(self):
+        key = self.cache.make_key('  모나리자 ', 'gpt-4.1-nano')
+        self.assertEqual(key, self.cache.make_key('모나리자', 'gpt-4.1-nano'))
+        self.assertNotEqual(key, self.cache.make_key('모나리자', 'gpt-4.1-mini'))
+
+    def test_hit_and_miss_counters(self):
+        key = self.cache.make_key('모나리자', 'gpt-4.1-nano')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.set(key, self.value)
+        self.assertEqual(self.cache.get(key), self.value)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_lru_eviction(self):
+        self.cache.set('a', self.value)
+        self.cache.set('b', self.value)
+        self.cache.get('a')
+        self.cache.set('c', self.value)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertIsNotNone(self.cache.get('a'))
+
+    def test_expired_entry_is_miss(self):
+        self.cache.ttl = 0
+        self.cache.set('a', self.value)
+        self.assertIsNone(self.cache.get('a'))
+
+
+class AsyncSingleFlightTests(SimpleTestCase):
+    """동시 요청 합치기 테스트"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        import asyncio
+
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'text': '스크립트'}
+
+        async def run():
+            return await asyncio.gather(*[flight.do('key', work) for _ in range(5)])
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'text': '스크립트'} for result in results))
+        self.assertEqual(flight.stats(), {'inflight': 0, 'coalesced': 4})
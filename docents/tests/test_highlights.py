@@ -2,10 +2,11 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .models import Docent, DocentItem, DocentHighlight
+from docents.models import Docent, DocentItem, DocentHighlight
 from users.models import User
 from exhibitions.models import Exhibition
 
+
 class DocentHighlightTests(TestCase):
     def setUp(self):
         self.client = APIClient()
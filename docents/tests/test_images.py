@@ -0,0 +1,73 @@
+from django.test import SimpleTestCase
+
+from docents.images import prepare_image_for_vision, image_dhash
+from docents.image_index import ImageRecognitionIndex
+
+
+class PrepareImageForVisionTests(SimpleTestCase):
+    """비전 모델 입력 이미지 전처리 테스트"""
+
+    @staticmethod
+    def _encode(image, image_format, **params):
+        import io
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **params)
+        return buffer.getvalue()
+
+    def test_large_photo_is_downscaled_and_rotated(self):
+        import io
+        from PIL import Image
+
+        exif = Image.Exif()
+        exif[0x0112] = 6  # 90도 회전 필요
+        data = self._encode(Image.new('RGB', (4000, 3000), (120, 80, 40)), 'JPEG', exif=exif)
+
+        encoded, content_type = prepare_image_for_vision(data)
+        self.assertEqual(content_type, 'image/jpeg')
+        self.assertEqual(Image.open(io.BytesIO(encoded)).size, (768, 1024))
+
+    def test_small_image_is_passed_through(self):
+        from PIL import Image
+
+        data = self._encode(Image.new('RGB', (300, 200)), 'PNG')
+        self.assertEqual(prepare_image_for_vision(data), (data, 'image/png'))
+
+
+class ImageRecognitionIndexTests(SimpleTestCase):
+    """사진 지각 해시 인덱스 테스트"""
+
+    def test_near_duplicate_within_threshold_is_found(self):
+        index = ImageRecognitionIndex(max_size=10, threshold=3)
+        index.add(0b1011 << 40, {'item_name': '모나리자'})
+
+        value, distance = index.find((0b1011 << 40) ^ 0b101)
+        self.assertEqual(value, {'item_name': '모나리자'})
+        self.assertEqual(distance, 2)
+        self.assertIsNone(index.find((0b1011 << 40) ^ 0b1111))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        index = ImageRecognitionIndex(max_size=2, threshold=0)
+        index.add(1, {'item_name': 'a'})
+        index.add(2, {'item_name': 'b'})
+        index.find(1)
+        index.add(3, {'item_name': 'c'})
+
+        self.assertIsNone(index.find(2))
+        self.assertIsNotNone(index.find(1))
+        self.assertEqual(index.stats()['size'], 2)
+
+    def test_dhash_is_stable_across_resize_and_recompression(self):
+        import io
+        from PIL import Image
+
+        image = Image.radial_gradient('L').resize((800, 600)).convert('RGB')
+        image.paste((200, 30, 30), (100, 100, 400, 300))
+
+        def encode(img, quality):
+            buffer = io.BytesIO()
+            img.save(buffer, 'JPEG', quality=quality)
+            return buffer.getvalue()
+
+        original = image_dhash(encode(image, 95))
+        resized = image_dhash(encode(image.resize((400, 300)), 60))
+        self.assertLessEqual((original ^ resized).bit_count(), 5)
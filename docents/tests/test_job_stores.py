@@ -0,0 +1,96 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from docents.job_stores import InMemoryJobStore, CacheJobStore, DatabaseJobStore
+from docents.models import DocentJob
+
+
+class InMemoryJobStoreTests(SimpleTestCase):
+    """인메모리 작업 저장소 테스트"""
+
+    def setUp(self):
+        self.store = InMemoryJobStore('audio', ttl=60)
+
+    def test_create_get_update(self):
+        self.store.create('job-1', {'status': 'pending', 'script_text': '스크립트'})
+        self.assertTrue(self.store.update('job-1', status='completed'))
+        job = self.store.get('job-1')
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['script_text'], '스크립트')
+        self.assertIn('created_at', job)
+
+    def test_missing_job(self):
+        self.assertIsNone(self.store.get('missing'))
+        self.assertFalse(self.store.update('missing', status='failed'))
+
+    def test_expired_job_is_not_returned(self):
+        self.store.ttl = 0
+        self.store.create('job-1', {'status': 'pending', 'script_text': ''})
+        self.assertIsNone(self.store.get('job-1'))
+        self.assertEqual(self.store.count(), 0)
+
+
+class DatabaseJobStoreTests(TestCase):
+    """DB 작업 저장소 테스트"""
+
+    def setUp(self):
+        self.store = DatabaseJobStore('audio', ttl=60)
+        self.job_id = str(uuid.uuid4())
+
+    def test_create_get_update(self):
+        self.store.create(self.job_id, {'status': 'pending', 'script_text': '스크립트'})
+        self.assertTrue(self.store.update(self.job_id, status='completed', audio_size=10))
+
+        job = self.store.get(self.job_id)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual((job['script_text'], job['audio_size']), ('스크립트', 10))
+        self.assertEqual(job['job_id'], self.job_id)
+        self.assertIn('created_at', job)
+        self.assertEqual(DocentJob.objects.get(pk=self.job_id).status, 'completed')
+
+        self.assertEqual(self.store.count(), 1)
+        self.assertIsNone(DatabaseJobStore('batch', ttl=60).get(self.job_id))
+        self.store.delete(self.job_id)
+        self.assertIsNone(self.store.get(self.job_id))
+
+    def test_expired_job_is_not_returned(self):
+        self.store.ttl = 0
+        self.store.create(self.job_id, {'status': 'pending', 'script_text': ''})
+
+        self.assertIsNone(self.store.get(self.job_id))
+        self.assertFalse(self.store.update(self.job_id, status='failed'))
+        self.assertEqual(self.store.list_jobs(), [])
+        self.assertEqual(self.store.count(), 0)
+
+    def test_expired_rows_are_purged_every_n_creates(self):
+        DatabaseJobStore('batch', ttl=0).create(self.job_id, {'status': 'pending'})
+        self.store.PURGE_EVERY = 2
+
+        self.store.create(str(uuid.uuid4()), {'status': 'pending'})
+        self.assertTrue(DocentJob.objects.filter(pk=self.job_id).exists())
+
+        self.store.create(str(uuid.uuid4()), {'status': 'pending'})
+        self.assertFalse(DocentJob.objects.filter(pk=self.job_id).exists())
+        self.assertEqual(self.store.count(), 2)
+
+    def test_non_uuid_job_id(self):
+        self.assertIsNone(self.store.get('missing'))
+        self.assertFalse(self.store.update('missing', status='failed'))
+        self.store.delete('missing')
+        with self.assertRaises(ValueError):
+            self.store.create('job-1', {'status': 'pending'})
+        self.assertEqual(DocentJob.objects.count(), 0)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CacheJobStoreTests(SimpleTestCase):
+    """캐시 작업 저장소 테스트"""
+
+    def test_create_get_update_delete(self):
+        store = CacheJobStore('audio', ttl=60)
+        store.create('job-1', {'status': 'pending', 'script_text': '스크립트'})
+        self.assertTrue(store.update('job-1', status='processing'))
+        self.assertEqual(store.get('job-1')['status'], 'processing')
+        store.delete('job-1')
+        self.assertIsNone(store.get('job-1'))
@@ -0,0 +1,157 @@
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from artists.models import Artist
+from artworks.models import Artwork
+from users.models import User
+from docents import views
+from docents.job_stores import InMemoryJobStore
+from docents.models import PrecomputedDocent
+from docents.precompute import get_precomputed_docent, pending_entities, precompute_entity, run_precompute
+from docents.resolver import catalog_resolver
+from docents.services import DocentService
+from docents.tasks import AudioJobManager
+
+AUDIO = b'\xff\xf3\x64\xc4' + b'\0' * 140
+
+
+def fake_docent_service(fail_names=()):
+    """사전 생성용 가짜 도슨트 서비스 (fail_names에 포함된 항목은 스크립트 생성 실패)"""
+    def generate_catalog_script(query, resolved=None):
+        if resolved['item_name'] in fail_names:
+            raise RuntimeError("LLM 오류")
+        return f"{resolved['item_name']} 도슨트 스크립트"
+
+    def generate_audio(script_text, on_chunk=None):
+        return AUDIO, [{'start_ms': 0, 'text': script_text}], {}
+
+    return SimpleNamespace(generate_catalog_script=generate_catalog_script, _generate_audio_and_timestamps=generate_audio)
+
+
+class PrecomputeTests(TransactionTestCase):
+    """카탈로그 도슨트 사전 생성 테스트 (가짜 서비스 사용)
+
+    precompute_entity는 워커 스레드용으로 끝날 때 close_old_connections()를 호출하고
+    run_precompute의 워커는 각자 DB 연결을 쓰므로 트랜잭션으로 감싸지 않고 실행합니다.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.gogh = Artist.objects.create(title='빈센트 반 고흐')
+        self.monet = Artist.objects.create(title='클로드 모네')
+        self.starry_night = Artwork.objects.create(title='별이 빛나는 밤', artist_name='빈센트 반 고흐')
+
+    def test_pending_entities_resume_after_completed_rows(self):
+        precompute_entity(fake_docent_service(), 'artist', self.gogh)
+        precompute_entity(fake_docent_service(fail_names={'클로드 모네'}), 'artist', self.monet)
+
+        pending = [(item_type, entity.id) for item_type, entity in pending_entities(['artist', 'artwork'])]
+        self.assertEqual(pending, [('artist', self.monet.id), ('artwork', self.starry_night.id)])
+
+        forced = pending_entities(['artist', 'artwork'], force=True)
+        self.assertEqual(len(forced), 3)
+        self.assertEqual(len(pending_entities(['artist', 'artwork'], force=True, limit=2)), 2)
+
+    def test_failed_regeneration_keeps_completed_row(self):
+        precompute_entity(fake_docent_service(), 'artist', self.gogh)
+
+        row = precompute_entity(fake_docent_service(fail_names={'빈센트 반 고흐'}), 'artist', self.gogh)
+
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'completed')
+        self.assertEqual(row.script, '빈센트 반 고흐 도슨트 스크립트')
+        self.assertEqual(row.error, 'LLM 오류')
+
+    def test_get_precomputed_docent_requires_confident_completed_match(self):
+        precompute_entity(fake_docent_service(), 'artist', self.gogh)
+        precompute_entity(fake_docent_service(fail_names={'클로드 모네'}), 'artist', self.monet)
+
+        resolved = {'item_type': 'artist', 'object_id': self.gogh.id, 'score': 1.0}
+        self.assertEqual(get_precomputed_docent(resolved).script, '빈센트 반 고흐 도슨트 스크립트')
+        self.assertIsNone(get_precomputed_docent(dict(resolved, score=0.5)))
+        self.assertIsNone(get_precomputed_docent({'item_type': 'artist', 'object_id': self.monet.id, 'score': 1.0}))
+        self.assertIsNone(get_precomputed_docent(None))
+
+    def test_run_precompute_counts_results(self):
+        logs = []
+        results = run_precompute(
+            fake_docent_service(fail_names={'클로드 모네'}), ['artist', 'artwork'], concurrency=1, log=logs.append
+        )
+
+        self.assertEqual(results, {'completed': 2, 'failed': 1})
+        row = PrecomputedDocent.objects.get(item_type='artwork', object_id=self.starry_night.id)
+        self.assertEqual((row.status, row.script, row.audio_size), ('completed', '별이 빛나는 밤 도슨트 스크립트', len(AUDIO)))
+        self.assertEqual(PrecomputedDocent.objects.get(object_id=self.monet.id, item_type='artist').status, 'failed')
+        self.assertEqual(len(logs), 4)
+
+        # 다시 실행하면 실패한 항목만 처리
+        results = run_precompute(fake_docent_service(), ['artist', 'artwork'], concurrency=1, log=logs.append)
+        self.assertEqual(results, {'completed': 1, 'failed': 0})
+
+    def test_forced_run_counts_failed_regeneration(self):
+        precompute_entity(fake_docent_service(), 'artist', self.gogh)
+
+        results = run_precompute(
+            fake_docent_service(fail_names={'빈센트 반 고흐'}), ['artist'], concurrency=1, force=True, log=lambda message: None
+        )
+
+        self.assertEqual(results, {'completed': 1, 'failed': 1})
+        self.assertEqual(PrecomputedDocent.objects.get(item_type='artist', object_id=self.gogh.id).status, 'completed')
+
+
+class PrecomputedRealtimeDocentTests(TestCase):
+    """실시간 도슨트 API가 사전 생성 도슨트로 응답하는지 (LLM/Polly 미호출)"""
+
+    def setUp(self):
+        artwork = Artwork.objects.create(title='별이 빛나는 밤', artist_name='빈센트 반 고흐')
+        PrecomputedDocent.objects.create(
+            item_type='artwork', object_id=artwork.id, item_name=artwork.title, status='completed',
+            script='별이 빛나는 밤 도슨트 스크립트', audio_path='docents/precomputed/artwork.mp3',
+            audio_size=len(AUDIO), audio_duration_ms=10, timestamps=[]
+        )
+        catalog_resolver.invalidate()
+        self.addCleanup(catalog_resolver.invalidate)
+
+        self.manager = AudioJobManager(worker_count=1, queue_max_size=10, store=InMemoryJobStore('audio-test', ttl=60))
+        for target in ('docents.views.audio_job_manager', 'docents.tasks.audio_job_manager'):
+            manager_patch = mock.patch(target, self.manager)
+            manager_patch.start()
+            self.addCleanup(manager_patch.stop)
+
+        self.service = DocentService.__new__(DocentService)
+        self.service.polly = mock.Mock()
+        self.service.openai_client = mock.Mock()
+        self.async_client = mock.Mock()
+
+    async def post(self, data):
+        request = APIRequestFactory().post('/api/realtime-docent', data, format='json')
+        force_authenticate(request, user=User(id=1, username='tester'))
+        return await views.generate_realtime_docent(request)
+
+    def test_precomputed_docent_is_served_without_openai_or_polly(self):
+        with mock.patch.object(views, 'get_docent_service', return_value=self.service), \
+                mock.patch.object(DocentService, 'async_openai_client', new_callable=mock.PropertyMock, return_value=self.async_client):
+            response = async_to_sync(self.post)({'input_text': '별이 빛나는 밤'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['text'], '별이 빛나는 밤 도슨트 스크립트')
+        self.assertEqual((response.data['item_type'], response.data['item_name']), ('artwork', '별이 빛나는 밤'))
+        job = self.manager.get_job_status(response.data['audio_job_id'])
+        self.assertEqual(job['status'], 'completed')
+        self.assertTrue(job['timings']['precomputed'])
+
+        self.assertEqual(self.async_client.mock_calls, [])
+        self.assertEqual(self.service.openai_client.mock_calls, [])
+        self.assertEqual(self.service.polly.mock_calls, [])
+        self.assertEqual(self.manager.get_queue_metrics()['enqueued'], 0)
@@ -0,0 +1,74 @@
+from django.test import SimpleTestCase
+
+from docents.prompts import compact_prompt, build_docent_messages, count_message_tokens, PromptUsageStats, DOCENT_SYSTEM_PROMPT
+from docents.services import DocentService
+
+
+class DocentPromptTests(SimpleTestCase):
+    def test_compact_prompt_strips_indentation_and_blank_runs(self):
+        text = """
+            첫 줄
+
+            
+            둘째 줄   
+        """
+        self.assertEqual(compact_prompt(text), "첫 줄\n\n둘째 줄")
+
+    def test_system_prompt_is_static_prefix(self):
+        first = build_docent_messages('모나리자')
+        second = build_docent_messages('고흐', resolved={'item_type': 'artist', 'item_name': '빈센트 반 고흐'})
+
+        self.assertEqual(first[0], {'role': 'system', 'content': DOCENT_SYSTEM_PROMPT})
+        self.assertEqual(first[0], second[0])
+        self.assertNotIn('  ', DOCENT_SYSTEM_PROMPT)
+        self.assertIn('{"type": "artist", "name": "빈센트 반 고흐"}', second[1]['content'])
+
+    def test_image_message_includes_image_part(self):
+        messages = build_docent_messages('사진', image_url='data:image/jpeg;base64,AAAA')
+        parts = messages[1]['content']
+        self.assertEqual([part['type'] for part in parts], ['text', 'image_url'])
+        self.assertGreater(count_message_tokens(messages, 'gpt-4.1-mini'), 0)
+
+    def test_usage_stats_averages(self):
+        stats = PromptUsageStats()
+        stats.record(100, 50, 1.0, cached_prompt_tokens=80)
+        stats.record(300, 150, 3.0, truncated=True, estimated=True)
+
+        result = stats.stats()
+        self.assertEqual(result['requests'], 2)
+        self.assertEqual(result['prompt_tokens_avg'], 200)
+        self.assertEqual(result['completion_tokens_avg'], 100)
+        self.assertEqual(result['cached_prompt_tokens'], 80)
+        self.assertEqual(result['seconds_avg'], 2.0)
+        self.assertEqual((result['truncated'], result['estimated']), (1, 1))
+
+
+class DocentResponseParserTests(SimpleTestCase):
+    def setUp(self):
+        self.service = DocentService.__new__(DocentService)
+
+    def test_json_header_response(self):
+        response = '{"type": "artwork", "name": "모나리자"}\n\n모나리자는 다빈치의 작품입니다.'
+        self.assertEqual(
+            self.service._parse_response(response, '다빈치 모나리자'),
+            ('artwork', '모나리자', '모나리자는 다빈치의 작품입니다.')
+        )
+
+    def test_legacy_line_format_is_still_parsed(self):
+        response = 'TYPE: artist\nNAME: 빈센트 반 고흐\n\n고흐는 네덜란드 화가입니다.'
+        self.assertEqual(
+            self.service._parse_response(response, '고흐'),
+            ('artist', '빈센트 반 고흐', '고흐는 네덜란드 화가입니다.')
+        )
+
+    def test_stream_header_completes_at_first_newline(self):
+        self.assertIsNone(self.service._parse_stream_header('{"type": "artwork", "na', '입력'))
+        self.assertEqual(
+            self.service._parse_stream_header('{"type": "artwork", "name": "절규"}\n뭉크의', '입력'),
+            ('artwork', '절규', '뭉크의')
+        )
+
+    def test_invalid_json_header_falls_back_to_defaults(self):
+        item_type, item_name, body = self.service._parse_stream_header('{not json}\n본문', '입력')
+        self.assertEqual((item_type, item_name), ('artist', '입력'))
+        self.assertIn('본문', body)
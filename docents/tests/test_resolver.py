@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+
+from docents.resolver import CatalogResolver
+
+
+class CatalogResolverTests(SimpleTestCase):
+    def setUp(self):
+        self.resolver = CatalogResolver(ttl=300, min_score=0.6)
+        self.resolver.build(catalog=[
+            ('artist', 1, '빈센트 반 고흐', ['빈센트 반 고흐', '반 고흐', '고흐']),
+            ('artwork', 10, '별이 빛나는 밤', ['별이 빛나는 밤', '빈센트 반 고흐 별이 빛나는 밤']),
+            ('artwork', 11, '모나리자', ['모나리자']),
+        ])
+
+    def test_exact_match_ignores_spacing_and_punctuation(self):
+        result = self.resolver.resolve('  별이빛나는 밤!')
+        self.assertEqual(result['item_type'], 'artwork')
+        self.assertEqual(result['object_id'], 10)
+        self.assertEqual(result['score'], 1.0)
+
+    def test_alias_resolves_to_artist(self):
+        result = self.resolver.resolve('고흐')
+        self.assertEqual((result['item_type'], result['item_name']), ('artist', '빈센트 반 고흐'))
+
+    def test_partial_input_matches_by_prefix(self):
+        result = self.resolver.resolve('모나리')
+        self.assertEqual(result['object_id'], 11)
+        self.assertLess(result['score'], 1.0)
+
+    def test_typo_matches_by_trigram_similarity(self):
+        result = self.resolver.resolve('별이 빛나던 밤')
+        self.assertEqual(result['object_id'], 10)
+
+    def test_unrelated_input_is_not_resolved(self):
+        self.assertIsNone(self.resolver.resolve('피카소의 게르니카'))
+        self.assertIsNone(self.resolver.resolve('   '))
@@ -0,0 +1,74 @@
+import io
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import SimpleTestCase
+
+from docents.services import DocentService
+
+
+class BarrierPolly:
+    """두 요청이 동시에 진행 중일 때만 응답하는 Polly 대체 (순차 호출이면 BrokenBarrierError)"""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=2)
+
+    def synthesize_speech(self, Text, OutputFormat, VoiceId, SpeechMarkTypes=None):
+        self.barrier.wait()
+        if OutputFormat == 'json':
+            mark = {'time': 0, 'type': 'sentence', 'start': 0, 'end': len(Text.encode('utf-8')), 'value': Text}
+            return {'AudioStream': io.BytesIO(json.dumps(mark).encode('utf-8'))}
+        return {'AudioStream': io.BytesIO(b'mp3-bytes')}
+
+
+class FailingPolly:
+    """첫 요청은 실패하고 이후 요청은 release될 때까지 대기하는 Polly 대체 (호출 횟수 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def synthesize_speech(self, Text, OutputFormat, VoiceId, SpeechMarkTypes=None):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            raise RuntimeError("Polly 오류")
+        self.release.wait(2)
+        return {'AudioStream': io.BytesIO(b'' if OutputFormat == 'json' else b'mp3-bytes')}
+
+
+class PollySynthesisTests(SimpleTestCase):
+    def setUp(self):
+        self.service = DocentService.__new__(DocentService)
+        self.service.polly = BarrierPolly()
+        self.service.polly_executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.service.polly_executor.shutdown)
+
+    def test_audio_and_speech_marks_are_requested_concurrently(self):
+        audio_bytes, timestamps, timings = self.service._generate_audio_and_timestamps('모나리자는 초상화입니다.')
+
+        self.assertEqual(audio_bytes, b'mp3-bytes')
+        self.assertEqual([mark['value'] for mark in timestamps], ['모나리자는 초상화입니다.'])
+        self.assertEqual(timings['chunk_count'], 1)
+        for key in ('audio_seconds', 'speech_marks_seconds', 'total_seconds'):
+            self.assertIn(key, timings)
+
+    def test_failed_chunk_cancels_pending_requests(self):
+        polly = FailingPolly()
+        self.service.polly = polly
+        self.service.polly_executor = ThreadPoolExecutor(max_workers=1)
+
+        events = queue.Queue()
+        chunks = [{'text': f'{index}번째 문장입니다.', 'start': index * 10} for index in range(5)]
+        events.put(('end', ''.join(chunk['text'] for chunk in chunks), chunks))
+        with self.assertRaises(RuntimeError):
+            self.service._synthesize_chunk_events(events)
+
+        polly.release.set()
+        self.service.polly_executor.shutdown(wait=True)
+        # 청크 5개 x (음성, 스피치 마크) = 10개 중 실패한 요청과 이미 시작된 요청만 실행됨
+        self.assertLessEqual(polly.calls, 2)
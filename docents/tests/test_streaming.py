@@ -0,0 +1,84 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from docents.cache import docent_result_cache
+from docents.services import DocentService
+from docents.streaming import format_sse_event, sse_stream
+
+
+def fake_completion_stream(deltas):
+    """OpenAI 스트리밍 응답 대체 (delta 문자열 목록 -> 청크 비동기 이터러블)"""
+    async def stream():
+        for index, delta in enumerate(deltas):
+            finish_reason = 'stop' if index == len(deltas) - 1 else None
+            choice = SimpleNamespace(delta=SimpleNamespace(content=delta), finish_reason=finish_reason)
+            yield SimpleNamespace(choices=[choice], usage=None)
+
+    async def create(**kwargs):
+        return stream()
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def collect(events):
+    async def run():
+        return [event async for event in events]
+    return asyncio.run(run())
+
+
+class SseFormatTests(SimpleTestCase):
+    def test_event_framing(self):
+        self.assertEqual(
+            format_sse_event('header', {'item_name': '모나리자'}),
+            'event: header\ndata: {"item_name": "모나리자"}\n\n'
+        )
+
+    def test_error_event_ends_stream(self):
+        async def events():
+            yield 'delta', {'text': '첫 문장'}
+            raise RuntimeError('LLM 오류')
+
+        frames = collect(sse_stream(events()))
+        self.assertEqual(len(frames), 2)
+        self.assertTrue(frames[0].startswith('event: delta\n'))
+        self.assertTrue(frames[1].startswith('event: error\n'))
+        self.assertEqual(json.loads(frames[1].split('data: ', 1)[1]), {'error': 'LLM 오류'})
+
+
+class StreamRealtimeDocentTests(SimpleTestCase):
+    def setUp(self):
+        self.service = DocentService.__new__(DocentService)
+        self.query = '스트리밍 테스트용 절규'
+        self.addCleanup(docent_result_cache.clear)
+
+    def stream(self, deltas):
+        client = fake_completion_stream(deltas)
+        with mock.patch.object(DocentService, 'async_openai_client', new_callable=mock.PropertyMock, return_value=client), \
+                mock.patch.object(self.service, '_lookup_catalog', return_value=(None, None)), \
+                mock.patch.object(self.service, '_start_audio_job', return_value='job-1'), \
+                mock.patch.object(self.service, '_start_speech_stream', new=mock.AsyncMock(return_value=None)):
+            return collect(self.service.stream_realtime_docent(prompt_text=self.query))
+
+    def test_header_split_across_chunks_then_deltas_and_done(self):
+        events = self.stream(['{"type": "art', 'work", "name": "절규"}\n', '\n뭉크의 ', '대표작입니다.'])
+
+        self.assertEqual(events[0], ('header', {'item_type': 'artwork', 'item_name': '절규'}))
+        self.assertEqual(''.join(data['text'] for event, data in events if event == 'delta'), '뭉크의 대표작입니다.')
+        self.assertEqual(events[-1], ('done', {'audio_job_id': 'job-1'}))
+
+    def test_result_is_cached_for_the_next_request(self):
+        self.stream(['{"type": "artwork", "name": "절규"}\n뭉크의 대표작입니다.'])
+        events = self.stream([])
+
+        self.assertEqual(
+            events,
+            [
+                ('header', {'item_type': 'artwork', 'item_name': '절규'}),
+                ('delta', {'text': '뭉크의 대표작입니다.'}),
+                ('done', {'audio_job_id': 'job-1'}),
+            ]
+        )
@@ -0,0 +1,131 @@
+import io
+import json
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from docents.job_stores import InMemoryJobStore
+from docents.services import DocentService
+from docents.tasks import AudioJobManager, AudioQueueFullError, PRIORITY_BATCH, PRIORITY_REALTIME
+
+
+class FakePolly:
+    """Polly synthesize_speech 대체 (호출 횟수 기록)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def synthesize_speech(self, Text, OutputFormat, VoiceId, SpeechMarkTypes=None):
+        with self.lock:
+            self.calls += 1
+        if OutputFormat == 'json':
+            mark = {'time': 0, 'type': 'sentence', 'start': 0, 'end': len(Text.encode('utf-8')), 'value': Text}
+            return {'AudioStream': io.BytesIO(json.dumps(mark).encode('utf-8'))}
+        return {'AudioStream': io.BytesIO(Text.encode('utf-8'))}
+
+
+class AudioJobManagerTests(SimpleTestCase):
+    """음성 작업 관리자 테스트 (Polly 대신 가짜 서비스 사용)"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.manager = AudioJobManager(worker_count=1, queue_max_size=10, store=InMemoryJobStore('audio-test', ttl=60))
+
+    def run_job(self, script_text, synthesize):
+        """가짜 합성 함수로 작업을 등록하고 처리가 끝날 때까지 대기"""
+        service = SimpleNamespace(_generate_audio_and_timestamps=synthesize)
+        with mock.patch('docents.tasks.get_docent_service', return_value=service):
+            job_id = self.manager.create_job(script_text)
+            self.manager.queue.join()
+        return job_id
+
+    def test_failed_job_is_not_shared_with_later_requests(self):
+        def fail(script_text, on_chunk=None):
+            raise RuntimeError("Polly 오류")
+
+        def succeed(script_text, on_chunk=None):
+            return b'audio', [], {}
+
+        failed_job_id = self.run_job('같은 스크립트', fail)
+        self.assertEqual(self.manager.get_job_status(failed_job_id)['status'], 'failed')
+        self.assertEqual(self.manager._inflight_jobs, {})
+
+        retry_job_id = self.run_job('같은 스크립트', succeed)
+        self.assertNotEqual(retry_job_id, failed_job_id)
+        self.assertEqual(self.manager.get_job_status(retry_job_id)['status'], 'completed')
+
+    def test_finished_inflight_job_is_ignored(self):
+        cache_key = self.manager._speech_cache_key('스크립트')
+        self.manager.store.create('job-1', {'status': 'failed'})
+        self.manager._register_inflight_job(cache_key, 'job-1')
+
+        self.assertIsNone(self.manager._get_inflight_job(cache_key))
+        self.assertNotIn(cache_key, self.manager._inflight_jobs)
+
+    def test_streaming_job_uses_speech_cache_once_script_is_known(self):
+        service = DocentService.__new__(DocentService)
+        service.polly = FakePolly()
+        service.polly_executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(service.polly_executor.shutdown)
+
+        def stream(script_text):
+            speech = self.manager.create_streaming_job()
+            speech.feed(script_text)
+            speech.finish(script_text)
+            self.manager.queue.join()
+            return self.manager.get_job_status(speech.job_id)
+
+        with mock.patch('docents.tasks.get_docent_service', return_value=service):
+            first = stream('모나리자는 다빈치의 작품입니다.')
+            polly_calls = service.polly.calls
+            second = stream('모나리자는 다빈치의 작품입니다.')
+
+        # 첫 작업 결과가 음성 캐시에 저장되고, 두 번째 작업은 Polly 호출 없이 캐시로 완료
+        self.assertEqual(first['status'], 'completed')
+        self.assertEqual(polly_calls, 2)
+        self.assertEqual(second['status'], 'completed')
+        self.assertEqual(service.polly.calls, polly_calls)
+        self.assertEqual(second['audio_path'], first['audio_path'])
+        self.assertTrue(second['timings']['cached'])
+
+
+class AudioJobQueueTests(SimpleTestCase):
+    """음성 작업 우선순위 대기열 테스트 (워커 없이 대기열만 확인)"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.manager = AudioJobManager(worker_count=1, queue_max_size=3, store=InMemoryJobStore('audio-test', ttl=60))
+        self.manager._ensure_workers = lambda: None
+
+    def test_realtime_jobs_run_before_batch_jobs_in_fifo_order(self):
+        batch_job = self.manager.create_job('배치 스크립트', priority=PRIORITY_BATCH)
+        first_job = self.manager.create_job('실시간 스크립트 1', priority=PRIORITY_REALTIME)
+        second_job = self.manager.create_job('실시간 스크립트 2', priority=PRIORITY_REALTIME)
+
+        order = [self.manager.queue.get_nowait()[2] for _ in range(3)]
+        self.assertEqual(order, [first_job, second_job, batch_job])
+
+    def test_full_queue_rejects_new_jobs(self):
+        for index in range(3):
+            self.manager.create_job(f'스크립트 {index}')
+        self.assertFalse(self.manager.is_accepting_jobs())
+
+        with self.assertRaises(AudioQueueFullError):
+            self.manager.create_job('넘치는 스크립트')
+        metrics = self.manager.get_queue_metrics()
+        self.assertEqual((metrics['enqueued'], metrics['rejected'], metrics['queue_depth']), (3, 1, 3))
+        self.assertEqual(self.manager.get_active_jobs_count(), 3)
@@ -0,0 +1,187 @@
+import shutil
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.models import User
+from docents import views
+from docents.services import get_async_openai_client
+from docents.job_stores import InMemoryJobStore
+from docents.tasks import AudioJobManager
+
+
+class AudioQueueFullResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = User(id=1, username='tester')
+
+    async def post(self, view, path, data):
+        request = self.factory.post(path, data, format='json')
+        force_authenticate(request, user=self.user)
+        return await view(request)
+
+    def test_realtime_endpoints_return_429_when_audio_queue_is_full(self):
+        with mock.patch.object(views.audio_job_manager, 'is_accepting_jobs', return_value=False), \
+                mock.patch.object(views, 'get_docent_service') as get_docent_service:
+            for view, path in (
+                (views.generate_realtime_docent, '/api/realtime-docent'),
+                (views.generate_realtime_docent_stream, '/api/realtime-docent/stream'),
+            ):
+                response = async_to_sync(self.post)(view, path, {'input_text': '모나리자'})
+                self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+                self.assertEqual(response['Retry-After'], '5')
+            get_docent_service.assert_not_called()
+
+
+class WsgiOpenAIClientTests(SimpleTestCase):
+    """WSGI 요청마다 만들어진 AsyncOpenAI 클라이언트가 요청이 끝날 때 닫히는지"""
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.clients = []
+
+    def fake_service(self):
+        async def generate_realtime_docent(**kwargs):
+            self.clients.append(get_async_openai_client('test-key'))
+            return {'text': '스크립트', 'item_type': 'artwork', 'item_name': '모나리자', 'audio_job_id': None}
+
+        async def stream_realtime_docent(**kwargs):
+            self.clients.append(get_async_openai_client('test-key'))
+            yield 'done', {'audio_job_id': None}
+
+        return SimpleNamespace(
+            generate_realtime_docent=generate_realtime_docent,
+            stream_realtime_docent=stream_realtime_docent,
+        )
+
+    async def post(self, view, path):
+        request = self.factory.post(path, {'input_text': '모나리자'}, format='json')
+        force_authenticate(request, user=User(id=1, username='tester'))
+        return await view(request)
+
+    def test_realtime_request_closes_its_client(self):
+        with mock.patch.object(views, 'get_docent_service', return_value=self.fake_service()):
+            response = async_to_sync(self.post)(views.generate_realtime_docent, '/api/realtime-docent')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.clients), 1)
+        self.assertTrue(self.clients[0].is_closed())
+
+    def test_stream_closes_its_client_when_consumed(self):
+        with mock.patch.object(views, 'get_docent_service', return_value=self.fake_service()):
+            response = async_to_sync(self.post)(views.generate_realtime_docent_stream, '/api/realtime-docent/stream')
+            # WSGI에서 비동기 스트림은 별도 이벤트 루프에서 한 번에 소비됨
+            with self.assertWarnsRegex(Warning, 'must consume asynchronous iterators'):
+                content = b''.join(response)
+
+        self.assertIn(b'event: done', content)
+        self.assertEqual(len(self.clients), 1)
+        self.assertTrue(self.clients[0].is_closed())
+
+
+class StoredAudioViewTests(SimpleTestCase):
+    """미디어 저장소에 저장된 음성 조회/스트리밍 테스트"""
+
+    AUDIO = b'\xff\xf3\x64\xc4' + b'\0' * 140
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.manager = AudioJobManager(worker_count=1, queue_max_size=10, store=InMemoryJobStore('audio-test', ttl=60))
+        manager_patch = mock.patch.object(views, 'audio_job_manager', self.manager)
+        manager_patch.start()
+        self.addCleanup(manager_patch.stop)
+
+        service = SimpleNamespace(_generate_audio_and_timestamps=lambda script_text, on_chunk=None: (self.AUDIO, [], {}))
+        with mock.patch('docents.tasks.get_docent_service', return_value=service):
+            self.job_id = self.manager.create_job('저장소 음성 스크립트')
+            self.manager.queue.join()
+        self.factory = APIRequestFactory()
+
+    def test_job_keeps_only_storage_path_and_size(self):
+        job = self.manager.store.get(self.job_id)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['audio_size'], len(self.AUDIO))
+        self.assertNotIn('audio_base64', job)
+
+    def test_status_returns_stream_url_and_file_is_served(self):
+        response = views.get_audio_status(self.factory.get('/'), self.job_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('audio_path', response.data)
+        self.assertTrue(response.data['audio_url'].endswith(f'stream-audio/{self.job_id}'))
+
+        response = views.stream_audio(self.factory.get('/'), self.job_id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO)
+
+
+class AudioFileResponseTests(SimpleTestCase):
+    """음성 파일 응답의 Range/ETag 처리 테스트"""
+
+    AUDIO = bytes(range(256)) * 4
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+        self.path = default_storage.save('docents/audio/test.mp3', ContentFile(self.AUDIO))
+        self.etag = f'"job-1-{len(self.AUDIO)}"'
+        self.factory = APIRequestFactory()
+
+    def respond(self, **headers):
+        request = self.factory.get('/', **headers)
+        return views._audio_file_response(request, self.path, len(self.AUDIO), etag_base='job-1', filename='test.mp3')
+
+    def test_full_file(self):
+        response = self.respond()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO)
+
+    def test_partial_content(self):
+        response = self.respond(HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.AUDIO)}')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO[10:20])
+
+    def test_not_modified(self):
+        response = self.respond(HTTP_IF_NONE_MATCH=f'"other", {self.etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_range_not_satisfiable(self):
+        response = self.respond(HTTP_RANGE=f'bytes={len(self.AUDIO)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.AUDIO)}')
+
+    def test_reversed_range_serves_full_file(self):
+        response = self.respond(HTTP_RANGE='bytes=10-5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO)
+
+    def test_if_range(self):
+        response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=self.etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO[:10])
+
+        # ETag가 바뀌었으면 Range를 무시하고 전체 파일 응답
+        response = self.respond(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"job-1-1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.AUDIO)
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import FolderViewSet, DocentViewSet, generate_realtime_docent, get_audio_status, stream_audio, debug_memory_jobs
+from .views import FolderViewSet, DocentViewSet, generate_realtime_docent, generate_realtime_docent_stream, create_docent_batch, get_docent_batch, stream_docent_batch, get_audio_status, stream_audio, stream_audio_chunk, debug_memory_jobs, debug_docent_cache, debug_audio_queue
 
 router = DefaultRouter(trailing_slash=False)
 router.register(r'folders', FolderViewSet, basename='folder')
@@ -9,7 +9,14 @@ router.register(r'docents', DocentViewSet, basename='docent')
 urlpatterns = [
     path('', include(router.urls)),
     path('realtime-docent', generate_realtime_docent, name='generate_realtime_docent'),
+    path('realtime-docent/stream', generate_realtime_docent_stream, name='generate_realtime_docent_stream'),
+    path('realtime-docent/batch', create_docent_batch, name='create_docent_batch'),
+    path('realtime-docent/batch/<str:batch_id>', get_docent_batch, name='get_docent_batch'),
+    path('realtime-docent/batch/<str:batch_id>/stream', stream_docent_batch, name='stream_docent_batch'),
     path('audio-status/<str:job_id>', get_audio_status, name='get_audio_status'),
     path('stream-audio/<str:job_id>', stream_audio, name='stream_audio'),
+    path('stream-audio/<str:job_id>/chunks/<int:index>', stream_audio_chunk, name='stream_audio_chunk'),
     path('debug/memory-jobs', debug_memory_jobs, name='debug_memory_jobs'),
+    path('debug/docent-cache', debug_docent_cache, name='debug_docent_cache'),
+    path('debug/audio-queue', debug_audio_queue, name='debug_audio_queue'),
 ] 
\ No newline at end of file
@@ -1,5 +1,8 @@
 from rest_framework import viewsets, filters, status, mixins
 from rest_framework.decorators import action, api_view
+from adrf.decorators import api_view as async_api_view
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated, AllowAny
 
@@ -12,8 +15,18 @@ from docents.serializers import (
     FolderSerializer, DocentDetailSerializer, 
     DocentCreateSerializer, DocentSerializer, FolderDetailSerializer
 )
-from docents.services import DocentService
+from docents.services import close_async_openai_client, get_docent_service
+from docents.cache import docent_result_cache
+from docents.singleflight import docent_singleflight
+from docents.prompts import prompt_usage_stats
+from docents.streaming import sse_stream
+from docents.images import prepare_image_for_vision, image_dhash
+from docents.image_index import image_recognition_index
+from docents.audio import (
+    open_audio, audio_file_url, audio_size, parse_byte_range, iter_audio_range, RangeNotSatisfiable
+)
 from docents.tasks import audio_job_manager
+from docents.batch import batch_docent_manager, BatchQueueFullError
 
 
 # Create your views here.
@@ -233,6 +246,91 @@ class DocentViewSet(mixins.RetrieveModelMixin,
                 }, status=status.HTTP_201_CREATED)
 
 
+def _audio_queue_full_response() -> Response:
+    """음성 대기열 포화 시 429 응답"""
+    return Response(
+        {'error': '요청이 많아 음성 생성 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': '5'}
+    )
+
+
+def _uses_request_event_loop(request) -> bool:
+    """WSGI 요청 여부 (비동기 뷰/스트림마다 async_to_sync가 새 이벤트 루프를 만들고 닫음)
+
+    이런 루프의 공유 AsyncOpenAI 클라이언트는 요청이 끝날 때 닫아야 httpx 연결 풀이 남지 않습니다.
+    ASGI에서는 이벤트 루프가 프로세스 동안 유지되므로 클라이언트를 계속 재사용합니다.
+    """
+    return not isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+def _read_request_payload(request) -> tuple:
+    """요청 본문과 업로드 파일 파싱 (동기)"""
+    return request.data, request.FILES
+
+
+def _encode_image_file(input_image_file) -> tuple:
+    """업로드된 이미지 파일을 축소/재인코딩한 뒤 (base64 data URL, 지각 해시) 반환"""
+    import base64
+
+    # 카메라 원본(수 MB)을 비전 모델에 필요한 해상도로 줄여 업로드 크기와 지연 감소
+    image_data, content_type = prepare_image_for_vision(input_image_file.read())
+    image_base64 = base64.b64encode(image_data).decode('utf-8')
+    image_hash = image_dhash(image_data)
+
+    print(f"🔄 이미지 파일을 base64로 변환 완료 (크기: {len(image_data)} 바이트, 해시: {image_hash:016x})")
+    return f"data:{content_type};base64,{image_base64}", image_hash
+
+
+def _audio_file_response(request, audio_path: str, size: int, etag_base: str, filename: str):
+    """저장된 MP3 파일 응답 (Range/206, ETag/304 지원)"""
+    from django.http import HttpResponse, FileResponse, StreamingHttpResponse
+
+    size = size or audio_size(audio_path)
+    etag = f'"{etag_base}-{size}"'
+
+    def with_audio_headers(response):
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=3600'
+        return response
+
+    # 클라이언트가 이미 같은 파일을 가지고 있으면 본문 없이 응답
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        return with_audio_headers(HttpResponse(status=304))
+
+    # If-Range가 ETag와 다르면 Range를 무시하고 전체 파일 응답
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and if_range and if_range.strip() != etag:
+        range_header = None
+
+    try:
+        byte_range = parse_byte_range(range_header, size)
+    except RangeNotSatisfiable:
+        response = with_audio_headers(HttpResponse(status=416))
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range:
+        # 요청 구간만 청크 단위로 전송 (탐색 시 전체 재다운로드 방지)
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            iter_audio_range(audio_path, start, end),
+            status=206,
+            content_type='audio/mpeg'
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+    else:
+        # 저장소의 MP3 파일 전체를 청크 단위로 스트리밍
+        response = FileResponse(open_audio(audio_path), content_type='audio/mpeg')
+        response['Content-Length'] = size
+
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    return with_audio_headers(response)
+
+
 @extend_schema(
     summary="실시간 도슨트 스크립트 생성",
     description="텍스트 또는 이미지 중 하나를 입력받아 도슨트 스크립트를 생성합니다. LLM이 자동으로 작가/작품을 판별하고 적절한 도슨트를 생성하며, 음성은 백그라운드에서 생성됩니다.",
@@ -270,16 +368,17 @@ class DocentViewSet(mixins.RetrieveModelMixin,
                 'text': {'type': 'string', 'description': '도슨트 스크립트'},
                 'item_type': {'type': 'string', 'description': 'LLM이 판별한 항목 유형 (artist/artwork)'},
                 'item_name': {'type': 'string', 'description': 'LLM이 정확히 식별한 항목명'},
-                'audio_job_id': {'type': 'string', 'description': '음성 생성 작업 ID'}
+                'audio_job_id': {'type': 'string', 'description': '음성 생성 작업 ID (대기열 포화 시 null)'}
             }
         },
         400: {'description': '잘못된 요청'},
+        429: {'description': '음성 생성 대기열 포화 (Retry-After 후 재시도)'},
         500: {'description': '서버 오류'}
     },
     tags=["Docents"]
 )
-@api_view(['POST'])
-def generate_realtime_docent(request):
+@async_api_view(['POST'])
+async def generate_realtime_docent(request):
     """
     실시간 도슨트 스크립트 생성 API
     
@@ -287,18 +386,19 @@ def generate_realtime_docent(request):
     1. LLM이 입력값이 작가인지 작품인지 자동 판별
     2. 해당 타입에 맞는 도슨트 스크립트 생성
     3. 음성은 백그라운드에서 별도 처리
+    
+    ASGI(config.asgi)에서 실행하면 LLM 응답을 기다리는 동안 워커를 점유하지 않습니다.
     """
+    import logging
+    
+    logger = logging.getLogger(__name__)
+    
     try:
-        import asyncio
-        import logging
-        import base64
-        
-        logger = logging.getLogger(__name__)
-        
-        # 요청 데이터 확인
-        input_text = request.data.get('input_text')
-        input_image = request.data.get('input_image')  # URL
-        input_image_file = request.FILES.get('input_image_file')  # 업로드된 파일
+        # 요청 데이터 확인 (multipart 파싱은 스레드에서 수행)
+        data, files = await sync_to_async(_read_request_payload)(request)
+        input_text = data.get('input_text')
+        input_image = data.get('input_image')  # URL
+        input_image_file = files.get('input_image_file')  # 업로드된 파일
         
         print(f"🎯 API 호출됨!")
         print(f"📝 input_text: {input_text}")
@@ -312,19 +412,16 @@ def generate_realtime_docent(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # 이미지 파일이 있는 경우 base64로 인코딩
+        # 음성 대기열이 가득 차면 LLM 호출 전에 거절 (백프레셔)
+        if not audio_job_manager.is_accepting_jobs():
+            return _audio_queue_full_response()
+        
+        # 이미지 파일이 있는 경우 base64로 인코딩 (비슷한 사진 인식용 해시 포함)
         processed_image = None
+        image_hash = None
         if input_image_file:
             try:
-                # 이미지 파일을 base64로 인코딩
-                image_data = input_image_file.read()
-                image_base64 = base64.b64encode(image_data).decode('utf-8')
-                
-                # MIME 타입 확인
-                content_type = input_image_file.content_type or 'image/jpeg'
-                processed_image = f"data:{content_type};base64,{image_base64}"
-                print(f"🔄 이미지 파일을 base64로 변환 완료 (크기: {len(image_data)} 바이트)")
-                
+                processed_image, image_hash = await sync_to_async(_encode_image_file)(input_image_file)
             except Exception as e:
                 print(f"❌ 이미지 파일 처리 실패: {e}")
                 return Response(
@@ -335,7 +432,7 @@ def generate_realtime_docent(request):
             processed_image = input_image
         
         try:
-            docent_service = DocentService()
+            docent_service = await sync_to_async(get_docent_service)()
             print("✅ DocentService 초기화 성공")
         except Exception as e:
             print(f"❌ DocentService 초기화 실패: {e}")
@@ -344,21 +441,13 @@ def generate_realtime_docent(request):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # 새 이벤트 루프 생성 및 비동기 함수 실행
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
         print("🔄 비동기 함수 실행 시작...")
         
         try:
-            result = loop.run_until_complete(
-                docent_service.generate_realtime_docent(
-                    prompt_text=input_text,
-                    prompt_image=processed_image,  # URL 또는 base64 데이터
-                )
+            result = await docent_service.generate_realtime_docent(
+                prompt_text=input_text,
+                prompt_image=processed_image,  # URL 또는 base64 데이터
+                image_hash=image_hash,
             )
             print(f"✅ 비동기 함수 실행 완료")
             print(f"📝 결과 text 길이: {len(result.get('text', ''))}")
@@ -392,20 +481,263 @@ def generate_realtime_docent(request):
             {'error': str(e)}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    finally:
+        if _uses_request_event_loop(request):
+            await close_async_openai_client()
+
+
+@extend_schema(
+    summary="실시간 도슨트 스크립트 스트리밍 생성 (SSE)",
+    description=(
+        "실시간 도슨트 생성과 같은 입력을 받아 결과를 Server-Sent Events로 스트리밍합니다. "
+        "header 이벤트(item_type, item_name)가 먼저 전송되고, 이어서 delta 이벤트로 스크립트 조각이, "
+        "마지막으로 done 이벤트(audio_job_id)가 전송됩니다. 실패 시 error 이벤트가 전송됩니다."
+    ),
+    request={
+        'multipart/form-data': {
+            'type': 'object',
+            'properties': {
+                'input_text': {'type': 'string', 'description': '텍스트 입력 (작가명, 작품명 등)'},
+                'input_image': {'type': 'string', 'description': '이미지 URL'},
+                'input_image_file': {'type': 'string', 'format': 'binary', 'description': '이미지 파일 (모바일 카메라 촬영)'}
+            }
+        }
+    },
+    responses={
+        200: {
+            'description': 'text/event-stream 형식의 이벤트 스트림',
+            'content': {'text/event-stream': {'schema': {'type': 'string'}}}
+        },
+        400: {'description': '잘못된 요청'},
+        429: {'description': '음성 생성 대기열 포화 (Retry-After 후 재시도)'},
+        500: {'description': '서버 오류'}
+    },
+    tags=["Docents"]
+)
+@async_api_view(['POST'])
+async def generate_realtime_docent_stream(request):
+    """실시간 도슨트 스크립트 스트리밍 생성 API (SSE)"""
+    from django.http import StreamingHttpResponse
+
+    data, files = await sync_to_async(_read_request_payload)(request)
+    input_text = data.get('input_text')
+    input_image = data.get('input_image')  # URL
+    input_image_file = files.get('input_image_file')  # 업로드된 파일
+
+    if not input_text and not input_image and not input_image_file:
+        return Response(
+            {'error': 'input_text, input_image, input_image_file 중 하나는 필수입니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not audio_job_manager.is_accepting_jobs():
+        return _audio_queue_full_response()
+
+    processed_image = input_image
+    image_hash = None
+    if input_image_file:
+        try:
+            processed_image, image_hash = await sync_to_async(_encode_image_file)(input_image_file)
+        except Exception as e:
+            return Response(
+                {'error': f'이미지 파일 처리 실패: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    try:
+        docent_service = await sync_to_async(get_docent_service)()
+    except Exception as e:
+        return Response(
+            {'error': f'서비스 초기화 실패: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    events = docent_service.stream_realtime_docent(
+        prompt_text=input_text,
+        prompt_image=processed_image,
+        image_hash=image_hash,
+    )
+    # WSGI에서는 스트림을 별도의 일회용 이벤트 루프에서 소비하므로 스트림이 끝날 때 그 루프의 클라이언트를 닫음
+    on_close = close_async_openai_client if _uses_request_event_loop(request) else None
+    response = StreamingHttpResponse(sse_stream(events, on_close=on_close), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 비활성화
+    return response
+
+
+_BATCH_ITEM_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'index': {'type': 'integer', 'description': '입력 순서'},
+        'input_text': {'type': 'string', 'description': '입력 텍스트'},
+        'status': {'type': 'string', 'enum': ['pending', 'processing', 'completed', 'failed'], 'description': '항목 상태'},
+        'item_type': {'type': 'string', 'description': '판별된 항목 유형 (artist/artwork, 완료시)'},
+        'item_name': {'type': 'string', 'description': '식별된 항목명 (완료시)'},
+        'text': {'type': 'string', 'description': '도슨트 스크립트 (완료시)'},
+        'audio_job_id': {'type': 'string', 'description': '음성 생성 작업 ID (완료시, 대기열 포화 시 null)'},
+        'error': {'type': 'string', 'description': '에러 메시지 (실패시)'}
+    }
+}
+
+_BATCH_STATUS_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'batch_id': {'type': 'string', 'description': '배치 작업 ID'},
+        'status': {'type': 'string', 'enum': ['pending', 'processing', 'completed', 'failed'], 'description': '배치 상태'},
+        'total': {'type': 'integer', 'description': '전체 항목 수'},
+        'completed': {'type': 'integer', 'description': '완료된 항목 수'},
+        'failed': {'type': 'integer', 'description': '실패한 항목 수'},
+        'error': {'type': 'string', 'description': '배치 실행 오류 (실패시)'},
+        'items': {'type': 'array', 'items': _BATCH_ITEM_SCHEMA, 'description': '항목별 진행 상황'}
+    }
+}
+
+
+@extend_schema(
+    summary="배치 도슨트 생성",
+    description=(
+        "여러 작가/작품명을 한 번에 받아 도슨트를 생성합니다. (전시 투어 구성용) "
+        "항목들은 백그라운드에서 동시 처리 수 제한 하에 생성되며, 응답의 batch_id로 "
+        "진행 상황을 조회하거나 SSE로 스트리밍할 수 있습니다. 음성은 실시간 요청보다 낮은 우선순위로 생성됩니다."
+    ),
+    request={
+        'application/json': {
+            'type': 'object',
+            'properties': {
+                'inputs': {'type': 'array', 'items': {'type': 'string'}, 'description': '작가명/작품명 목록'}
+            },
+            'required': ['inputs']
+        }
+    },
+    responses={
+        202: {
+            'type': 'object',
+            'properties': {
+                'batch_id': {'type': 'string', 'description': '배치 작업 ID'},
+                'total': {'type': 'integer', 'description': '전체 항목 수'},
+                'status_url': {'type': 'string', 'description': '진행 상황 조회 URL'},
+                'stream_url': {'type': 'string', 'description': '진행 상황 스트리밍(SSE) URL'}
+            }
+        },
+        400: {'description': '잘못된 요청 (입력 없음 또는 최대 개수 초과)'},
+        429: {'description': '배치 또는 음성 생성 대기열 포화 (Retry-After 후 재시도)'}
+    },
+    tags=["Docents"]
+)
+@api_view(['POST'])
+def create_docent_batch(request):
+    """배치 도슨트 생성 API"""
+    from django.urls import reverse
+
+    data = request.data
+    inputs = data.getlist('inputs') if hasattr(data, 'getlist') else data.get('inputs')
+    if not isinstance(inputs, list) or not all(isinstance(value, str) for value in inputs):
+        return Response({'error': 'inputs는 문자열 목록이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    inputs = [value.strip() for value in inputs if value.strip()]
+    if not inputs:
+        return Response({'error': 'inputs에 하나 이상의 입력이 필요합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(inputs) > batch_docent_manager.max_items:
+        return Response(
+            {'error': f'한 번에 최대 {batch_docent_manager.max_items}개까지 요청할 수 있습니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not audio_job_manager.is_accepting_jobs():
+        return _audio_queue_full_response()
+
+    try:
+        batch_id = batch_docent_manager.create_batch(inputs)
+    except BatchQueueFullError as e:
+        return Response({'error': str(e)}, status=status.HTTP_429_TOO_MANY_REQUESTS, headers={'Retry-After': '30'})
+
+    return Response({
+        'batch_id': batch_id,
+        'total': len(inputs),
+        'status_url': request.build_absolute_uri(reverse('get_docent_batch', args=[batch_id])),
+        'stream_url': request.build_absolute_uri(reverse('stream_docent_batch', args=[batch_id])),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(
+    summary="배치 도슨트 진행 상황 조회",
+    description="배치 작업의 전체/완료/실패 수와 항목별 결과를 조회합니다. 완료된 항목은 스크립트와 음성 작업 ID를 포함합니다.",
+    responses={
+        200: _BATCH_STATUS_SCHEMA,
+        404: {'description': '배치를 찾을 수 없음'}
+    },
+    tags=["Docents"]
+)
+@api_view(['GET'])
+def get_docent_batch(request, batch_id):
+    """배치 도슨트 진행 상황 조회 API"""
+    batch = batch_docent_manager.get_batch_status(batch_id)
+    if not batch:
+        return Response({'error': '배치를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(batch, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    summary="배치 도슨트 진행 상황 스트리밍 (SSE)",
+    description=(
+        "배치 항목의 상태가 바뀔 때마다 item 이벤트(항목 정보)를 전송하고, "
+        "배치가 끝나면 done 이벤트(batch_id, status, total, completed, failed)를 전송합니다. "
+        "배치를 찾을 수 없거나 대기 시간이 초과되면 error 이벤트가 전송됩니다."
+    ),
+    responses={
+        200: {
+            'description': 'text/event-stream 형식의 이벤트 스트림',
+            'content': {'text/event-stream': {'schema': {'type': 'string'}}}
+        }
+    },
+    tags=["Docents"]
+)
+@async_api_view(['GET'])
+async def stream_docent_batch(request, batch_id):
+    """배치 도슨트 진행 상황 스트리밍 API (SSE)"""
+    from django.http import StreamingHttpResponse
+
+    response = StreamingHttpResponse(
+        sse_stream(batch_docent_manager.watch_batch(batch_id)),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 비활성화
+    return response
 
 
 @extend_schema(
     summary="음성 생성 상태 조회",
-    description="백그라운드에서 생성 중인 음성의 상태를 조회하고, 완료 시 직접 재생 가능한 URL을 제공합니다.",
+    description="""백그라운드에서 생성 중인 음성의 상태를 조회하고, 완료 시 직접 재생 가능한 URL을 제공합니다.
+
+    음성은 문장 단위 청크로 나뉘어 생성되며, 전체 완료 전이라도
+    chunks에서 완료된 청크의 audio_url을 index 순서대로 재생할 수 있습니다.
+    """,
     responses={
         200: {
             'type': 'object',
             'properties': {
                 'job_id': {'type': 'string', 'description': '작업 ID'},
                 'status': {'type': 'string', 'enum': ['pending', 'processing', 'completed', 'failed'], 'description': '작업 상태'},
-                'audio_url': {'type': 'string', 'description': '스웨거에서 직접 재생 가능한 음성 URL (완료시)'},
-                'audio_base64': {'type': 'string', 'description': 'Base64 인코딩된 음성 데이터 (완료시)'},
+                'audio_url': {'type': 'string', 'description': '스웨거에서 직접 재생 가능한 음성 스트리밍 URL (완료시)'},
+                'audio_file_url': {'type': 'string', 'description': '미디어 저장소(S3 등)의 음성 파일 URL (완료시)'},
+                'audio_size': {'type': 'integer', 'description': '음성 파일 크기(바이트) (완료시)'},
                 'timestamps': {'type': 'array', 'description': '문장별 타임스탬프 (완료시)'},
+                'timings': {'type': 'object', 'description': 'Polly 소요 시간(초) - chunk_count, first_chunk_seconds, audio_seconds, speech_marks_seconds, total_seconds (완료시)'},
+                'chunks': {
+                    'type': 'array',
+                    'description': '청크별 음성 (생성 중에도 준비된 청크부터 재생 가능)',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'index': {'type': 'integer', 'description': '청크 순서'},
+                            'status': {'type': 'string', 'enum': ['pending', 'completed'], 'description': '청크 상태'},
+                            'duration_ms': {'type': 'integer', 'description': '청크 재생 시간(ms)'},
+                            'offset_ms': {'type': 'integer', 'description': '전체 음성 기준 시작 위치(ms), 앞선 청크가 모두 준비되면 제공'},
+                            'audio_url': {'type': 'string', 'description': '청크 음성 스트리밍 URL'},
+                        }
+                    }
+                },
                 'error': {'type': 'string', 'description': '에러 메시지 (실패시)'}
             }
         },
@@ -425,10 +757,27 @@ def get_audio_status(request, job_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 완료된 경우 스트리밍 URL 추가
-        if job_status['status'] == 'completed' and job_status['audio_base64']:
-            audio_url = request.build_absolute_uri(f'/api/docents/audio/{job_id}/stream/')
-            job_status['audio_url'] = audio_url
+        from django.urls import reverse
+        
+        # 완료된 경우 음성 데이터 대신 URL 제공 (저장 경로는 노출하지 않음)
+        audio_path = job_status.pop('audio_path')
+        if job_status['status'] == 'completed' and audio_path:
+            job_status['audio_url'] = request.build_absolute_uri(reverse('stream_audio', args=[job_id]))
+            job_status['audio_file_url'] = audio_file_url(audio_path)
+        
+        # 준비된 청크부터 순서대로 재생할 수 있도록 청크별 URL 제공
+        job_status['chunks'] = [
+            {
+                'index': chunk['index'],
+                'status': chunk['status'],
+                'duration_ms': chunk['duration_ms'],
+                'offset_ms': chunk['offset_ms'],
+                'audio_url': request.build_absolute_uri(
+                    reverse('stream_audio_chunk', args=[job_id, chunk['index']])
+                ) if chunk['status'] == 'completed' else None,
+            }
+            for chunk in job_status['chunks']
+        ]
         
         return Response(job_status, status=status.HTTP_200_OK)
         
@@ -441,7 +790,17 @@ def get_audio_status(request, job_id):
 
 @extend_schema(
     summary="음성 파일 스트리밍",
-    description="완성된 음성을 MP3 파일로 스트리밍합니다. 스웨거에서 직접 재생 가능합니다.",
+    description="""완성된 음성을 MP3 파일로 스트리밍합니다. 스웨거에서 직접 재생 가능합니다.
+
+    - Range 헤더(bytes=시작-끝)로 일부 구간만 요청할 수 있습니다 (206 Partial Content)
+    - ETag/If-None-Match로 변경 여부를 확인하면 304 Not Modified를 반환합니다
+    """,
+    parameters=[
+        OpenApiParameter(name='Range', location=OpenApiParameter.HEADER, required=False, type=str,
+                         description='요청할 바이트 범위 (예: bytes=0-65535)'),
+        OpenApiParameter(name='If-None-Match', location=OpenApiParameter.HEADER, required=False, type=str,
+                         description='이전 응답의 ETag'),
+    ],
     responses={
         200: {
             'description': 'MP3 오디오 파일',
@@ -454,7 +813,10 @@ def get_audio_status(request, job_id):
                 }
             }
         },
-        404: {'description': '작업을 찾을 수 없거나 아직 완료되지 않음'}
+        206: {'description': '요청한 구간의 MP3 데이터 (Content-Range 포함)'},
+        304: {'description': 'ETag가 일치하여 변경 없음'},
+        404: {'description': '작업을 찾을 수 없거나 아직 완료되지 않음'},
+        416: {'description': '요청한 범위가 파일 크기를 벗어남'}
     },
     tags=["Docents"]
 )
@@ -462,7 +824,6 @@ def get_audio_status(request, job_id):
 def stream_audio(request, job_id):
     """음성 파일 스트리밍 API (스웨거에서 직접 재생 가능)"""
     try:
-        import base64
         from django.http import HttpResponse
         
         job_status = audio_job_manager.get_job_status(job_id)
@@ -473,26 +834,66 @@ def stream_audio(request, job_id):
         if job_status['status'] != 'completed':
             return HttpResponse(f'음성 생성이 아직 완료되지 않았습니다. 상태: {job_status["status"]}', status=404)
         
-        if not job_status['audio_base64']:
+        if not job_status['audio_path']:
             return HttpResponse('음성 데이터가 없습니다.', status=404)
         
-        # Base64를 바이너리로 변환
-        audio_data = base64.b64decode(job_status['audio_base64'])
+        return _audio_file_response(
+            request,
+            job_status['audio_path'],
+            job_status.get('audio_size'),
+            # 작업별 음성 파일은 생성 후 변경되지 않으므로 작업 ID + 크기로 ETag 구성
+            etag_base=job_id,
+            filename=f"docent_{job_id}.mp3"
+        )
         
-        # MP3 파일로 응답
-        response = HttpResponse(audio_data, content_type='audio/mpeg')
-        response['Content-Disposition'] = f'inline; filename="docent_{job_id}.mp3"'
-        response['Content-Length'] = len(audio_data)
+    except Exception as e:
+        return HttpResponse(f'오류: {str(e)}', status=500)
+
+
+@extend_schema(
+    summary="음성 청크 스트리밍",
+    description="문장 단위로 먼저 생성된 음성 청크를 MP3로 스트리밍합니다. 전체 음성이 완료되기 전에 재생을 시작할 때 사용합니다.",
+    responses={
+        200: {
+            'description': 'MP3 오디오 청크',
+            'content': {'audio/mpeg': {'schema': {'type': 'string', 'format': 'binary'}}}
+        },
+        206: {'description': '요청한 구간의 MP3 데이터 (Content-Range 포함)'},
+        404: {'description': '작업 또는 청크를 찾을 수 없거나 아직 준비되지 않음'}
+    },
+    tags=["Docents"]
+)
+@api_view(['GET'])
+def stream_audio_chunk(request, job_id, index):
+    """음성 청크 스트리밍 API"""
+    try:
+        from django.http import HttpResponse
         
-        return response
+        job_status = audio_job_manager.get_job_status(job_id)
+        
+        if not job_status:
+            return HttpResponse('작업을 찾을 수 없습니다.', status=404)
+        
+        chunks = job_status['chunks']
+        if index >= len(chunks) or chunks[index]['status'] != 'completed':
+            return HttpResponse('음성 청크가 아직 준비되지 않았습니다.', status=404)
+        
+        chunk = chunks[index]
+        return _audio_file_response(
+            request,
+            chunk['audio_path'],
+            chunk['audio_size'],
+            etag_base=f"{job_id}-{index}",
+            filename=f"docent_{job_id}_{index}.mp3"
+        )
         
     except Exception as e:
         return HttpResponse(f'오류: {str(e)}', status=500)
 
 
 @extend_schema(
-    summary="디버깅: 메모리 작업 현황 조회",
-    description="현재 메모리에 저장된 음성 생성 작업들의 상태를 조회합니다. (개발용)",
+    summary="디버깅: 음성 작업 현황 조회",
+    description="작업 저장소(memory/database)에 저장된 음성 생성 작업들의 상태를 조회합니다. cache 저장소는 목록 조회를 지원하지 않습니다. (개발용)",
     responses={
         200: {
             'type': 'object',
@@ -518,22 +919,21 @@ def stream_audio(request, job_id):
 )
 @api_view(['GET'])
 def debug_memory_jobs(request):
-    """메모리에 저장된 작업들의 현황 조회 (디버깅용)"""
-    from datetime import datetime
+    """작업 저장소에 저장된 작업들의 현황 조회 (디버깅용)"""
+    from django.utils import timezone
     
     jobs_info = []
-    with audio_job_manager.lock:
-        for job_id, job in audio_job_manager.jobs.items():
-            age_minutes = int((datetime.now() - job['created_at']).total_seconds() / 60)
-            script_preview = job['script_text'][:50] + '...' if len(job['script_text']) > 50 else job['script_text']
-            
-            jobs_info.append({
-                'job_id': job_id,
-                'status': job['status'],
-                'created_at': job['created_at'].isoformat(),
-                'age_minutes': age_minutes,
-                'script_preview': script_preview
-            })
+    for job in audio_job_manager.store.list_jobs():
+        age_minutes = int((timezone.now() - job['created_at']).total_seconds() / 60)
+        script_preview = job['script_text'][:50] + '...' if len(job['script_text']) > 50 else job['script_text']
+        
+        jobs_info.append({
+            'job_id': job['job_id'],
+            'status': job['status'],
+            'created_at': job['created_at'].isoformat(),
+            'age_minutes': age_minutes,
+            'script_preview': script_preview
+        })
     
     # 생성 시간 순으로 정렬 (최신 먼저)
     jobs_info.sort(key=lambda x: x['created_at'], reverse=True)
@@ -541,4 +941,67 @@ def debug_memory_jobs(request):
     return Response({
         'total_jobs': len(jobs_info),
         'jobs': jobs_info
-    })
\ No newline at end of file
+    })
+
+
+@extend_schema(
+    summary="디버깅: 도슨트 결과 캐시 현황 조회",
+    description="LLM 도슨트 결과 캐시의 크기와 적중/미스 횟수, 사진 인식 인덱스와 동시 요청 합치기(single-flight), LLM 토큰 사용량 현황을 조회합니다. (개발용)",
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'size': {'type': 'integer', 'description': '캐시된 항목 수'},
+                'max_size': {'type': 'integer', 'description': '최대 항목 수'},
+                'ttl_seconds': {'type': 'integer', 'description': '항목 유효 시간(초)'},
+                'hits': {'type': 'integer', 'description': '캐시 적중 횟수'},
+                'misses': {'type': 'integer', 'description': '캐시 미스 횟수'},
+                'hit_rate': {'type': 'number', 'description': '적중률'},
+                'image_index': {'type': 'object', 'description': '사진 지각 해시 인덱스 크기, 해밍 거리 임계값, 적중/미스 횟수'},
+                'singleflight': {'type': 'object', 'description': '진행 중인 LLM 생성 수(inflight)와 합쳐진 요청 수(coalesced)'},
+                'prompt_usage': {'type': 'object', 'description': 'LLM 요청 수, 입력/캐시/출력 토큰 누적·평균, 평균 응답 시간, 토큰 상한으로 잘린 응답 수'}
+            }
+        }
+    },
+    tags=["Debug"]
+)
+@api_view(['GET'])
+def debug_docent_cache(request):
+    """도슨트 결과 캐시 현황 조회 (디버깅용)"""
+    return Response(dict(
+        docent_result_cache.stats(),
+        image_index=image_recognition_index.stats(),
+        singleflight=docent_singleflight.stats(),
+        prompt_usage=prompt_usage_stats.stats(),
+    ))
+
+
+@extend_schema(
+    summary="디버깅: 음성 작업 대기열 현황 조회",
+    description="음성 생성 워커 풀의 대기열 깊이, 대기 시간, 처리/거절 건수를 조회합니다. (개발용)",
+    responses={
+        200: {
+            'type': 'object',
+            'properties': {
+                'queue_depth': {'type': 'integer', 'description': '대기 중인 작업 수'},
+                'queue_max_size': {'type': 'integer', 'description': '대기열 최대 크기'},
+                'worker_count': {'type': 'integer', 'description': '워커 수'},
+                'active': {'type': 'integer', 'description': '처리 중인 작업 수'},
+                'enqueued': {'type': 'integer', 'description': '등록된 작업 수'},
+                'rejected': {'type': 'integer', 'description': '대기열 포화로 거절된 작업 수'},
+                'cache_hits': {'type': 'integer', 'description': '음성 캐시로 바로 완료된 작업 수'},
+                'coalesced': {'type': 'integer', 'description': '진행 중인 같은 스크립트 작업을 공유한 요청 수'},
+                'streamed': {'type': 'integer', 'description': '스크립트 생성 중에 합성을 시작한 작업 수'},
+                'completed': {'type': 'integer', 'description': '완료된 작업 수'},
+                'failed': {'type': 'integer', 'description': '실패한 작업 수'},
+                'wait_seconds_avg': {'type': 'number', 'description': '평균 대기 시간(초)'},
+                'wait_seconds_max': {'type': 'number', 'description': '최대 대기 시간(초)'}
+            }
+        }
+    },
+    tags=["Debug"]
+)
+@api_view(['GET'])
+def debug_audio_queue(request):
+    """음성 작업 대기열 현황 조회 (디버깅용)"""
+    return Response(audio_job_manager.get_queue_metrics())
@@ -0,0 +1,98 @@
+import math
+import random
+
+from decouple import config
+from django.core import signing
+
+from .pages import FEED_ITEM_BUILDERS, FEED_ITEM_COUNTS
+from .pools import feed_id_pools
+
+CURSOR_SALT = 'feeds.cursor'
+CURSOR_MAX_AGE = config('FEED_CURSOR_MAX_AGE', default=86400, cast=int)
+
+
+class InvalidCursorError(Exception):
+    """위조되었거나 만료된 피드 커서"""
+
+
+def affine_permutation(seed: str, size: int) -> tuple:
+    """[0, size) 위의 아핀 순열 position -> (a * position + b) % size 계수 (a, b)
+
+    a가 size와 서로소이면 모든 위치가 겹치지 않고 한 번씩 나옵니다.
+    """
+    if size <= 1:
+        return 1, 0
+    rng = random.Random(seed)
+    while True:
+        a = rng.randrange(1, size)
+        if math.gcd(a, size) == 1:
+            return a, rng.randrange(size)
+
+
+def new_cursor_state() -> dict:
+    """첫 페이지 커서 상태 (타입별 id 범위를 고정해서 세션 동안 순열이 바뀌지 않게 함)"""
+    types = {}
+    for item_type in FEED_ITEM_COUNTS:
+        bounds = feed_id_pools[item_type].bounds()
+        if bounds is None:
+            types[item_type] = [0, 0, 0]
+        else:
+            types[item_type] = [bounds[0], bounds[1] - bounds[0] + 1, 0]
+    return {'seed': random.getrandbits(32), 'types': types}
+
+
+def encode_cursor(state: dict) -> str:
+    """커서 상태 서명 (서버에 세션을 저장하지 않음)"""
+    return signing.dumps(state, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(cursor: str) -> dict:
+    """커서 검증 및 복원 (위조/만료 시 InvalidCursorError)"""
+    try:
+        return signing.loads(cursor, salt=CURSOR_SALT, max_age=CURSOR_MAX_AGE)
+    except signing.BadSignature as e:
+        raise InvalidCursorError("유효하지 않거나 만료된 커서입니다.") from e
+
+
+def take_permuted_ids(item_type: str, seed: int, state: list, count: int) -> tuple:
+    """순열 다음 위치부터 현재 존재하는 id를 최대 count개 선택
+
+    state는 [최소 id, 범위 크기, 다음 위치]이며, 비어 있는 id(삭제/미사용)는
+    id 풀 이진 탐색으로 건너뜁니다. count개를 채우거나 범위 끝에 닿을 때까지 계속 확인하므로
+    id가 듬성듬성해도 범위가 남아 있는 동안 빈 페이지가 나오지 않습니다. 반환: (id 목록, 다음 위치)
+    """
+    low, size, position = state
+    pool = feed_id_pools[item_type]
+    a, b = affine_permutation(f'{seed}:{item_type}', size)
+
+    ids = []
+    while len(ids) < count and position < size:
+        object_id = low + (a * position + b) % size
+        position += 1
+        if object_id in pool:
+            ids.append(object_id)
+    return ids, position
+
+
+def get_feed_page(cursor: str = None) -> tuple:
+    """커서 기반 무한 피드 페이지 (항목 목록, 다음 커서 또는 None)
+
+    한 세션(첫 커서부터 이어지는 커서들) 안에서는 같은 항목이 다시 나오지 않습니다.
+    타입별 범위를 거의 다 본 마지막 페이지들만 12개보다 적을 수 있으며, 모두 보면 다음 커서는 None입니다.
+    """
+    state = decode_cursor(cursor) if cursor else new_cursor_state()
+    seed = state['seed']
+
+    feed_items = []
+    for item_type, count in FEED_ITEM_COUNTS.items():
+        ids, state['types'][item_type][2] = take_permuted_ids(item_type, seed, state['types'][item_type], count)
+        if not ids:
+            continue
+        # 모델별로 한 번에 조회 (풀 갱신 전에 삭제된 항목은 빠짐)
+        rows = feed_id_pools[item_type].model.objects.in_bulk(ids)
+        build_item = FEED_ITEM_BUILDERS[item_type]
+        feed_items.extend(build_item(rows[object_id]) for object_id in ids if object_id in rows)
+
+    random.shuffle(feed_items)
+    exhausted = all(position >= size for _, size, position in state['types'].values())
+    return feed_items, None if exhausted else encode_cursor(state)
@@ -0,0 +1,168 @@
+import random
+import threading
+import time
+
+from decouple import config
+from rest_framework.renderers import JSONRenderer
+
+from .pools import sample_feed_rows
+from .serializers import FeedResponseSerializer
+
+# 모델별 피드 항목 수 (각 4개씩 = 총 12개)
+FEED_ITEM_COUNTS = {
+    'artist': 4,
+    'artwork': 4,
+    'exhibition': 4,
+}
+
+
+def artist_feed_item(artist) -> dict:
+    """작가 피드 항목"""
+    return {
+        'id': artist.id,
+        'title': artist.name,
+        'description': artist.life_period,
+        'image': artist.image,
+        'type': 'artist',
+        'likes_count': artist.likes_count,
+        'created_at': artist.created_at,
+        'name': artist.name,
+        'life_period': artist.life_period,
+        'representative_work': artist.representative_work
+    }
+
+
+def artwork_feed_item(artwork) -> dict:
+    """작품 피드 항목"""
+    return {
+        'id': artwork.id,
+        'title': artwork.title,
+        'description': artwork.description,
+        'image': artwork.image,
+        'type': 'artwork',
+        'likes_count': artwork.likes_count,
+        'created_at': artwork.created_at,
+        'artist_name': artwork.artist_name,
+        'created_year': artwork.created_year
+    }
+
+
+def exhibition_feed_item(exhibition) -> dict:
+    """전시회 피드 항목"""
+    return {
+        'id': exhibition.id,
+        'title': exhibition.title,
+        'description': exhibition.description,
+        'image': exhibition.image,
+        'type': 'exhibition',
+        'likes_count': exhibition.likes_count,
+        'created_at': exhibition.created_at,
+        'venue': exhibition.venue,
+        'start_date': exhibition.start_date,
+        'end_date': exhibition.end_date,
+        'status': exhibition.status
+    }
+
+
+FEED_ITEM_BUILDERS = {
+    'artist': artist_feed_item,
+    'artwork': artwork_feed_item,
+    'exhibition': exhibition_feed_item,
+}
+
+
+def build_feed_items() -> list:
+    """작가, 작품, 전시회를 랜덤하게 섞은 피드 항목 목록"""
+    feed_items = []
+    for item_type, count in FEED_ITEM_COUNTS.items():
+        build_item = FEED_ITEM_BUILDERS[item_type]
+        feed_items.extend(build_item(row) for row in sample_feed_rows(item_type, count))
+
+    random.shuffle(feed_items)
+    return feed_items
+
+
+def render_feed_page() -> bytes:
+    """피드 페이지 한 장을 JSON 바이트로 렌더링"""
+    serializer = FeedResponseSerializer({
+        'feed_items': build_feed_items()
+    })
+    return JSONRenderer().render(serializer.data)
+
+
+class FeedPageMaterializer:
+    """미리 렌더링한 피드 페이지(JSON 바이트) 풀
+
+    요청마다 풀에서 무작위 슬롯 하나를 골라 그대로 응답합니다.
+    슬롯은 TTL이 지나면 그 슬롯을 뽑은 요청이 다시 렌더링하므로,
+    DB 조회/직렬화는 트래픽과 관계없이 TTL당 최대 슬롯 수만큼만 일어납니다.
+    다른 요청이 이미 다시 렌더링 중인 슬롯은 기다리지 않고 이전 페이지를 응답하고,
+    아직 페이지가 없는 슬롯은 슬롯별 잠금으로 한 요청만 렌더링하고 나머지는 그 결과를 기다립니다.
+    """
+
+    def __init__(self, render=render_feed_page, pool_size: int = 16, ttl: int = 30):
+        self.render = render
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._slot_locks = [threading.Lock() for _ in range(pool_size)]
+        self._pages = [None] * pool_size  # (expires_at, content)
+        self._refreshing = set()
+        self.hits = 0
+        self.renders = 0
+
+    def get_page(self) -> bytes:
+        """무작위 슬롯의 피드 페이지 (없거나 만료되었으면 다시 렌더링)"""
+        slot = random.randrange(self.pool_size)
+        now = time.monotonic()
+        with self.lock:
+            page = self._pages[slot]
+            if page is not None and (page[0] > now or slot in self._refreshing):
+                self.hits += 1
+                return page[1]
+            if page is not None:
+                self._refreshing.add(slot)
+
+        with self._slot_locks[slot]:
+            try:
+                # 기다리는 동안 다른 요청이 렌더링을 마쳤으면 그 페이지 사용
+                with self.lock:
+                    page = self._pages[slot]
+                    if page is not None and page[0] > time.monotonic():
+                        self.hits += 1
+                        return page[1]
+
+                content = self.render()
+                with self.lock:
+                    self._pages[slot] = (time.monotonic() + self.ttl, content)
+                    self.renders += 1
+                return content
+            finally:
+                with self.lock:
+                    self._refreshing.discard(slot)
+
+    def clear(self):
+        """풀 전체 비우기"""
+        with self.lock:
+            self._pages = [None] * self.pool_size
+            self.hits = 0
+            self.renders = 0
+
+    def stats(self) -> dict:
+        """풀 상태 조회"""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                'pool_size': self.pool_size,
+                'ttl_seconds': self.ttl,
+                'fresh_pages': sum(1 for page in self._pages if page is not None and page[0] > now),
+                'hits': self.hits,
+                'renders': self.renders,
+            }
+
+
+# 전역 피드 페이지 풀 인스턴스
+feed_page_materializer = FeedPageMaterializer(
+    pool_size=config('FEED_PAGE_POOL_SIZE', default=16, cast=int),
+    ttl=config('FEED_PAGE_TTL', default=30, cast=int),
+)
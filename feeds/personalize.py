@@ -0,0 +1,257 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from decouple import config
+
+from artists.models import Artist, ArtistLike
+from artworks.models import Artwork, ArtworkLike
+from exhibitions.models import Exhibition, ExhibitionLike
+
+from .pages import FEED_ITEM_BUILDERS, FEED_ITEM_COUNTS
+from .pools import sample_feed_rows
+
+# 취향 점수 가중치
+AFFINITY_WEIGHTS = {
+    'artist': 3.0,      # 좋아요한 작가(또는 좋아요한 작품의 작가)와 같은 작가
+    'venue': 2.0,       # 좋아요한 전시회와 같은 장소
+    'preference': 1.5,  # 선호 장르 키워드 포함 (키워드당)
+    'popularity': 0.3,  # log(1 + 좋아요 수)
+    'liked': -5.0,      # 이미 좋아요한 항목은 뒤로
+    'jitter': 1.0,      # 매번 같은 순서가 되지 않도록 섞는 난수 폭
+}
+
+
+def _normalize(text) -> str:
+    """비교용 문자열 정규화 (공백 정리, 소문자)"""
+    return ' '.join(str(text or '').split()).lower()
+
+
+def candidate_features(item: dict) -> dict:
+    """피드 항목에서 점수 계산용 특징 추출 (후보 풀 생성 시 한 번만 계산)"""
+    item_type = item['type']
+    if item_type == 'artist':
+        artist_name = item['title']
+    else:
+        artist_name = item.get('artist_name', '')
+
+    searchable = [item['title'], item['description'], item.get('artist_name'), item.get('representative_work'), item.get('venue')]
+    return {
+        'key': (item_type, item['id']),
+        'artist_name': _normalize(artist_name),
+        'venue': _normalize(item.get('venue')),
+        'text': _normalize(' '.join(str(value) for value in searchable if value)),
+        'popularity': math.log1p(item['likes_count'] or 0),
+    }
+
+
+def build_user_profile(user) -> dict:
+    """사용자 좋아요 기록과 선호 장르로 취향 프로필 생성 (쿼리 3회)
+
+    artist_names/venues는 점수 비교용 정규화 값이고,
+    sources는 후보 조회(DB 필터)에 쓰는 원래 값입니다.
+    """
+    liked = set()
+    source_artist_names = set()
+    source_venues = set()
+
+    for artist_id, title in ArtistLike.objects.filter(user_id=user.id).values_list('artist_id', 'artist__title'):
+        liked.add(('artist', artist_id))
+        source_artist_names.add(title)
+
+    for artwork_id, artist_name in ArtworkLike.objects.filter(user_id=user.id).values_list('artwork_id', 'artwork__artist_name'):
+        liked.add(('artwork', artwork_id))
+        source_artist_names.add(artist_name)
+
+    for exhibition_id, venue in ExhibitionLike.objects.filter(user_id=user.id).values_list('exhibition_id', 'exhibition__venue'):
+        liked.add(('exhibition', exhibition_id))
+        source_venues.add(venue)
+
+    source_artist_names.discard('')
+    source_venues.discard('')
+    return {
+        'liked': liked,
+        'artist_names': {_normalize(name) for name in source_artist_names} - {''},
+        'venues': {_normalize(venue) for venue in source_venues} - {''},
+        'preferences': [keyword for keyword in (_normalize(p) for p in user.preferences or []) if keyword],
+        'sources': {'artist_names': source_artist_names, 'venues': source_venues},
+    }
+
+
+def score_candidate(features: dict, profile: dict, rng=random) -> float:
+    """후보 하나의 취향 점수"""
+    score = AFFINITY_WEIGHTS['popularity'] * features['popularity']
+    if features['artist_name'] in profile['artist_names']:
+        score += AFFINITY_WEIGHTS['artist']
+    if features['venue'] in profile['venues']:
+        score += AFFINITY_WEIGHTS['venue']
+    for keyword in profile['preferences']:
+        if keyword in features['text']:
+            score += AFFINITY_WEIGHTS['preference']
+    if features['key'] in profile['liked']:
+        score += AFFINITY_WEIGHTS['liked']
+    return score + AFFINITY_WEIGHTS['jitter'] * rng.random()
+
+
+def rank_candidates(candidates: list, profile: dict, rng=random) -> dict:
+    """후보 (item, features) 목록을 타입별 점수 내림차순으로 정렬 {type: [(score, item)]}"""
+    ranked = {item_type: [] for item_type in FEED_ITEM_COUNTS}
+    for item, features in candidates:
+        ranked[item['type']].append((score_candidate(features, profile, rng), item))
+    for entries in ranked.values():
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+    return ranked
+
+
+def affinity_candidate_rows(profile: dict, limit: int) -> dict:
+    """취향 출처(좋아요한 작가/장소)에서 직접 찾은 후보 행 {type: [row]} (타입별 최대 limit개, 쿼리 최대 3회)"""
+    artist_names = profile.get('sources', {}).get('artist_names')
+    venues = profile.get('sources', {}).get('venues')
+    rows = {item_type: [] for item_type in FEED_ITEM_COUNTS}
+    if artist_names:
+        rows['artist'] = list(Artist.objects.filter(title__in=artist_names).order_by('-likes_count')[:limit])
+        rows['artwork'] = list(Artwork.objects.filter(artist_name__in=artist_names).order_by('-likes_count')[:limit])
+    if venues:
+        rows['exhibition'] = list(Exhibition.objects.filter(venue__in=venues).order_by('-likes_count')[:limit])
+    return rows
+
+
+class FeedCandidatePool:
+    """개인화 피드 후보 풀
+
+    사용자마다 취향 출처(좋아요한 작가의 작가/작품, 좋아요한 장소의 전시회)에서
+    후보를 직접 조회하고, 새 항목 발견용으로 모든 사용자가 공유하는
+    작은 무작위 샘플(TTL마다 새로 뽑음)을 섞습니다.
+    """
+
+    def __init__(self, size: int = 100, exploration_size: int = 20, ttl: int = 300):
+        self.size = size
+        self.exploration_size = exploration_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._exploration = []
+        self._expires_at = 0.0
+
+    def exploration_candidates(self) -> list:
+        """공유 무작위 후보 [(피드 항목, 특징)] (만료되었으면 다시 뽑음)"""
+        with self.lock:
+            if time.monotonic() < self._expires_at:
+                return self._exploration
+
+            candidates = []
+            for item_type in FEED_ITEM_COUNTS:
+                build_item = FEED_ITEM_BUILDERS[item_type]
+                for row in sample_feed_rows(item_type, self.exploration_size):
+                    item = build_item(row)
+                    candidates.append((item, candidate_features(item)))
+
+            self._exploration = candidates
+            self._expires_at = time.monotonic() + self.ttl
+            return candidates
+
+    def candidates(self, profile: dict) -> list:
+        """사용자 후보 [(피드 항목, 특징)] (취향 출처 후보 + 공유 무작위 후보, 중복 제외)"""
+        candidates = []
+        seen = set()
+        for item_type, rows in affinity_candidate_rows(profile, self.size).items():
+            build_item = FEED_ITEM_BUILDERS[item_type]
+            for row in rows:
+                item = build_item(row)
+                features = candidate_features(item)
+                seen.add(features['key'])
+                candidates.append((item, features))
+
+        candidates.extend(entry for entry in self.exploration_candidates() if entry[1]['key'] not in seen)
+        return candidates
+
+    def clear(self):
+        """다음 조회 시 무작위 후보 다시 뽑기"""
+        with self.lock:
+            self._expires_at = 0.0
+
+
+class PersonalizedFeedRanker:
+    """사용자별 개인화 피드 (사용자별 후보 순위 캐시, TTL + LRU)
+
+    순위는 사용자당 TTL마다 한 번만 계산하고, 타입별 상위 항목을 점수순으로 반환합니다.
+    순위를 다시 계산할 때마다 점수의 난수(jitter)로 비슷한 점수끼리 순서가 바뀝니다.
+    좋아요가 바뀌면 시그널로 해당 사용자 캐시를 비웁니다.
+    """
+
+    def __init__(self, candidate_pool: FeedCandidatePool, max_users: int = 1000, ttl: int = 120):
+        self.candidate_pool = candidate_pool
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple[float, dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_ranked(self, user) -> dict:
+        """사용자 순위 조회 (없거나 만료되었으면 계산)"""
+        now = time.monotonic()
+        with self.lock:
+            entry = self._entries.get(user.id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user.id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        profile = build_user_profile(user)
+        ranked = rank_candidates(self.candidate_pool.candidates(profile), profile)
+        with self.lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, ranked)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return ranked
+
+    def get_feed(self, user) -> list:
+        """개인화 피드 항목 목록 (타입별 상위 항목, 점수 내림차순)"""
+        ranked = self._get_ranked(user)
+        selected = []
+        for item_type, count in FEED_ITEM_COUNTS.items():
+            selected.extend(ranked[item_type][:count])
+
+        selected.sort(key=lambda entry: entry[0], reverse=True)
+        return [item for _, item in selected]
+
+    def invalidate_user(self, user_id: int):
+        """사용자 순위 캐시 삭제"""
+        with self.lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self.lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """캐시 효율 지표 조회"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'users': len(self._entries),
+                'max_users': self.max_users,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+# 전역 개인화 피드 인스턴스
+personalized_feed_ranker = PersonalizedFeedRanker(
+    FeedCandidatePool(
+        size=config('FEED_CANDIDATE_COUNT', default=100, cast=int),
+        exploration_size=config('FEED_EXPLORATION_COUNT', default=20, cast=int),
+        ttl=config('FEED_CANDIDATE_TTL', default=300, cast=int),
+    ),
+    max_users=config('FEED_PERSONAL_CACHE_SIZE', default=1000, cast=int),
+    ttl=config('FEED_PERSONAL_CACHE_TTL', default=120, cast=int),
+)
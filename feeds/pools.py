@@ -0,0 +1,169 @@
+import bisect
+import random
+import threading
+import time
+from array import array
+
+from decouple import config
+
+from artists.models import Artist
+from artworks.models import Artwork
+from exhibitions.models import Exhibition
+
+
+class IdPool:
+    """모델 id 목록을 정렬된 array('q')로 보관하는 프로세스 메모리 풀
+
+    피드 샘플링을 DB 없이 메모리에서 처리하기 위한 용도입니다.
+    post_save/post_delete 시그널로 추가/삭제를 바로 반영하고,
+    다른 프로세스의 변경은 TTL이 지나면 전체를 다시 읽어 반영합니다.
+    배열은 변경 시 복사본을 만들어 교체하므로 읽는 쪽은 잠금 없이 사용할 수 있습니다.
+    """
+
+    def __init__(self, model, ttl: int = 300):
+        self.model = model
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._load_lock = threading.Lock()  # 전체 다시 읽기는 한 번에 하나만
+        self._ids = array('q')
+        self._loaded_at = 0.0
+        self._dirty = True
+        self._changes = None  # 다시 읽는 동안 들어온 add/discard 기록 [(추가 여부, id)]
+
+    def invalidate(self):
+        """다음 조회 시 전체 다시 읽기"""
+        self._dirty = True
+
+    def _is_stale(self) -> bool:
+        return self._dirty or time.monotonic() - self._loaded_at > self.ttl
+
+    def _read_ids(self):
+        """DB에서 id 목록 조회"""
+        return self.model._default_manager.order_by('id').values_list('id', flat=True).iterator()
+
+    def load(self, ids=None):
+        """id 목록 전체 읽기 (ids 미지정 시 DB에서 조회)"""
+        with self._load_lock:
+            self._load(ids)
+
+    def _load(self, ids=None):
+        """_load_lock을 잡은 상태에서 호출
+
+        읽는 동안 시그널로 들어온 add/discard는 기록해 두었다가 읽은 목록에 다시 반영하므로
+        오래 걸린 읽기가 그 사이의 변경을 덮어쓰지 않습니다.
+        읽기 전에 dirty를 해제하므로 읽는 중 invalidate()가 오면 다음 조회에서 다시 읽습니다.
+        """
+        with self.lock:
+            self._changes = []
+            self._dirty = False
+        try:
+            loaded = array('q', sorted(self._read_ids() if ids is None else ids))
+        except BaseException:
+            with self.lock:
+                self._changes = None
+                self._dirty = True
+            raise
+
+        with self.lock:
+            for added, object_id in self._changes:
+                loaded = (self._with_id if added else self._without_id)(loaded, object_id)
+            self._changes = None
+            self._ids = loaded
+            self._loaded_at = time.monotonic()
+
+    def ids(self) -> array:
+        """정렬된 id 배열 (필요하면 다시 읽음, 반환된 배열은 수정하지 말 것)
+
+        처음 읽기 전에는 읽기가 끝날 때까지 기다리고, 이후에는 다른 스레드가
+        다시 읽는 중이면 기다리지 않고 이전 배열을 반환합니다.
+        """
+        if self._is_stale() and self._load_lock.acquire(blocking=not self._loaded_at):
+            try:
+                if self._is_stale():
+                    self._load()
+            finally:
+                self._load_lock.release()
+        return self._ids
+
+    @staticmethod
+    def _with_id(ids: array, object_id: int) -> array:
+        """object_id를 추가한 새 배열 (이미 있으면 그대로 반환)"""
+        position = bisect.bisect_left(ids, object_id)
+        if position < len(ids) and ids[position] == object_id:
+            return ids
+        ids = array('q', ids)
+        ids.insert(position, object_id)
+        return ids
+
+    @staticmethod
+    def _without_id(ids: array, object_id: int) -> array:
+        """object_id를 뺀 새 배열 (없으면 그대로 반환)"""
+        position = bisect.bisect_left(ids, object_id)
+        if position == len(ids) or ids[position] != object_id:
+            return ids
+        ids = array('q', ids)
+        del ids[position]
+        return ids
+
+    def add(self, object_id: int):
+        """id 추가 (이미 있으면 무시)"""
+        with self.lock:
+            self._ids = self._with_id(self._ids, object_id)
+            if self._changes is not None:
+                self._changes.append((True, object_id))
+
+    def discard(self, object_id: int):
+        """id 삭제 (없으면 무시)"""
+        with self.lock:
+            self._ids = self._without_id(self._ids, object_id)
+            if self._changes is not None:
+                self._changes.append((False, object_id))
+
+    def __contains__(self, object_id: int) -> bool:
+        ids = self.ids()
+        position = bisect.bisect_left(ids, object_id)
+        return position < len(ids) and ids[position] == object_id
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def bounds(self):
+        """(최소 id, 최대 id), 비어 있으면 None"""
+        ids = self.ids()
+        if not ids:
+            return None
+        return ids[0], ids[-1]
+
+    def sample(self, count: int, rng=random) -> list:
+        """서로 다른 id count개 무작위 선택 (전체가 count개 이하면 전부)"""
+        ids = self.ids()
+        if len(ids) <= count:
+            return list(ids)
+        return [ids[index] for index in rng.sample(range(len(ids)), count)]
+
+
+FEED_ID_POOL_TTL = config('FEED_ID_POOL_TTL', default=300, cast=int)
+
+# 피드 대상 모델별 id 풀
+feed_id_pools = {
+    'artist': IdPool(Artist, ttl=FEED_ID_POOL_TTL),
+    'artwork': IdPool(Artwork, ttl=FEED_ID_POOL_TTL),
+    'exhibition': IdPool(Exhibition, ttl=FEED_ID_POOL_TTL),
+}
+
+
+def sample_feed_rows(item_type: str, count: int) -> list:
+    """id 풀에서 뽑은 id로 한 번에 조회 (쿼리 1회)
+
+    다른 프로세스에서 삭제되어 풀에만 남은 id가 섞여 개수가 모자라면
+    풀을 다시 읽도록 표시하고 부족한 만큼만 DB 무작위 조회로 채웁니다.
+    """
+    pool = feed_id_pools[item_type]
+    sample_ids = pool.sample(count)
+    rows = list(pool.model.objects.filter(id__in=sample_ids))
+
+    if len(rows) < len(sample_ids):
+        pool.invalidate()
+        fetched_ids = [row.id for row in rows]
+        rows += list(pool.model.objects.exclude(id__in=fetched_ids).random(count - len(rows)))
+    return rows
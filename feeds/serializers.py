@@ -29,4 +29,9 @@ class FeedItemSerializer(serializers.Serializer):
 
 class FeedResponseSerializer(serializers.Serializer):
     """피드 응답 시리얼라이저"""
-    feed_items = FeedItemSerializer(many=True) 
\ No newline at end of file
+    feed_items = FeedItemSerializer(many=True)
+
+
+class FeedPageSerializer(FeedResponseSerializer):
+    """무한 피드 페이지 응답 시리얼라이저"""
+    next_cursor = serializers.CharField(allow_null=True)
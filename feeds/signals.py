@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from artists.models import Artist, ArtistLike
+from artworks.models import Artwork, ArtworkLike
+from exhibitions.models import Exhibition, ExhibitionLike
+from users.models import User
+
+from .personalize import personalized_feed_ranker
+from .pools import feed_id_pools
+
+FEED_POOL_KEYS = {
+    Artist: 'artist',
+    Artwork: 'artwork',
+    Exhibition: 'exhibition',
+}
+
+
+@receiver(post_save, sender=Artist)
+@receiver(post_save, sender=Artwork)
+@receiver(post_save, sender=Exhibition)
+def add_to_feed_pool(sender, instance, created, **kwargs):
+    """새로 생성된 작가/작품/전시회 id를 피드 풀에 추가"""
+    if created:
+        feed_id_pools[FEED_POOL_KEYS[sender]].add(instance.id)
+
+
+@receiver(post_delete, sender=Artist)
+@receiver(post_delete, sender=Artwork)
+@receiver(post_delete, sender=Exhibition)
+def discard_from_feed_pool(sender, instance, **kwargs):
+    """삭제된 작가/작품/전시회 id를 피드 풀에서 제거"""
+    feed_id_pools[FEED_POOL_KEYS[sender]].discard(instance.id)
+
+
+@receiver(post_save, sender=ArtistLike)
+@receiver(post_delete, sender=ArtistLike)
+@receiver(post_save, sender=ArtworkLike)
+@receiver(post_delete, sender=ArtworkLike)
+@receiver(post_save, sender=ExhibitionLike)
+@receiver(post_delete, sender=ExhibitionLike)
+def invalidate_personalized_feed(sender, instance, **kwargs):
+    """좋아요 변경 시 해당 사용자의 개인화 피드 순위 재계산 예약"""
+    personalized_feed_ranker.invalidate_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_personalized_feed_for_user(sender, instance, **kwargs):
+    """선호 장르 등 사용자 정보 변경 시 개인화 피드 순위 재계산 예약"""
+    personalized_feed_ranker.invalidate_user(instance.id)
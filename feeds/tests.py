@@ -1,3 +1,308 @@
-from django.test import TestCase
+import random
+import threading
+import time
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from artists.models import Artist, ArtistLike
+from artworks.models import Artwork, ArtworkLike
+from exhibitions.models import Exhibition, ExhibitionLike
+from .cursor import InvalidCursorError, affine_permutation, decode_cursor, encode_cursor, take_permuted_ids
+from .pages import FeedPageMaterializer
+from .personalize import build_user_profile, candidate_features, personalized_feed_ranker, rank_candidates
+from .pools import IdPool, feed_id_pools, sample_feed_rows
+
+
+class IdPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = IdPool(Artist, ttl=300)
+        self.pool.load([5, 1, 3])
+
+    def test_load_sorts_and_membership(self):
+        self.assertEqual(list(self.pool.ids()), [1, 3, 5])
+        self.assertIn(3, self.pool)
+        self.assertNotIn(4, self.pool)
+        self.assertEqual(len(self.pool), 3)
+
+    def test_add_and_discard_keep_order_without_duplicates(self):
+        before = self.pool.ids()
+        self.pool.add(4)
+        self.pool.add(4)
+        self.pool.discard(1)
+        self.pool.discard(99)
+        self.assertEqual(list(self.pool.ids()), [3, 4, 5])
+        # 읽는 쪽이 가진 배열은 변경되지 않음
+        self.assertEqual(list(before), [1, 3, 5])
+
+    def test_sample_returns_distinct_ids(self):
+        self.pool.load(range(1, 101))
+        sample = self.pool.sample(10, rng=random.Random(0))
+        self.assertEqual(len(set(sample)), 10)
+        self.assertTrue(all(object_id in self.pool for object_id in sample))
+        self.assertEqual(sorted(self.pool.sample(200)), list(range(1, 101)))
+
+    def test_changes_during_load_are_kept(self):
+        def read_ids():
+            yield 1
+            yield 3
+            # 읽는 도중 다른 스레드의 시그널이 도착한 상황
+            self.pool.add(7)
+            self.pool.discard(1)
+            yield 5
+
+        self.pool.load(read_ids())
+        self.assertEqual(list(self.pool.ids()), [3, 5, 7])
+
+    def test_concurrent_first_reads_load_once(self):
+        pool = IdPool(Artist, ttl=300)
+        calls = []
+
+        def read_ids():
+            calls.append(1)
+            time.sleep(0.1)
+            return [2, 1]
+
+        results = []
+        with mock.patch.object(pool, '_read_ids', side_effect=read_ids):
+            threads = [threading.Thread(target=lambda: results.append(list(pool.ids()))) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[1, 2]] * 4)
+
+
+class SampleFeedRowsTests(TestCase):
+    def setUp(self):
+        self.pool = feed_id_pools['artist']
+        self.addCleanup(self.pool.invalidate)
+        for index in range(6):
+            Artist.objects.create(title=f'작가 {index}')
+        self.pool.load()
+
+    def test_stale_pool_id_is_topped_up_from_db(self):
+        # 다른 워커에서 삭제된 것처럼 시그널 없이 삭제해서 풀에 없는 id를 남김
+        with mock.patch('feeds.signals.feed_id_pools', {'artist': mock.Mock()}):
+            Artist.objects.filter(id=self.pool.ids()[0]).delete()
+        self.assertEqual(len(self.pool), 6)
+
+        with mock.patch.object(self.pool, 'sample', return_value=list(self.pool.ids()[:4])):
+            rows = sample_feed_rows('artist', 4)
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(len({row.id for row in rows}), 4)
+        self.assertEqual(len(self.pool), 5)
+
+
+class FeedPageMaterializerTests(SimpleTestCase):
+    def setUp(self):
+        self.rendered = 0
+
+    def render(self):
+        self.rendered += 1
+        return f'{{"page": {self.rendered}}}'.encode()
+
+    def test_pages_are_rendered_once_per_slot_within_ttl(self):
+        materializer = FeedPageMaterializer(render=self.render, pool_size=3, ttl=60)
+        pages = {materializer.get_page() for _ in range(100)}
+        self.assertLessEqual(self.rendered, 3)
+        self.assertEqual(len(pages), self.rendered)
+        self.assertEqual(materializer.stats()['hits'], 100 - self.rendered)
+
+    def test_expired_slot_is_rendered_again(self):
+        materializer = FeedPageMaterializer(render=self.render, pool_size=1, ttl=0)
+        self.assertEqual(materializer.get_page(), b'{"page": 1}')
+        self.assertEqual(materializer.get_page(), b'{"page": 2}')
+
+    def test_cold_slot_is_rendered_once_under_concurrency(self):
+        def slow_render():
+            time.sleep(0.05)
+            return self.render()
+
+        materializer = FeedPageMaterializer(render=slow_render, pool_size=1, ttl=60)
+        pages = []
+        threads = [threading.Thread(target=lambda: pages.append(materializer.get_page())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.rendered, 1)
+        self.assertEqual(pages, [b'{"page": 1}'] * 8)
+        self.assertEqual(materializer.stats()['hits'], 7)
+
+
+class FeedListViewTests(TestCase):
+    def setUp(self):
+        for index in range(4):
+            Artist.objects.create(title=f'작가 {index}')
+            Artwork.objects.create(title=f'작품 {index}', artist_name=f'작가 {index}')
+            Exhibition.objects.create(
+                title=f'전시 {index}', venue='국립현대미술관', start_date=date(2024, 1, 1), end_date=date(2024, 12, 31)
+            )
+        for pool in feed_id_pools.values():
+            self.addCleanup(pool.invalidate)
+        self.materializer = FeedPageMaterializer(pool_size=1, ttl=60)
+        materializer_patch = mock.patch('feeds.views.feed_page_materializer', self.materializer)
+        materializer_patch.start()
+        self.addCleanup(materializer_patch.stop)
+
+    def test_list_is_served_from_page_pool(self):
+        client = APIClient()
+        first = client.get(reverse('feeds-list'))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Type'], 'application/json')
+        self.assertEqual(len(first.json()['feed_items']), 12)
+
+        # 같은 슬롯은 TTL 동안 DB 조회 없이 렌더링된 바이트를 그대로 응답
+        with self.assertNumQueries(0):
+            second = client.get(reverse('feeds-list'))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.materializer.stats()['renders'], 1)
+
+
+class PersonalizedRankingTests(SimpleTestCase):
+    def make_item(self, item_type, item_id, title, likes_count=0, **fields):
+        item = {'id': item_id, 'type': item_type, 'title': title, 'description': '', 'likes_count': likes_count}
+        item.update(fields)
+        return item, candidate_features(item)
+
+    def test_affinity_orders_candidates_within_type(self):
+        candidates = [
+            self.make_item('artwork', 1, '무제', likes_count=1, artist_name='작가 A'),
+            self.make_item('artwork', 2, '별이 빛나는 밤', artist_name='빈센트 반 고흐'),
+            self.make_item('artwork', 3, '수련', artist_name='클로드 모네', description='인상주의 대표작'),
+            self.make_item('artwork', 4, '해바라기', artist_name='빈센트 반 고흐'),
+            self.make_item('exhibition', 5, '기획전', venue='국립현대미술관'),
+            self.make_item('exhibition', 6, '소장품전', venue='리움미술관'),
+        ]
+        profile = {
+            'liked': {('artwork', 4)},
+            'artist_names': {'빈센트 반 고흐'},
+            'venues': {'리움미술관'},
+            'preferences': ['인상주의'],
+        }
+        rng = random.Random(0)
+        ranked = rank_candidates(candidates, profile, rng)
+
+        self.assertEqual([item['id'] for _, item in ranked['artwork']], [2, 3, 1, 4])
+        self.assertEqual([item['id'] for _, item in ranked['exhibition']], [6, 5])
+        self.assertEqual(ranked['artist'], [])
+
+
+class PersonalizedFeedTests(TestCase):
+    """개인화 피드 테스트 (취향 프로필, 좋아요 시그널, API)"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='tester', password='testpass', preferences=['인상주의', ' '])
+        self.addCleanup(personalized_feed_ranker.clear)
+        self.addCleanup(personalized_feed_ranker.candidate_pool.clear)
+        personalized_feed_ranker.clear()
+        personalized_feed_ranker.candidate_pool.clear()
+
+    def test_build_user_profile(self):
+        monet = Artist.objects.create(title='클로드 모네')
+        artwork = Artwork.objects.create(title='별이 빛나는 밤', artist_name=' 빈센트  반 고흐')
+        exhibition = Exhibition.objects.create(title='소장품전', venue='리움미술관', start_date=date(2024, 1, 1), end_date=date(2024, 12, 31))
+        ArtistLike.objects.create(user=self.user, artist=monet)
+        ArtworkLike.objects.create(user=self.user, artwork=artwork)
+        ExhibitionLike.objects.create(user=self.user, exhibition=exhibition)
+
+        profile = build_user_profile(self.user)
+
+        self.assertEqual(profile['liked'], {('artist', monet.id), ('artwork', artwork.id), ('exhibition', exhibition.id)})
+        self.assertEqual(profile['artist_names'], {'클로드 모네', '빈센트 반 고흐'})
+        self.assertEqual(profile['venues'], {'리움미술관'})
+        self.assertEqual(profile['preferences'], ['인상주의'])
+        # 후보 조회에는 DB에 저장된 원래 값을 사용
+        self.assertEqual(profile['sources']['artist_names'], {'클로드 모네', ' 빈센트  반 고흐'})
+
+    def test_like_changes_invalidate_cached_ranking(self):
+        artwork = Artwork.objects.create(title='수련', artist_name='클로드 모네')
+        personalized_feed_ranker.get_feed(self.user)
+        self.assertIn(self.user.id, personalized_feed_ranker._entries)
+
+        like = ArtworkLike.objects.create(user=self.user, artwork=artwork)
+        self.assertNotIn(self.user.id, personalized_feed_ranker._entries)
+
+        personalized_feed_ranker.get_feed(self.user)
+        like.delete()
+        self.assertNotIn(self.user.id, personalized_feed_ranker._entries)
+
+    def test_liked_artists_artwork_ranks_first(self):
+        for index in range(30):
+            Artwork.objects.create(title=f'인기 작품 {index}', artist_name=f'작가 {index}', likes_count=100)
+        liked_artwork = Artwork.objects.create(title='해바라기', artist_name='빈센트 반 고흐')
+        ArtworkLike.objects.create(user=self.user, artwork=liked_artwork)
+        target = Artwork.objects.create(title='별이 빛나는 밤', artist_name='빈센트 반 고흐')
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        # 무작위 후보에 없어도 좋아요한 작가의 작품은 후보로 조회되어야 함
+        with mock.patch.object(personalized_feed_ranker.candidate_pool, 'exploration_size', 1):
+            response = client.get(reverse('feeds-personalized'))
+
+        self.assertEqual(response.status_code, 200)
+        artworks = [item for item in response.json()['feed_items'] if item['type'] == 'artwork']
+        self.assertEqual(artworks[0]['id'], target.id)
+
+
+class FeedCursorTests(SimpleTestCase):
+    def tearDown(self):
+        feed_id_pools['artist'].invalidate()
+
+    def test_affine_permutation_visits_every_position_once(self):
+        for size in (1, 2, 12, 97, 100):
+            a, b = affine_permutation('seed', size)
+            self.assertEqual(sorted((a * position + b) % size for position in range(size)), list(range(size)))
+
+    def test_pages_skip_gaps_without_repeats(self):
+        existing = [3, 4, 10, 11, 12, 20, 35, 36, 50]
+        feed_id_pools['artist'].load(existing)
+        state = [3, 50 - 3 + 1, 0]
+        seen = []
+        while state[2] < state[1]:
+            ids, state[2] = take_permuted_ids('artist', 42, state, 4)
+            self.assertLessEqual(len(ids), 4)
+            seen.extend(ids)
+        self.assertEqual(sorted(seen), existing)
+
+    def test_cursor_roundtrip_and_tampering(self):
+        state = {'seed': 7, 'types': {'artist': [1, 10, 4]}}
+        cursor = encode_cursor(state)
+        self.assertEqual(decode_cursor(cursor), state)
+        with self.assertRaises(InvalidCursorError):
+            decode_cursor(cursor[:-2] + 'xx')
+
+
+class FeedScrollViewTests(TestCase):
+    def setUp(self):
+        self.addCleanup(feed_id_pools['artist'].invalidate)
+        artists = [Artist.objects.create(title=f'작가 {index}') for index in range(200)]
+        # 넓은 id 범위에 5개만 남김 (처음/끝 포함)
+        self.kept = {artist.id for artist in artists[::50]} | {artists[-1].id}
+        Artist.objects.exclude(id__in=self.kept).delete()
+
+    def test_sparse_id_range_never_returns_an_empty_page_mid_scroll(self):
+        client = APIClient()
+        seen = []
+        cursor = None
+        while True:
+            response = client.get(reverse('feeds-scroll'), {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            items = response.json()['feed_items']
+            self.assertTrue(items)
+            seen.extend(item['id'] for item in items)
+            cursor = response.json()['next_cursor']
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), len(self.kept))
+        self.assertEqual(set(seen), self.kept)
@@ -1,21 +1,37 @@
+from django.http import HttpResponse
 from django.shortcuts import render
-from rest_framework import viewsets, mixins
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from drf_spectacular.utils import extend_schema, extend_schema_view
-from artists.models import Artist
-from artworks.models import Artwork
-from exhibitions.models import Exhibition
-from .serializers import FeedResponseSerializer
-import random
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from .cursor import InvalidCursorError, get_feed_page
+from .pages import feed_page_materializer
+from .personalize import personalized_feed_ranker
+from .serializers import FeedResponseSerializer, FeedPageSerializer
 
 
 @extend_schema_view(
     list=extend_schema(
         summary="피드 정보 조회",
-        description="피드 정보를 가져옵니다. 작가, 작품, 전시회를 랜덤하게 조합하여 12개의 항목을 반환합니다.",
+        description="피드 정보를 가져옵니다. 작가, 작품, 전시회를 랜덤하게 조합하여 12개의 항목을 반환합니다. 미리 렌더링된 페이지 풀에서 응답하므로 짧은 시간(FEED_PAGE_TTL) 동안 같은 조합이 반환될 수 있습니다.",
         responses={200: FeedResponseSerializer},
         tags=["Feed"]
+    ),
+    personalized=extend_schema(
+        summary="개인화 피드 조회",
+        description="로그인한 사용자의 좋아요 기록과 선호 장르를 기준으로 작가, 작품, 전시회를 4개씩 골라 취향 점수순으로 반환합니다.",
+        responses={200: FeedResponseSerializer},
+        tags=["Feed"]
+    ),
+    scroll=extend_schema(
+        summary="무한 스크롤 피드 조회",
+        description="커서 기반으로 피드를 이어서 가져옵니다. cursor 없이 호출하면 첫 페이지를 반환하고, 응답의 next_cursor로 다음 페이지를 요청합니다. 같은 커서로 이어지는 동안에는 항목이 중복되지 않으며, 더 볼 항목이 없으면 next_cursor는 null입니다.",
+        parameters=[
+            OpenApiParameter(name='cursor', description='이전 응답의 next_cursor', required=False, type=str)
+        ],
+        responses={200: FeedPageSerializer},
+        tags=["Feed"]
     )
 )
 class FeedViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
@@ -26,70 +42,27 @@ class FeedViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
     permission_classes = [AllowAny]  # 인증 없이 접근 가능
     
     def list(self, request, *args, **kwargs):
-        # 각 모델에서 랜덤 데이터 효율적으로 가져오기
-        # 고정된 수량 설정 (각 모델별로 4개씩 = 총 12개)
-        artist_count = 4
-        artwork_count = 4
-        exhibition_count = 4
-        
-        # 최적화된 랜덤 조회 사용
-        random_artists = Artist.objects.random(artist_count)
-        random_artworks = Artwork.objects.random(artwork_count)
-        random_exhibitions = Exhibition.objects.random(exhibition_count)
-        
-        feed_items = []
-        
-        # 작가 데이터 변환
-        for artist in random_artists:
-            feed_items.append({
-                'id': artist.id,
-                'title': artist.name,
-                'description': artist.life_period,
-                'image': artist.image,
-                'type': 'artist',
-                'likes_count': artist.likes_count,
-                'created_at': artist.created_at,
-                'name': artist.name,
-                'life_period': artist.life_period,
-                'representative_work': artist.representative_work
-            })
-        
-        # 작품 데이터 변환
-        for artwork in random_artworks:
-            feed_items.append({
-                'id': artwork.id,
-                'title': artwork.title,
-                'description': artwork.description,
-                'image': artwork.image,
-                'type': 'artwork',
-                'likes_count': artwork.likes_count,
-                'created_at': artwork.created_at,
-                'artist_name': artwork.artist_name,
-                'created_year': artwork.created_year
-            })
-        
-        # 전시회 데이터 변환
-        for exhibition in random_exhibitions:
-            feed_items.append({
-                'id': exhibition.id,
-                'title': exhibition.title,
-                'description': exhibition.description,
-                'image': exhibition.image,
-                'type': 'exhibition',
-                'likes_count': exhibition.likes_count,
-                'created_at': exhibition.created_at,
-                'venue': exhibition.venue,
-                'start_date': exhibition.start_date,
-                'end_date': exhibition.end_date,
-                'status': exhibition.status
-            })
-        
-        # 항목 랜덤하게 섞기
-        random.shuffle(feed_items)
-        
-        # 시리얼라이저로 데이터 검증 및 반환
+        # 미리 렌더링된 피드 페이지 풀에서 하나를 골라 그대로 반환
+        return HttpResponse(feed_page_materializer.get_page(), content_type='application/json')
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def personalized(self, request):
+        """개인화 피드"""
         serializer = FeedResponseSerializer({
-            'feed_items': feed_items
+            'feed_items': personalized_feed_ranker.get_feed(request.user)
+        })
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def scroll(self, request):
+        """커서 기반 무한 피드"""
+        try:
+            feed_items, next_cursor = get_feed_page(request.query_params.get('cursor'))
+        except InvalidCursorError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = FeedPageSerializer({
+            'feed_items': feed_items,
+            'next_cursor': next_cursor
         })
-        
         return Response(serializer.data)